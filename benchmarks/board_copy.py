@@ -0,0 +1,79 @@
+'''
+    Benchmark of board copies against `copy.deepcopy`.
+
+    Times `copy.deepcopy`, `copy()` and, for packed boards, `snapshot()` of a position reached after
+    a number of moves, for every board type, and checks that each copy is independent of its source.
+
+    Usage: python -m benchmarks.board_copy
+'''
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.gardner.packed import PackedGardnerChessBoard
+from minichess.games.rifle.board import RifleChessBoard, PackedRifleChessBoard
+from minichess.games.atomic.board import AtomicChessBoard, PackedAtomicChessBoard
+from minichess.games.dark.board import DarkChessBoard, PackedDarkChessBoard
+
+import copy
+import random
+import timeit
+
+BOARD_TYPES = [
+    GardnerChessBoard, PackedGardnerChessBoard,
+    RifleChessBoard, PackedRifleChessBoard,
+    AtomicChessBoard, PackedAtomicChessBoard,
+    DarkChessBoard, PackedDarkChessBoard
+]
+
+def played_board(board_type, moves: int, seed: int = 0):
+    '''
+        Returns
+        -------
+        A `board_type` board after up to `moves` random moves.
+    '''
+    rng = random.Random(seed)
+    board = board_type()
+
+    for _ in range(moves):
+        actions = board.legal_actions()
+        if len(actions) == 0: break
+        board.push(rng.choice(actions))
+
+    return board
+
+def per_call(fn, number: int) -> float:
+    '''
+        Returns
+        -------
+        The mean time of one `fn()` call, in microseconds.
+    '''
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+def check_independent(board, copied):
+    before = board.to_bytes()
+
+    while len(copied.move_history) > 0:
+        copied.pop()
+    copied.wipe_board()
+
+    assert board.to_bytes() == before, 'Changing a copy of a {} changed the original.'.format(type(board).__name__)
+
+def main(moves: int = 20, number: int = 500):
+    print('{:<24} {:>14} {:>14} {:>14}'.format('board (after {} moves)'.format(moves), 'deepcopy (us)', 'copy (us)', 'snapshot (us)'))
+
+    for board_type in BOARD_TYPES:
+        board = played_board(board_type, moves)
+
+        check_independent(board, board.copy())
+
+        deep = per_call(lambda: copy.deepcopy(board), number)
+        fast = per_call(board.copy, number)
+
+        if hasattr(board, 'snapshot'):
+            check_independent(board, board.snapshot())
+            snapshot = '{:14.1f}'.format(per_call(board.snapshot, number))
+        else:
+            snapshot = '{:>14}'.format('-')
+
+        print('{:<24} {:14.1f} {:14.1f} {}'.format(board_type.__name__, deep, fast, snapshot))
+
+if __name__ == "__main__":
+    main()
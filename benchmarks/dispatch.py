@@ -0,0 +1,64 @@
+'''
+    Micro-benchmark of visitor dispatch overhead.
+
+    Compares the per-call cost of the original string-keyed lookup, which built the visitor's
+    module-qualified name on every call, with the cached (visitor class, piece class) table. Both
+    dispatch to visit methods that do nothing, so the timings are pure dispatch overhead.
+
+    Usage: python -m benchmarks.dispatch
+'''
+from minichess.games.abstract.action import AbstractChessActionVisitor, _methods, _qualname, visitor
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.gardner.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+import timeit
+
+class _NoopVisitor(AbstractChessActionVisitor):
+    @visitor(Pawn)
+    def visit(self, piece, board): return None
+
+    @visitor(Knight)
+    def visit(self, piece, board): return None
+
+    @visitor(Bishop)
+    def visit(self, piece, board): return None
+
+    @visitor(Rook)
+    def visit(self, piece, board): return None
+
+    @visitor(Queen)
+    def visit(self, piece, board): return None
+
+    @visitor(King)
+    def visit(self, piece, board): return None
+
+def _string_keyed_visit(self, arg, arg2):
+    '''
+        The dispatch used before the cached table.
+    '''
+    method = _methods[(_qualname(type(self)), type(arg))]
+    return method(self, arg, arg2)
+
+def per_call(fn, pieces, number: int) -> float:
+    '''
+        Returns
+        -------
+        The mean time in nanoseconds of one `fn(piece)` call.
+    '''
+    elapsed = timeit.timeit(lambda: [fn(piece) for piece in pieces], number=number)
+    return elapsed / (number * len(pieces)) * 1e9
+
+def main(number: int = 50000):
+    board = GardnerChessBoard()
+    referee = _NoopVisitor()
+    pieces = [tile.peek() for tile in board if tile.occupied()]
+
+    baseline = per_call(lambda piece: None, pieces, number)
+    before = per_call(lambda piece: _string_keyed_visit(referee, piece, board), pieces, number)
+    after = per_call(lambda piece: referee.visit(piece, board), pieces, number)
+
+    print('string-keyed dispatch: {:6.1f} ns/call'.format(before - baseline))
+    print('cached dispatch table: {:6.1f} ns/call'.format(after - baseline))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+'''
+    Move generation benchmark: perft of the curated positions of `minichess.perft` in every variant.
+
+    Reports nodes per second of every run and appends the results, tagged with a label (the git
+    commit by default), to a JSON lines file. The default file, `benchmarks/perft_results.jsonl`, is
+    ignored by git since its timings are specific to the machine. Each run is compared with the last
+    stored run of the same variant, position and depth under a different label: a different node
+    count is a move generation change, and a drop in nodes per second beyond the tolerance is
+    reported as a regression.
+
+    Usage: python -m benchmarks.perft [--label LABEL] [--results FILE] [--variants gardner rifle] [--tolerance 0.25] [--no-save]
+'''
+from minichess.perft import POSITIONS, VARIANTS, board_from_fen, timed_perft
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# depths per variant, chosen so that each run takes at most a few seconds
+DEPTHS = {
+    'gardner': 4,
+    'rifle': 3,
+    'atomic': 3
+}
+
+RESULTS = os.path.join(os.path.dirname(__file__), 'perft_results.jsonl')
+
+def default_label() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unlabelled'
+
+def load_results(path: str) -> list:
+    if not os.path.exists(path): return []
+
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def previous_result(results: list, label: str, variant: str, position: str, depth: int):
+    '''
+        Returns
+        -------
+        The last stored result of `variant`, `position` and `depth` under a label other than `label`, or None.
+    '''
+    for result in reversed(results):
+        if result['label'] != label and (result['variant'], result['position'], result['depth']) == (variant, position, depth):
+            return result
+
+    return None
+
+def run(variants: list, label: str, results: list, tolerance: float, repeat: int = 5):
+    '''
+        Runs the benchmark, printing one line per run.
+
+        Returns
+        -------
+        tuple of (list of new results, list of problems found against the previous results).
+    '''
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    new_results, problems = [], []
+
+    print('{:<8} {:<10} {:>5} {:>10} {:>10} {:>10} {:>8}'.format('variant', 'position', 'depth', 'nodes', 'seconds', 'nps', 'change'))
+
+    for variant in variants:
+        depth = DEPTHS[variant]
+
+        for position, fen in POSITIONS.items():
+            board = board_from_fen(fen, VARIANTS[variant])
+
+            # best of `repeat` runs, the least disturbed by the rest of the machine
+            result = min((timed_perft(board, depth) for _ in range(repeat)), key=lambda result: result.seconds)
+
+            new_results.append({
+                'label': label, 'timestamp': timestamp, 'variant': variant, 'position': position,
+                'depth': depth, 'nodes': result.nodes, 'seconds': result.seconds, 'nps': result.nps
+            })
+
+            change = ''
+            previous = previous_result(results, label, variant, position, depth)
+
+            if previous is not None:
+                change = '{:+.1%}'.format(result.nps / previous['nps'] - 1)
+
+                if result.nodes != previous['nodes']:
+                    problems.append('{} {} depth {}: {} nodes, {} at {}'.format(variant, position, depth, result.nodes, previous['nodes'], previous['label']))
+                elif result.nps < previous['nps'] * (1 - tolerance):
+                    problems.append('{} {} depth {}: {:.0f} nps, {:.0f} at {}'.format(variant, position, depth, result.nps, previous['nps'], previous['label']))
+
+            print('{:<8} {:<10} {:>5} {:>10} {:>10.3f} {:>10.0f} {:>8}'.format(variant, position, depth, result.nodes, result.seconds, result.nps, change))
+
+    return new_results, problems
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark move generation with perft.')
+    parser.add_argument('--label', default=None, help='the name of this run, the git commit by default')
+    parser.add_argument('--results', default=RESULTS, help='the JSON lines file results are stored in')
+    parser.add_argument('--variants', nargs='+', choices=sorted(VARIANTS), default=sorted(DEPTHS))
+    parser.add_argument('--tolerance', type=float, default=0.25, help='the fraction of nodes per second a run may lose before it is a regression')
+    parser.add_argument('--no-save', action='store_true', help='do not store the results')
+    args = parser.parse_args()
+
+    label = args.label or default_label()
+
+    new_results, problems = run(args.variants, label, load_results(args.results), args.tolerance)
+
+    if not args.no_save:
+        with open(args.results, 'a') as f:
+            for result in new_results:
+                f.write(json.dumps(result) + '\n')
+
+    for problem in problems:
+        print('REGRESSION ' + problem)
+
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action import GardnerChessAction, LEN_ACTION_SPACE, PROMOTION_FLAGS
+from minichess.games.gardner.move import MOVES
+from minichess.games.gardner.pieces import Pawn
+from minichess.records import GameRecord, RecordReader
+
+from typing import Iterator, List, NamedTuple
+
+import numpy as np
+import queue
+import threading
+
+# variants whose rules are symmetric about the y-axis, so that a mirrored game is a legal game with
+# the same result: none of them has castling or other rules tied to a wing of the board
+MIRRORABLE_VARIANTS = frozenset(['gardner', 'rifle', 'atomic', 'dark'])
+
+class Batch(NamedTuple):
+    '''
+        A minibatch of training samples.
+
+        states :: np.array : shape (B, 5, 5, 12) `canonical_state_vector`s
+
+        masks :: np.array : shape (B, 1225) legal action masks
+
+        policies :: np.array : shape (B, 1225) policy targets, see `GameRecord.policy`
+
+        values :: np.array : shape (B,) game results for the side to move: 1 win, -1 loss, 0 draw
+    '''
+    states: np.array
+    masks: np.array
+    policies: np.array
+    values: np.array
+
+def _mirror_table(color: PieceColor) -> np.array:
+    '''
+        Returns
+        -------
+        shape (1225,) array mapping every action index of `color` to the index of its `fliplr`, or to
+        itself where the index names no move.
+    '''
+    table = np.arange(LEN_ACTION_SPACE)
+    agent = Pawn(color, (-1, -1), 0)
+
+    for move in MOVES[color.value]:
+        if move is None: continue
+
+        action = GardnerChessAction(agent, move.from_pos, move.to_pos, None, [])
+        if move.underpromotion is not None:
+            action.modifier_flags.append(PROMOTION_FLAGS[move.underpromotion])
+
+        table[move.index] = action.fliplr().index()
+
+    return table
+
+# MIRROR[color.value][index] is the index of the mirrored action
+MIRROR = np.stack([_mirror_table(PieceColor.WHITE), _mirror_table(PieceColor.BLACK)])
+
+def game_samples(record: GameRecord, dtype=np.float32):
+    '''
+        Replays `record` into one training sample per move.
+
+        Returns
+        -------
+        tuple of a Batch with the samples of the game and shape (n,) uint8 array of the `PieceColor`
+        values of the side to move.
+    '''
+    count = len(record.actions)
+
+    states = np.zeros((count, 5, 5, 12), dtype=dtype)
+    masks = np.zeros((count, LEN_ACTION_SPACE), dtype=dtype)
+    policies = np.zeros((count, LEN_ACTION_SPACE), dtype=dtype)
+    values = np.zeros(count, dtype=dtype)
+    colors = np.zeros(count, dtype=np.uint8)
+
+    for ply, board in enumerate(record.positions()):
+        if ply == count: break
+
+        board.canonical_state_vector(out=states[ply])
+        board.legal_action_mask(out=masks[ply])
+        policies[ply] = record.policy(ply)
+
+        colors[ply] = board.active_color.value
+        values[ply] = record.result if board.active_color == PieceColor.WHITE else -record.result
+
+    return Batch(states, masks, policies, values), colors
+
+def mirror_samples(samples: Batch, colors: np.array) -> Batch:
+    '''
+        Returns
+        -------
+        `samples` mirrored about the y-axis: the samples of the mirrored positions.
+    '''
+    # canonical states of black are rotated by 180 degrees, which commutes with the mirror
+    inverse = np.argsort(MIRROR[colors], axis=1)
+    rows = np.arange(len(colors))[:, None]
+
+    return Batch(
+        np.ascontiguousarray(samples.states[:, :, ::-1]),
+        samples.masks[rows, inverse],
+        samples.policies[rows, inverse],
+        samples.values.copy()
+    )
+
+class GameDataset:
+    '''
+        Streams shuffled minibatches of training samples out of game record shards.
+
+        `num_threads` reader threads replay the games of their share of the shards into samples. One
+        batching thread feeds them through a shuffle buffer of `shuffle_buffer` samples and assembles
+        batches, keeping up to `prefetch` batches ready. Samples are shuffled within the buffer only, so
+        it should hold samples of many games.
+
+        Iterating the dataset makes one pass over the shards. Readers finish their shards in whatever
+        order the threads run, so batches are random but not reproducible across runs.
+
+        Parameters
+        ----------
+        paths :: List[str] : game record shards, see `minichess.records`
+
+        batch_size :: int : the number of samples per batch
+
+        shuffle_buffer :: int : the number of samples batches are drawn from
+
+        mirror :: bool : mirror each sample with probability 1/2, for variants in `MIRRORABLE_VARIANTS`
+
+        num_threads :: int : the number of reader threads
+
+        prefetch :: int : the number of batches to prepare ahead
+
+        drop_last :: bool : whether to drop the last batch if it is smaller than `batch_size`
+
+        seed :: int : seed of the shuffling and mirroring
+    '''
+    def __init__(self, paths: List[str], batch_size: int = 256, shuffle_buffer: int = 16384, mirror: bool = False,
+                 num_threads: int = 2, prefetch: int = 4, drop_last: bool = False, seed: int = None) -> None:
+        self.paths = list(paths)
+        self.batch_size = batch_size
+        self.shuffle_buffer = max(shuffle_buffer, batch_size)
+        self.mirror = mirror
+        self.num_threads = max(1, min(num_threads, len(self.paths)))
+        self.prefetch = prefetch
+        self.drop_last = drop_last
+        self.rng = np.random.default_rng(seed)
+
+    def __iter__(self) -> Iterator[Batch]:
+        stop = threading.Event()
+        games = queue.Queue(maxsize=4 * self.num_threads)
+        batches = queue.Queue(maxsize=self.prefetch)
+
+        readers = [
+            threading.Thread(target=self._read, args=(self.paths[i::self.num_threads], games, stop), daemon=True)
+            for i in range(self.num_threads)
+        ]
+        batcher = threading.Thread(target=self._batch, args=(games, batches, stop), daemon=True)
+
+        for thread in readers + [batcher]:
+            thread.start()
+
+        try:
+            while True:
+                batch = batches.get()
+
+                if batch is None: return
+                if isinstance(batch, BaseException): raise batch
+
+                yield batch
+        finally:
+            # stop the threads if the consumer stopped early
+            stop.set()
+
+            for thread in readers + [batcher]:
+                thread.join()
+
+    def _put(self, q: queue.Queue, item, stop: threading.Event) -> bool:
+        '''
+            Puts `item` on `q`, giving up if `stop` is set.
+
+            Returns
+            -------
+            True if `item` was put on `q`.
+        '''
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _read(self, paths: List[str], games: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for path in paths:
+                with RecordReader(path) as reader:
+                    for record in reader:
+                        if len(record.actions) == 0: continue
+
+                        samples, colors = game_samples(record)
+                        mirrorable = self.mirror and record.variant in MIRRORABLE_VARIANTS
+
+                        if not self._put(games, (samples, colors, mirrorable), stop): return
+        except BaseException as e:
+            self._put(games, e, stop)
+            return
+
+        self._put(games, None, stop)
+
+    def _batch(self, games: queue.Queue, batches: queue.Queue, stop: threading.Event) -> None:
+        try:
+            capacity = self.shuffle_buffer
+            buffer = Batch(
+                np.zeros((capacity, 5, 5, 12), dtype=np.float32),
+                np.zeros((capacity, LEN_ACTION_SPACE), dtype=np.float32),
+                np.zeros((capacity, LEN_ACTION_SPACE), dtype=np.float32),
+                np.zeros(capacity, dtype=np.float32)
+            )
+            size = 0
+            running = self.num_threads
+
+            while running > 0:
+                try:
+                    item = games.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set(): return
+                    continue
+
+                if item is None:
+                    running -= 1
+                    continue
+                if isinstance(item, BaseException): raise item
+
+                samples, colors, mirrorable = item
+
+                if mirrorable:
+                    flip = self.rng.random(len(colors)) < 0.5
+                    if flip.any():
+                        mirrored = mirror_samples(Batch(*[field[flip] for field in samples]), colors[flip])
+                        for field, values in zip(samples, mirrored):
+                            field[flip] = values
+
+                offset = 0
+                while offset < len(colors):
+                    if size == capacity:
+                        # draw a batch from the full buffer and refill its slots
+                        slots = self.rng.choice(capacity, self.batch_size, replace=False)
+                        if not self._put(batches, Batch(*[field[slots] for field in buffer]), stop): return
+
+                        # move the last samples into the drawn slots so the buffer stays packed
+                        keep = np.setdiff1d(np.arange(capacity - self.batch_size, capacity), slots)
+                        holes = np.setdiff1d(slots, np.arange(capacity - self.batch_size, capacity))
+                        for field in buffer:
+                            field[holes] = field[keep]
+
+                        size -= self.batch_size
+
+                    take = min(capacity - size, len(colors) - offset)
+                    for field, values in zip(buffer, samples):
+                        field[size:size + take] = values[offset:offset + take]
+
+                    size += take
+                    offset += take
+
+            # drain the rest of the buffer in random order
+            order = self.rng.permutation(size)
+
+            for start in range(0, size, self.batch_size):
+                slots = order[start:start + self.batch_size]
+                if len(slots) < self.batch_size and self.drop_last: break
+                if not self._put(batches, Batch(*[field[slots] for field in buffer]), stop): return
+        except BaseException as e:
+            self._put(batches, e, stop)
+            return
+
+        self._put(batches, None, stop)
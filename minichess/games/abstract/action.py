@@ -44,6 +44,14 @@ class AbstractChessAction:
         if self.captured_piece is not None and type(self.captured_piece) == King:
             self.modifier_flags.append(AbstractActionFlags.KING_CAPTURE)
 
+    def index(self) -> int:
+        '''
+            Returns
+            -------
+            The index of this action in the (1225,) action space, i.e. the position of the 1 in `encode()`.
+        '''
+        raise NotImplementedError
+
     def encode(self) -> np.array:
         '''
             Encodes this action as a onehot in a shape (1225,) numpy array.
@@ -106,11 +114,25 @@ class AbstractChessAction:
         '''
         raise NotImplementedError
 
-    def copy(self):
+    def copy(self, copy_piece=None):
         '''
             Returns a deep copy of this action.
+
+            Parameters
+            ----------
+            copy_piece :: Callable : maps a piece to the piece the copy should refer to, `piece.copy()` if None
         '''
-        return type(self)(self.agent.copy(), self.from_pos, self.to_pos, self.captured_piece.copy() if self.captured_peice else None, self.modifier_flags.copy() if self.modifier_flags else [])
+        if copy_piece is None: copy_piece = lambda piece: piece.copy()
+
+        # bypass __init__, which would add a second KING_CAPTURE flag
+        action = object.__new__(type(self))
+        action.__dict__.update(self.__dict__)
+
+        action.agent = copy_piece(self.agent) if self.agent is not None else None
+        action.captured_piece = copy_piece(self.captured_piece) if self.captured_piece is not None else None
+        action.modifier_flags = self.modifier_flags.copy()
+
+        return action
 
     def __str__(self):
         return '[ {} -> {} ]'.format(self.from_pos, self.to_pos)
@@ -136,13 +158,39 @@ def _declaring_class(obj):
     name = _qualname(obj)
     return name[:name.rfind('.')]
 
-# Stores the actual visitor methods
+# Stores the actual visitor methods, by (declaring class name, piece class)
 _methods = {}
 
+# Resolved visitor methods, by (visitor class, piece class)
+_dispatch = {}
+
+def _resolve(visitor_class, piece_class):
+    """
+        Find the visitor method for a (visitor class, piece class) pair.
+
+        The most specific piece class wins, and for a given piece class the most derived visitor
+        class that declares a method for it wins, so variant visitors inherit every method they
+        do not override.
+    """
+    visitor_names = [_qualname(cls) for cls in visitor_class.__mro__]
+
+    for piece_base in piece_class.__mro__:
+        for name in visitor_names:
+            method = _methods.get((name, piece_base))
+
+            if method is not None:
+                _dispatch[(visitor_class, piece_class)] = method
+                return method
+
+    raise TypeError('{} has no visitor method for {}'.format(visitor_class.__name__, piece_class.__name__))
+
 # Delegating visitor implementation
 def _visitor_impl(self, arg, arg2):
     """Actual visitor method implementation."""
-    method = _methods[(_qualname(type(self)), type(arg))]
+    try:
+        method = _dispatch[(type(self), type(arg))]
+    except KeyError:
+        method = _resolve(type(self), type(arg))
     return method(self, arg, arg2)
 
 # The actual @visitor decorator
@@ -153,6 +201,9 @@ def visitor(arg_type):
         declaring_class = _declaring_class(fn)
         _methods[(declaring_class, arg_type)] = fn
 
+        # a new declaration may change how already resolved pairs dispatch
+        _dispatch.clear()
+
         # Replace all decorated methods with _visitor_impl
         return _visitor_impl
 
@@ -4,8 +4,6 @@ from minichess.resources import *
 
 import numpy as np
 
-import hashlib
-
 from typing import List, Union, Iterable
 
 LETTER_TO_COLUMN = {
@@ -47,12 +45,23 @@ class AbstractChessBoard:
                 color = PieceColor.BLACK if tile_count % 2 == 0 else PieceColor.WHITE
                 
                 # add a tile
-                board[row_num].append(AbstractChessTile(color, (row_num, col_num), None))
+                board[row_num].append(self._make_tile(color, (row_num, col_num)))
 
                 tile_count += 1
 
         return board
 
+    def _make_tile(self, color: PieceColor, position: tuple):
+        '''
+            Creates the (empty) tile at `position`. Subclasses may override this to use
+            their own tile type.
+
+            Returns
+            -------
+            AbstractChessTile of color `color` located at `position`.
+        '''
+        return AbstractChessTile(color, position, None)
+
     @staticmethod
     def from_vector(vector):
         '''
@@ -178,8 +187,12 @@ class AbstractChessBoard:
         '''
         raise NotImplementedError
 
-    def legal_action_mask(self) -> np.array:
+    def legal_action_mask(self, out: np.array = None) -> np.array:
         '''
+            Parameters
+            ----------
+            out :: np.array : optional shape (NUM_ACTIONS,) buffer to write the mask into
+
             Returns
             -------
             shape (NUM_ACTIONS,) numpy array of 0s and 1s, where a 0 corresponds 
@@ -267,8 +280,17 @@ class AbstractChessBoard:
             for col_num in range(self.width):
                 yield self.get((row_num, col_num))
 
+    @property
+    def zobrist(self) -> int:
+        '''
+            Returns
+            -------
+            The 64-bit Zobrist key of the current position, including the side to move.
+        '''
+        raise NotImplementedError
+
     def __hash__(self):
-        return int(hashlib.sha512(str(self).encode('utf-8')).hexdigest(), 16)
+        return self.zobrist
 
 class AbstractChessTile:
     '''
@@ -283,6 +305,8 @@ class AbstractChessTile:
         piece :: 
     '''
 
+    __slots__ = ('color', 'position', 'piece')
+
     def __init__(self, color: PieceColor, position: tuple, piece: AbstractChessPiece) -> None:
         self.color = color
         self.position = position
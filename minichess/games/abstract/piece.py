@@ -35,6 +35,7 @@ class AbstractChessPiece:
     '''
         Abstract Data Type representing a MiniChess piece.
     '''
+    __slots__ = ('color', 'position', 'value')
     
     def __init__(self, color: PieceColor, position: tuple, value: int = 0) -> None:
         self.color = color
@@ -112,4 +113,4 @@ class AbstractChessPiece:
         return '?'
 
     def __hash__(self):
-        return hash(str(self))
\ No newline at end of file
+        return hash((type(self), self.color))
\ No newline at end of file
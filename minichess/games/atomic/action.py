@@ -1,5 +1,4 @@
 from minichess.games.atomic.pieces.multipiece import MultiPiece
-from minichess.utils import surrounding_pieces
 import numpy as np
 from minichess.games.atomic.board import AtomicChessBoard
 from minichess.games.gardner.action_reference import ID_TO_ACTION
@@ -0,0 +1,161 @@
+'''
+    Atomic move legality straight from bitboards.
+
+    A capture explodes the 3x3 block around the captured square: the capturing piece, the captured
+    piece and every non-pawn piece in the block are removed, whatever their color. `BLAST_MASKS[sq]`
+    is that block for a capture on `sq`, so both sides' losses to an explosion are a single mask.
+
+    The rules mirror `AtomicChessBoard._visitor_actions_for_color`, which simulates every candidate
+    with push/pop:
+
+    - kings cannot capture
+    - a move must leave its side a king, i.e. a capture must not explode the last one
+    - a move must not let the opponent capture a king, or explode one, with a move that keeps the
+      opponent a king of its own. Kings that stand next to each other can therefore only be taken
+      by an explosion that spares the attacker's king, never by capturing one of them outright.
+
+    Moves are the `(from_sq, to_sq, promotion)` tuples of `GardnerBitboards`.
+'''
+from minichess.games.gardner.bitboard import GardnerBitboards, WHITE, BLACK, NUM_SQUARES, BB_SQUARES, KING_ATTACKS, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, squares
+
+from typing import Iterator, List, Tuple
+
+# the squares cleared of non-pawn pieces by a capture on each square, the square itself included
+BLAST_MASKS = [KING_ATTACKS[sq] | BB_SQUARES[sq] for sq in range(NUM_SQUARES)]
+
+NON_PAWNS = (KNIGHT, BISHOP, ROOK, QUEEN, KING)
+
+def piece_type_at(bitboards: GardnerBitboards, color: int, sq: int) -> int:
+    '''
+        Returns
+        -------
+        The piece type of the piece of color `color` on `sq`, or None.
+    '''
+    bb = BB_SQUARES[sq]
+    for piece_type, pieces in enumerate(bitboards.pieces[color]):
+        if pieces & bb: return piece_type
+    return None
+
+def blast(bitboards: GardnerBitboards, sq: int) -> int:
+    '''
+        Returns
+        -------
+        Bitboard of the pieces that a capture on `sq` explodes: the non-pawn pieces of either color
+        in `BLAST_MASKS[sq]`.
+    '''
+    pieces = bitboards.pieces
+    return BLAST_MASKS[sq] & (bitboards.colors[WHITE] | bitboards.colors[BLACK]) & ~(pieces[WHITE][PAWN] | pieces[BLACK][PAWN])
+
+def explode(bitboards: GardnerBitboards, sq: int) -> None:
+    '''
+        Removes every non-pawn piece of either color in the blast of a capture on `sq`.
+    '''
+    hit = blast(bitboards, sq)
+    if not hit: return
+
+    for color in (WHITE, BLACK):
+        pieces = bitboards.pieces[color]
+        for piece_type in NON_PAWNS:
+            for hit_sq in squares(pieces[piece_type] & hit):
+                bitboards.remove_piece(hit_sq, color, piece_type)
+
+def make_move(bitboards: GardnerBitboards, color: int, move: Tuple[int, int, int]) -> GardnerBitboards:
+    '''
+        Returns
+        -------
+        New bitboards of the position after `color` plays `move` under Atomic rules. `bitboards` is not changed.
+    '''
+    from_sq, to_sq, promotion = move
+    opp_color = color ^ 1
+
+    after = bitboards.copy()
+
+    piece_type = piece_type_at(bitboards, color, from_sq)
+    after.remove_piece(from_sq, color, piece_type)
+
+    if bitboards.colors[opp_color] & BB_SQUARES[to_sq]:
+        after.remove_piece(to_sq, opp_color, piece_type_at(bitboards, opp_color, to_sq))
+        explode(after, to_sq)
+    else:
+        after.set_piece(to_sq, color, piece_type if promotion is None else promotion)
+
+    return after
+
+def threatens_king(bitboards: GardnerBitboards, color: int) -> bool:
+    '''
+        Returns
+        -------
+        True if `color` has a capture, by a piece other than a king, that takes or explodes a king
+        while leaving `color` a king, False otherwise.
+    '''
+    own_kings = bitboards.pieces[color][KING]
+    if not own_kings: return False
+
+    # a capture reaches a king if the captured square is the king's or one next to it
+    targets = 0
+    for sq in squares(own_kings | bitboards.pieces[color ^ 1][KING]):
+        targets |= BLAST_MASKS[sq]
+    targets &= bitboards.colors[color ^ 1]
+
+    occupied = bitboards.occupied
+
+    for sq in squares(targets):
+        if own_kings & ~BLAST_MASKS[sq] and bitboards.attackers(sq, color, occupied, own_kings):
+            return True
+
+    return False
+
+def is_legal(bitboards: GardnerBitboards, color: int, move: Tuple[int, int, int], filter_for_check: bool = True) -> bool:
+    '''
+        Parameters
+        ----------
+        color :: int : the color making `move`
+
+        move :: Tuple[int, int, int] : a pseudo-legal move for `color`
+
+        filter_for_check :: bool : whether moves that let the opponent take a king are illegal
+
+        Returns
+        -------
+        True if `move` is legal for `color` under Atomic rules, False otherwise.
+    '''
+    from_sq, to_sq, _ = move
+
+    kings = bitboards.pieces[color][KING]
+    if not kings: return False
+
+    if bitboards.colors[color ^ 1] & BB_SQUARES[to_sq]:
+        # kings cannot capture, and no capture may explode the last king
+        if kings & BB_SQUARES[from_sq] or not kings & ~BLAST_MASKS[to_sq]: return False
+
+    return not (filter_for_check and threatens_king(make_move(bitboards, color, move), color ^ 1))
+
+def gives_check(bitboards: GardnerBitboards, color: int, move: Tuple[int, int, int]) -> bool:
+    '''
+        Returns
+        -------
+        True if after `color` plays `move`, `color` could take or explode an opponent king.
+    '''
+    return threatens_king(make_move(bitboards, color, move), color)
+
+def iter_legal_moves(bitboards: GardnerBitboards, color: int, captures_only: bool = False, filter_for_check: bool = True) -> Iterator[Tuple[int, int, int]]:
+    '''
+        Yields the moves of `legal_moves` lazily, all captures before any quiet move.
+
+        The position must be the same whenever the generator resumes.
+    '''
+    if not bitboards.pieces[color][KING]: return
+
+    for move in bitboards.iter_pseudo_legal_moves(color, captures_only):
+        if is_legal(bitboards, color, move, filter_for_check):
+            yield move
+
+def legal_moves(bitboards: GardnerBitboards, color: int, filter_for_check: bool = True) -> List[Tuple[int, int, int]]:
+    '''
+        Returns
+        -------
+        List of all moves legal for `color` under Atomic rules.
+    '''
+    if not bitboards.pieces[color][KING]: return []
+
+    return [move for move in bitboards.pseudo_legal_moves(color) if is_legal(bitboards, color, move, filter_for_check)]
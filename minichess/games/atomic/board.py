@@ -1,11 +1,17 @@
-from minichess.utils import surrounding_pieces
 from minichess.games.gardner.action import GardnerChessActionVisitor
-from typing import List
+from typing import Iterator, List
 from minichess.games.abstract.piece import PieceColor
 from minichess.games.atomic.pieces import Pawn, Knight, Bishop, Rook, Queen, King
 from minichess.games.abstract.action import AbstractActionFlags, AbstractChessAction
+from minichess.games.atomic import bitboard as atomic_bitboard
+from minichess.games.gardner.bitboard import SQUARE_POSITIONS, KING, square, squares
+from minichess.games.gardner.move import GardnerMove
+from minichess.games.gardner.packed import PackedChessBoard
 from minichess.games.gardner.board import GardnerChessBoard, BISHOP_VALUE, KNIGHT_VALUE, ROOK_VALUE, QUEEN_VALUE
 
+# the undo record of a move that exploded nothing
+NO_EXPLOSION = (0, ())
+
 class AtomicChessBoard(GardnerChessBoard):
     '''
         A rule variant of Gardner MiniChess where a capture removes the capturing piece, the captured piece, and all non-pawn pieces
@@ -16,8 +22,8 @@ class AtomicChessBoard(GardnerChessBoard):
     def __init__(self):
         super().__init__()
 
-        # this keeps track of pieces (and their locations) that are captured
-        # by "collateral" captures at each step
+        # one undo record per move of the pieces captured by "collateral": a tuple of the bitboard of
+        # their squares and the pieces, in ascending square order (see `_explode`)
         self.extra_capture_stack = []
 
     def push(self, action: AbstractChessAction, check_for_check=True):
@@ -25,13 +31,9 @@ class AtomicChessBoard(GardnerChessBoard):
         from_pos = action.from_pos
         to_pos = action.to_pos
 
-        if check_for_check:
-            checking_move, opp_cant_move = self._is_checking_action(action, self.active_color)
-
-            if checking_move: action.modifier_flags.append(AbstractActionFlags.CHECK)
-            if checking_move and opp_cant_move: action.modifier_flags.append(AbstractActionFlags.CHECKMATE)
+        if check_for_check: self._flag_checks(action)
 
-        neighbors = []
+        exploded = NO_EXPLOSION
 
         # either is a capture or isn't
         if AbstractActionFlags.CAPTURE in action.modifier_flags:
@@ -42,13 +44,8 @@ class AtomicChessBoard(GardnerChessBoard):
             # remove captured piece
             self.get(to_pos).pop()
 
-            # get the neighbors of the captured piece
-            neighbors = surrounding_pieces(to_pos, self, True)
-            neighbors = [neighbor for neighbor in neighbors if type(neighbor[0]) not in [Pawn, type(None)]]
-
             # remove surrounding pieces
-            for _, pos in neighbors:
-                self.get(pos).pop()
+            exploded = self._explode(square(to_pos))
 
         else: # otherwise, simply move
             agent = self.get(from_pos).pop()
@@ -69,7 +66,7 @@ class AtomicChessBoard(GardnerChessBoard):
                     self.get(to_pos).pop()
                     self.get(to_pos).push(Queen(agent.color, to_pos, QUEEN_VALUE))
 
-        self.extra_capture_stack.append(neighbors)
+        self.extra_capture_stack.append(exploded)
         self.move_history.append(action)
 
         self.active_color = self.active_color.invert()
@@ -84,23 +81,57 @@ class AtomicChessBoard(GardnerChessBoard):
         agent = action.agent
         captured_piece = action.captured_piece
 
-        self.get(from_pos).pop()
-        self.get(from_pos).push(agent)
+        # a capture left both squares empty, a plain move only `from_pos`
+        if captured_piece is None:
+            self.get(to_pos).pop()
+        else:
+            self.get(to_pos).push(captured_piece)
 
-        self.get(to_pos).pop()
-        if captured_piece is not None: self.get(to_pos).push(captured_piece)
+        self.get(from_pos).push(agent)
 
         # repopulate collaterally captured pieces
-        neighbors = self.extra_capture_stack.pop()
-        for piece,pos in neighbors:
-            self.get(pos).push(piece)
+        hit, pieces = self.extra_capture_stack.pop()
+        for sq, piece in zip(squares(hit), pieces):
+            self.get(SQUARE_POSITIONS[sq]).push(piece)
 
         self.active_color = self.active_color.invert()
 
         return action
 
+    def _copy_history(self, board, copy_piece=None):
+        super()._copy_history(board, copy_piece)
+
+        if copy_piece is None:
+            board.extra_capture_stack = self.extra_capture_stack.copy()
+        else:
+            board.extra_capture_stack = [(hit, tuple(copy_piece(piece) for piece in pieces)) for hit, pieces in self.extra_capture_stack]
+
+    def _explode(self, sq: int) -> tuple:
+        '''
+            Removes the non-pawn pieces around a capture on `sq`, whose pieces must already be removed.
+
+            Returns
+            -------
+            The undo record of the explosion: tuple of the bitboard of the exploded squares and the
+            removed pieces, in ascending square order.
+        '''
+        hit = atomic_bitboard.blast(self.bitboards, sq)
+        if not hit: return NO_EXPLOSION
+
+        return hit, tuple(self.get(SQUARE_POSITIONS[hit_sq]).pop() for hit_sq in squares(hit))
+
     def peek_extra_capture(self):
-        return self.extra_capture_stack[-1] if len(self.extra_capture_stack) > 0 else None
+        '''
+            Returns
+            -------
+            List of (piece, position) of the pieces captured by collateral in the last move, or None
+            if no move was made.
+        '''
+        if len(self.extra_capture_stack) == 0: return None
+
+        hit, pieces = self.extra_capture_stack[-1]
+
+        return [(piece, SQUARE_POSITIONS[sq]) for sq, piece in zip(squares(hit), pieces)]
 
     def _is_checking_action(self, action, color):
         '''
@@ -110,20 +141,14 @@ class AtomicChessBoard(GardnerChessBoard):
             - the first item is True if this action puts the opponent in check, False otherwise.
             - the second item is True if this action puts the opponent in checkmate, False otherwise.
         '''
-        if type(action.agent) == King: return False, len(self.legal_actions_for_color(color.invert(), filter_for_check=True)) == 0
+        if type(action.agent) == King: return False, not self.has_legal_action(color.invert())
 
         # simulate this move
         self.push(action, check_for_check=False)
 
-        can_capture_king = False
-
-        for possible_action in self.legal_actions_for_color(color, filter_for_check=False):
-            self.push(possible_action, check_for_check=False)
-            if type(possible_action.captured_piece) == King or King in [type(piece) for piece,_ in self.peek_extra_capture()]:
-                can_capture_king = True
-            self.pop()
+        can_capture_king = atomic_bitboard.threatens_king(self.bitboards, color.value)
 
-        opponent_cannot_move_next = len(self.legal_actions_for_color(color.invert(), filter_for_check=True)) == 0
+        opponent_cannot_move_next = not self.has_legal_action(color.invert())
 
         self.pop() # undo our move
 
@@ -143,18 +168,26 @@ class AtomicChessBoard(GardnerChessBoard):
 
         can_capture_king = False
 
-        for possible_action in self.legal_actions_for_color(anti_color, filter_for_check=False):
+        for possible_action in self._visitor_actions_for_color(anti_color, filter_for_check=False):
             self.push(possible_action, check_for_check=False)
             if type(possible_action.captured_piece) == King or King in [type(piece) for piece,_ in self.peek_extra_capture()]:
                 can_capture_king = True
             self.pop()
 
+            if can_capture_king: break
+
         self.pop() # undo our move
 
         return can_capture_king
 
-    def legal_actions_for_color(self, color: PieceColor, filter_for_check=True) -> List[AbstractChessAction]:
+    def _visitor_actions_for_color(self, color: PieceColor, filter_for_check=True) -> List[AbstractChessAction]:
+        '''
+            The original move generator, which filters the visitor's candidates by simulating each of
+            them, and every opponent reply, with push/pop.
 
+            This is kept as the reference implementation that `minichess.games.atomic.bitboard` is checked
+            against.
+        '''
         referee = GardnerChessActionVisitor()
         
         possible_actions = []
@@ -175,6 +208,25 @@ class AtomicChessBoard(GardnerChessBoard):
 
         return possible_actions
 
+    def _generate_actions(self, color: PieceColor, filter_for_check=True) -> List[AbstractChessAction]:
+        return [self._action_from_move(move) for move in atomic_bitboard.legal_moves(self.bitboards, color.value, filter_for_check)]
+
+    def _generate_moves(self, color: PieceColor, filter_for_check=True) -> tuple:
+        return tuple(self._intern(color, move) for move in atomic_bitboard.legal_moves(self.bitboards, color.value, filter_for_check))
+
+    def _iter_generated_moves(self, color: PieceColor, captures_only=False) -> Iterator[GardnerMove]:
+        for move in atomic_bitboard.iter_legal_moves(self.bitboards, color.value, captures_only):
+            yield self._intern(color, move)
+
+    def _in_check(self, color: PieceColor) -> bool:
+        # status deliberately keeps the original Atomic definition of check: only a direct capture
+        # of a king counts, not an explosion next to it (see `atomic_bitboard.threatens_king`), so
+        # that game results stay the same as under the original rules
+        for action in self.legal_actions_for_color(color.invert(), filter_for_check=False):
+            if AbstractActionFlags.KING_CAPTURE in action.modifier_flags:
+                return True
+        return False
+
     def _preserves_king(self, action, color):
         self.push(action, check_for_check=False)
 
@@ -185,8 +237,7 @@ class AtomicChessBoard(GardnerChessBoard):
         return preserves_king
 
     def _contains_king(self, color):
-        for tile in self:
-            piece = tile.peek()
-            if type(piece) == King and piece.color == color:
-                return True
-        return False
+        return self.bitboards.pieces[color.value][KING] != 0
+
+class PackedAtomicChessBoard(PackedChessBoard, AtomicChessBoard):
+    pass
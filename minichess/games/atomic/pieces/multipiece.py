@@ -8,6 +8,8 @@ class MultiPiece(AbstractChessPiece):
 
         This piece keeps track of its pieces with a queue. First in, first out.
     '''
+    __slots__ = ('pieces',)
+
     def __init__(self, pieces: List[AbstractChessPiece], position: tuple, value: int) -> None:
         super().__init__(PieceColor.WHITE, position, value)
         self.pieces = pieces
@@ -1,44 +1,94 @@
 from minichess.resources import EMPTY_TILE, SPACE
+from minichess.games.abstract.action import AbstractChessAction
 from minichess.games.abstract.piece import PieceColor
-from minichess.games.gardner.board import GardnerChessBoard, LEN_ACTION_SPACE
+from minichess.games.gardner.packed import PackedChessBoard
+from minichess.games.gardner.board import GardnerChessBoard, LEN_ACTION_SPACE, state_vectors
+from minichess.games.gardner.bitboard import BB_SQUARES, NUM_SQUARES, PIECE_TYPES, square
+
+from typing import List
 
 import numpy as np
 
+# the fogged piece planes of `canonical_state_vector` followed by the fog mask of the side to move
+OBSERVATION_PLANES = 2 * len(PIECE_TYPES) + 1
+
 class DarkChessBoard(GardnerChessBoard):
+    '''
+        Gardner MiniChess where each color only sees its own pieces and the squares its legal moves
+        go to.
+
+        The visibility of both colors is kept per ply on `visibility_stack`, which `push` and `pop`
+        keep in step with the move history. A color's entry is computed from the attack maps the first
+        time it is asked for, so that searching through a position and back again costs nothing.
+    '''
+    def __init__(self):
+        super().__init__()
+
+        # one entry per ply: None until computed, then a tuple of the position key it was computed
+        # for and the visibility bitboards of white and black, each None until asked for
+        self.visibility_stack = [None]
+
+    def push(self, action: AbstractChessAction, check_for_check=True):
+        super().push(action, check_for_check)
+
+        self.visibility_stack.append(None)
+
+    def pop(self) -> AbstractChessAction:
+        action = super().pop()
+
+        if action is not None: self.visibility_stack.pop()
+
+        return action
+
+    def _copy_history(self, board, copy_piece=None):
+        super()._copy_history(board, copy_piece)
+
+        board.visibility_stack = self.visibility_stack.copy()
 
     def visibility_mask(self, color: PieceColor) -> np.array:
         '''
             Generate an array of 0s an 1s representing the tiles that `color` currently can see.
         '''
-        vis_mask = np.zeros((self.height, self.width))
+        visible = self.visibility_bitboard(color)
+
+        return ((visible >> np.arange(NUM_SQUARES)) & 1).reshape(self.height, self.width).astype(np.float64)
+
+    def visibility_bitboard(self, color: PieceColor) -> int:
+        '''
+            Returns
+            -------
+            bitboard of the squares that `color` currently can see, see `visibility_mask`.
+        '''
+        key = self._position_key()
+        entry = self.visibility_stack[-1]
 
-        for tile in self:
-            if tile.occupied() and tile.peek().color == color:
-                vis_mask[tile.peek().position] = 1
+        # the tiles may also have been edited directly since the entry was made
+        if entry is None or entry[0] != key:
+            entry = (key, None, None)
 
-        for action in self.legal_actions_for_color(color):
-            from_pos = action.from_pos
-            to_pos = action.to_pos
+        slot = 1 + color.value
+        visible = entry[slot]
 
-            vis_mask[to_pos] = 1
+        if visible is None:
+            visible = self.bitboards.colors[color.value] | self.bitboards.legal_targets(color.value)
+            self.visibility_stack[-1] = entry[:slot] + (visible,) + entry[slot + 1:]
 
-        return vis_mask
+        return visible
 
-    def state_vector(self) -> np.array:
-        mask = np.expand_dims(self.visibility_mask(self.active_color), axis=2)
-        return np.tile(mask, (1, 1, 12)) * super().state_vector()
+    def _visible_squares(self) -> int:
+        return self.visibility_bitboard(self.active_color)
 
     def no_fog_board(self):
         return super().__str__()
 
     def __str__(self):
-        mask = self.visibility_mask(self.active_color)
+        visible = self.visibility_bitboard(self.active_color)
 
         s = ''
 
         for row_idx, row in enumerate(self._board):
             for col_idx, col in enumerate(row):
-                if mask[row_idx, col_idx] == 1:
+                if visible & BB_SQUARES[square((row_idx, col_idx))]:
                     s += str(col)
                 else:
                     s += EMPTY_TILE
@@ -46,3 +96,67 @@ class DarkChessBoard(GardnerChessBoard):
             s += '\n'
 
         return s
+
+def visibility_masks(boards: List[DarkChessBoard], out: np.array = None, dtype=np.float64, canonical: bool = False) -> np.array:
+    '''
+        Builds the fog masks of the active colors of many boards at once.
+
+        Parameters
+        ----------
+        boards :: List[DarkChessBoard] : the boards to build masks for
+
+        out :: np.array : optional shape (len(boards), 5, 5) buffer to write the masks into
+
+        dtype :: np.dtype : dtype of the returned array when `out` is None
+
+        canonical :: bool : if True, rotate the masks of boards with black to move by 180 degrees, as in
+        `canonical_state_vector`
+
+        Returns
+        -------
+        shape (len(boards), 5, 5) numpy array where entry `i` is `boards[i].visibility_mask(boards[i].active_color)`.
+    '''
+    if out is None:
+        out = np.empty((len(boards), 5, 5), dtype=dtype)
+
+    words = np.array([board._visible_squares() for board in boards], dtype='<u4')
+    bits = np.unpackbits(words.view(np.uint8).reshape(len(boards), 4), axis=1, bitorder='little')[:, :NUM_SQUARES]
+
+    if canonical:
+        flip = np.array([board.active_color == PieceColor.BLACK for board in boards], dtype=bool)
+
+        # rotating the board by 180 degrees maps square s to square 24 - s
+        if flip.any(): bits[flip] = bits[flip, ::-1]
+
+    out[...] = bits.reshape(len(boards), 5, 5)
+
+    return out
+
+def observations(boards: List[DarkChessBoard], out: np.array = None, dtype=np.float64) -> np.array:
+    '''
+        Encodes what the side to move sees on many boards at once.
+
+        Parameters
+        ----------
+        boards :: List[DarkChessBoard] : the boards to encode
+
+        out :: np.array : optional shape (len(boards), 5, 5, OBSERVATION_PLANES) buffer to write the planes into
+
+        dtype :: np.dtype : dtype of the returned array when `out` is None
+
+        Returns
+        -------
+        shape (len(boards), 5, 5, OBSERVATION_PLANES) numpy array, where `[i, :, :, :12]` is
+        `boards[i].canonical_state_vector()`, whose pieces are fogged, and `[i, :, :, 12]` is the
+        canonical fog mask, which tells hidden squares from empty ones.
+    '''
+    if out is None:
+        out = np.empty((len(boards), 5, 5, OBSERVATION_PLANES), dtype=dtype)
+
+    state_vectors(boards, out=out[..., :-1], canonical=True)
+    visibility_masks(boards, out=out[..., -1], canonical=True)
+
+    return out
+
+class PackedDarkChessBoard(PackedChessBoard, DarkChessBoard):
+    pass
@@ -3,93 +3,73 @@ from minichess.games.abstract.board import AbstractChessBoard
 from minichess.games.abstract.piece import AbstractChessPiece, PieceColor
 from minichess.games.gardner.pieces import Pawn, Knight, Bishop, Rook, Queen, King
 from minichess.games.abstract.action import AbstractActionFlags, AbstractChessAction, AbstractChessActionVisitor, visitor
-from minichess.games.gardner.action_reference import ID_TO_ACTION, ACTION_TO_ID, ID_TO_ACTION_BY_TILE, ID_TO_ACTION_BY_TILE
+from minichess.games.gardner.action_tables import NO_PROMOTION, decode_index, encode_move
+from minichess.games.gardner.bitboard import SQUARE_POSITIONS, KNIGHT, BISHOP, ROOK
 
 import numpy as np
 
 LEN_ACTION_SPACE = 1225
 
+# the modifier flag of each underpromotion, by bitboard piece type
+PROMOTION_FLAGS = {
+    KNIGHT: AbstractActionFlags.PROMOTE_KNIGHT,
+    BISHOP: AbstractActionFlags.PROMOTE_BISHOP,
+    ROOK: AbstractActionFlags.PROMOTE_ROOK
+}
+
 class GardnerChessAction(AbstractChessAction):
 
     def __init__(self, agent: AbstractChessPiece, from_pos: tuple, to_pos: tuple, captured_piece: AbstractChessPiece = None, modifier_flags: List[AbstractActionFlags] = None):
         super().__init__(agent, from_pos, to_pos, captured_piece, modifier_flags)
 
-    def encode(self) -> np.array:
-        modifier = (-1 if self.agent.color == PieceColor.WHITE else 1, 1 if self.agent.color == PieceColor.WHITE else -1)
-        # modifier = (1, 1)
-
-        delta = (
-            modifier[0] * (self.to_pos[0] - self.from_pos[0]),
-            modifier[1] * (self.to_pos[1] - self.from_pos[1])
-            )
-
-        action_tuple = tuple()
+    def index(self) -> int:
+        promotion = NO_PROMOTION
 
         # check for underpromotion flags
         if AbstractActionFlags.PROMOTE_BISHOP in self.modifier_flags:
-            action_tuple = (self.from_pos, (delta, 'bishop'))
+            promotion = BISHOP
         elif AbstractActionFlags.PROMOTE_KNIGHT in self.modifier_flags:
-            action_tuple = (self.from_pos, (delta, 'knight'))
+            promotion = KNIGHT
         elif AbstractActionFlags.PROMOTE_ROOK in self.modifier_flags:
-            action_tuple = (self.from_pos, (delta, 'rook'))
-        else: # else just a normal action tuple
-            action_tuple = (self.from_pos, delta)
+            promotion = ROOK
+
+        from_sq = self.from_pos[0] * 5 + self.from_pos[1]
+        to_sq = self.to_pos[0] * 5 + self.to_pos[1]
+
+        idx = encode_move(self.agent.color.value, from_sq, to_sq, promotion)
 
-        idx = ACTION_TO_ID[action_tuple]
+        if idx < 0: raise KeyError('{} is not in the action space.'.format(self))
 
+        return idx
+
+    def encode(self) -> np.array:
         onehot = np.zeros(LEN_ACTION_SPACE)
-        onehot[idx] = 1
+        onehot[self.index()] = 1
 
         return onehot
 
     @staticmethod
     def decode(encoding: Union[np.array, int], state_tm1: AbstractChessBoard, should_sanitize=True):
-        idx = encoding if type(encoding) == int else np.argmax(encoding)
-        
-        modifier = (-1 if state_tm1.active_color == PieceColor.WHITE else 1, 1 if state_tm1.active_color == PieceColor.WHITE else -1)
+        idx = int(encoding) if isinstance(encoding, (int, np.integer)) else int(np.argmax(encoding))
 
-        action = ID_TO_ACTION[idx]
+        from_sq, to_sq, promotion = decode_index(state_tm1.active_color.value, idx)
 
-        # action could be ((4, 4), ((1, 1), 'rook'))) or ((4, 1), (-3, -3))
+        assert from_sq >= 0, 'Could not decode action. Index {} names no move for {}.'.format(idx, state_tm1.active_color)
+
+        from_pos, to_pos = SQUARE_POSITIONS[from_sq], SQUARE_POSITIONS[to_sq]
 
-        from_pos = action[0]
         agent = state_tm1.get(from_pos).peek()
 
         if should_sanitize: assert agent is not None, 'Could not decode action. There exists no piece at {} for board:\n{}'.format(from_pos, state_tm1)
 
-        second_tup = action[1]
-
-        if type(second_tup[1]) == str: # (1, 1), 'rook')
-            delta = second_tup[0]
-            delta = (modifier[0] * delta[0], modifier[1] * delta[1])
-            underpromote = second_tup[1]
+        captured_piece = state_tm1.get(to_pos).peek()
 
-            to_pos = (from_pos[0] + delta[0], from_pos[1] + delta[1])
+        modifier_flags = [] if captured_piece is None else [AbstractActionFlags.CAPTURE]
 
-            captured_piece = state_tm1.get(to_pos).peek()
+        if promotion != NO_PROMOTION:
+            modifier_flags.append(PROMOTION_FLAGS[promotion])
 
-            modifier_flags = [] if captured_piece is None else [AbstractActionFlags.CAPTURE]
-
-            if underpromote == 'rook':
-                modifier_flags.append(AbstractActionFlags.PROMOTE_ROOK)
-            elif underpromote == 'bishop':
-                modifier_flags.append(AbstractActionFlags.PROMOTE_BISHOP)
-            elif underpromote == 'knight':
-                modifier_flags.append(AbstractActionFlags.PROMOTE_KNIGHT)
-            else:
-                raise RuntimeError('Invalid AbstractActionFlag type {}'.format(underpromote))
-
-            return GardnerChessAction(agent, from_pos, to_pos, captured_piece, modifier_flags)
-        else: # (-3, -3)
-            delta = second_tup
-            delta = (modifier[0] * delta[0], modifier[1] * delta[1])
-            to_pos = (from_pos[0] + delta[0], from_pos[1] + delta[1])
-
-            captured_piece = state_tm1.get(to_pos).peek()
-
-            modifier_flags = [] if captured_piece is None else [AbstractActionFlags.CAPTURE]
-
-            return GardnerChessAction(agent, from_pos, to_pos, captured_piece, modifier_flags)
+        return GardnerChessAction(agent, from_pos, to_pos, captured_piece, modifier_flags)
 
     def fliplr(self):
         '''
@@ -113,6 +93,16 @@ class GardnerChessAction(AbstractChessAction):
 
         return type(self)(self.agent, (4 - from_row, from_col), (4 - to_row, to_col), self.captured_piece, self.modifier_flags.copy())
 
+def encode_indices(actions: List[GardnerChessAction]) -> np.array:
+    '''
+        Encodes a list of actions as their indices in the action space.
+
+        Returns
+        -------
+        shape (len(actions),) numpy array of action indices.
+    '''
+    return np.fromiter((action.index() for action in actions), dtype=np.intp, count=len(actions))
+
 # TODO check-filtering
 
 class GardnerChessActionVisitor(AbstractChessActionVisitor):
@@ -225,14 +215,13 @@ class GardnerChessActionVisitor(AbstractChessActionVisitor):
                 new_row, new_col = row + (y_dir * 2), col + (x_dir)
                 new_pos = (new_row, new_col)
 
-                if board.is_valid_position(new_pos):
-                    possible_moves.extend(self._piece_move_helper(piece, board, new_pos))
+                possible_moves.extend(self._piece_move_helper(piece, board, new_pos))
 
-                    # x major axis
-                    new_row, new_col = row + (y_dir), col + (2 * x_dir)
-                    new_pos = (new_row, new_col)
+                # x major axis
+                new_row, new_col = row + (y_dir), col + (2 * x_dir)
+                new_pos = (new_row, new_col)
 
-                    possible_moves.extend(self._piece_move_helper(piece, board, new_pos))
+                possible_moves.extend(self._piece_move_helper(piece, board, new_pos))
 
         return possible_moves
 
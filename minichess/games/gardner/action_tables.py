@@ -0,0 +1,103 @@
+'''
+    Dense lookup tables between the 1225-wide action space and move geometry.
+
+    `ENCODE[color, from_sq, to_sq, promotion]` is the action index of a move, and `DECODE[color, index]`
+    is the `(from_sq, to_sq, promotion)` of an action index. `promotion` is the bitboard piece type of
+    an underpromotion (`KNIGHT`, `BISHOP` or `ROOK`), or `NO_PROMOTION` for every other move including
+    queen promotions. Entries that name no move are -1.
+
+    The tables are built from `action_reference` at import, which takes about a millisecond.
+'''
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action_reference import ID_TO_ACTION
+from minichess.games.gardner.bitboard import NUM_SQUARES, SIDE_LENGTH, KNIGHT, BISHOP, ROOK
+
+from typing import Tuple, Union
+
+import numpy as np
+
+NO_PROMOTION = 0
+
+UNDERPROMOTIONS = {
+    'knight': KNIGHT,
+    'bishop': BISHOP,
+    'rook': ROOK
+}
+
+NUM_PROMOTIONS = ROOK + 1
+
+# the (row, col) direction multipliers that turn a delta of the action space into a board delta
+MODIFIERS = ((-1, 1), (1, -1))
+
+def _build_tables() -> Tuple[np.array, np.array]:
+    encode = np.full((2, NUM_SQUARES, NUM_SQUARES, NUM_PROMOTIONS), -1, dtype=np.int16)
+    decode = np.full((2, len(ID_TO_ACTION), 3), -1, dtype=np.int8)
+
+    for color in (PieceColor.WHITE.value, PieceColor.BLACK.value):
+        modifier = MODIFIERS[color]
+
+        for index, (from_pos, delta) in ID_TO_ACTION.items():
+            promotion = NO_PROMOTION
+
+            if type(delta[1]) == str: # underpromotion, ((1, 1), 'rook')
+                delta, promotion = delta[0], UNDERPROMOTIONS[delta[1]]
+
+            to_row, to_col = from_pos[0] + modifier[0] * delta[0], from_pos[1] + modifier[1] * delta[1]
+
+            # this index never names a move for this color
+            if not (0 <= to_row < SIDE_LENGTH and 0 <= to_col < SIDE_LENGTH): continue
+
+            from_sq = from_pos[0] * SIDE_LENGTH + from_pos[1]
+            to_sq = to_row * SIDE_LENGTH + to_col
+
+            encode[color, from_sq, to_sq, promotion] = index
+            decode[color, index] = (from_sq, to_sq, promotion)
+
+    encode.flags.writeable = False
+    decode.flags.writeable = False
+
+    return encode, decode
+
+ENCODE, DECODE = _build_tables()
+
+# nested lists of the same tables, for scalar lookups without NumPy overhead
+_ENCODE = ENCODE.tolist()
+_DECODE = DECODE.tolist()
+
+def encode_move(color: int, from_sq: int, to_sq: int, promotion: int = NO_PROMOTION) -> int:
+    '''
+        Returns
+        -------
+        The action index of a move of `color` (a `PieceColor` value), or -1 if no index names it.
+    '''
+    return _ENCODE[color][from_sq][to_sq][promotion]
+
+def decode_index(color: int, index: int) -> Tuple[int, int, int]:
+    '''
+        Returns
+        -------
+        tuple of (from_sq, to_sq, promotion) of action `index` for `color` (a `PieceColor` value),
+        all -1 if it names no move for `color`.
+    '''
+    return tuple(_DECODE[color][index])
+
+def encode_moves(colors: Union[int, np.array], from_sqs: np.array, to_sqs: np.array, promotions: np.array = NO_PROMOTION) -> np.array:
+    '''
+        Batched `encode_move`, all arguments broadcast against each other.
+
+        Returns
+        -------
+        numpy array of action indices, -1 where no index names the move.
+    '''
+    return ENCODE[colors, from_sqs, to_sqs, promotions]
+
+def decode_indices(colors: Union[int, np.array], indices: np.array) -> Tuple[np.array, np.array, np.array]:
+    '''
+        Batched `decode_index`, `colors` broadcast against `indices`.
+
+        Returns
+        -------
+        tuple of (from_sqs, to_sqs, promotions) numpy arrays, -1 where an index names no move.
+    '''
+    decoded = DECODE[colors, indices]
+    return decoded[..., 0], decoded[..., 1], decoded[..., 2]
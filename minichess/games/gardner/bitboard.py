@@ -0,0 +1,664 @@
+'''
+    Bitboard backend for 5x5 MiniChess.
+
+    Square `sq` corresponds to the python-convention position `(sq // 5, sq % 5)`, and
+    bit `1 << sq` of a bitboard is set if that square is part of the set.
+'''
+
+from minichess.games.gardner.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import random
+
+SIDE_LENGTH = 5
+NUM_SQUARES = SIDE_LENGTH * SIDE_LENGTH
+
+WHITE = 0
+BLACK = 1
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+PIECE_TYPES = (Pawn, Knight, Bishop, Rook, Queen, King)
+PIECE_INDEX = {piece_type: idx for idx, piece_type in enumerate(PIECE_TYPES)}
+
+# one byte per square: 0 for an empty square, otherwise 1 + 6 * color + piece type
+EMPTY = 0
+NUM_CODES = 1 + 2 * len(PIECE_TYPES)
+CODE_COLORS = [None] + [color for color in (WHITE, BLACK) for _ in PIECE_TYPES]
+CODE_TYPES = [None] + [piece_type for _ in (WHITE, BLACK) for piece_type in range(len(PIECE_TYPES))]
+
+def piece_code(color: int, piece_type: int) -> int:
+    return 1 + len(PIECE_TYPES) * color + piece_type
+
+# promotion order matches GardnerChessActionVisitor._pawn_move_helper
+PROMOTIONS = (QUEEN, KNIGHT, BISHOP, ROOK)
+
+BB_ALL = (1 << NUM_SQUARES) - 1
+BB_SQUARES = [1 << sq for sq in range(NUM_SQUARES)]
+SQUARE_POSITIONS = [divmod(sq, SIDE_LENGTH) for sq in range(NUM_SQUARES)]
+BB_BACK_RANKS = sum(BB_SQUARES[col] | BB_SQUARES[(SIDE_LENGTH - 1) * SIDE_LENGTH + col] for col in range(SIDE_LENGTH))
+
+ROOK_DIRECTIONS = ((1, 0), (0, -1), (0, 1), (-1, 0))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+KNIGHT_OFFSETS = ((2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1))
+KING_OFFSETS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+def square(position: Tuple[int, int]) -> int:
+    '''
+        Returns
+        -------
+        The square index of a python-convention (row, col) position.
+    '''
+    return position[0] * SIDE_LENGTH + position[1]
+
+def _on_board(row: int, col: int) -> bool:
+    return 0 <= row < SIDE_LENGTH and 0 <= col < SIDE_LENGTH
+
+def _offset_table(offsets) -> List[int]:
+    table = []
+    for sq in range(NUM_SQUARES):
+        row, col = SQUARE_POSITIONS[sq]
+        bb = 0
+        for d_row, d_col in offsets:
+            if _on_board(row + d_row, col + d_col):
+                bb |= BB_SQUARES[square((row + d_row, col + d_col))]
+        table.append(bb)
+    return table
+
+def _ray_attacks(sq: int, occupied: int, directions) -> int:
+    '''
+        Slow reference slider attack generation, used only to build the lookup tables.
+    '''
+    row, col = SQUARE_POSITIONS[sq]
+    attacks = 0
+    for d_row, d_col in directions:
+        r, c = row + d_row, col + d_col
+        while _on_board(r, c):
+            bb = BB_SQUARES[square((r, c))]
+            attacks |= bb
+            if occupied & bb:
+                break
+            r, c = r + d_row, c + d_col
+    return attacks
+
+def _slider_tables(directions) -> Tuple[List[int], List[dict]]:
+    '''
+        Builds, for every square, the mask of squares a slider could reach on an empty board
+        and a table mapping every occupancy of that mask to the resulting attack set.
+    '''
+    masks = []
+    tables = []
+    for sq in range(NUM_SQUARES):
+        mask = _ray_attacks(sq, 0, directions)
+        table = {}
+
+        # enumerate all subsets of `mask`
+        subset = 0
+        while True:
+            table[subset] = _ray_attacks(sq, subset, directions)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+KNIGHT_ATTACKS = _offset_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _offset_table(KING_OFFSETS)
+
+# white pawns move towards row 0, black pawns towards row 4
+PAWN_PUSHES = (_offset_table(((-1, 0),)), _offset_table(((1, 0),)))
+PAWN_ATTACKS = (_offset_table(((-1, -1), (-1, 1))), _offset_table(((1, -1), (1, 1))))
+
+ROOK_MASKS, ROOK_TABLES = _slider_tables(ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_TABLES = _slider_tables(BISHOP_DIRECTIONS)
+
+def _between_table() -> List[List[int]]:
+    '''
+        Builds a table where `table[a][b]` is the set of squares strictly between `a` and `b` if they
+        share a rank, file or diagonal, and 0 otherwise.
+    '''
+    table = [[0] * NUM_SQUARES for _ in range(NUM_SQUARES)]
+    for a in range(NUM_SQUARES):
+        row, col = SQUARE_POSITIONS[a]
+        for d_row, d_col in KING_OFFSETS:
+            between = 0
+            r, c = row + d_row, col + d_col
+            while _on_board(r, c):
+                b = square((r, c))
+                table[a][b] = between
+                between |= BB_SQUARES[b]
+                r, c = r + d_row, c + d_col
+    return table
+
+BETWEEN = _between_table()
+
+# Zobrist keys, seeded so that keys are stable across processes and runs
+_zobrist_rng = random.Random(0x5EED)
+
+ZOBRIST_PIECES = [[[_zobrist_rng.getrandbits(64) for _ in range(NUM_SQUARES)] for _ in PIECE_TYPES] for _ in (WHITE, BLACK)]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    return ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]]
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    return BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]]
+
+def queen_attacks(sq: int, occupied: int) -> int:
+    return ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]] | BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]]
+
+def squares(bb: int) -> List[int]:
+    '''
+        Returns
+        -------
+        List of the square indices set in `bb`, in ascending order.
+    '''
+    result = []
+    while bb:
+        lsb = bb & -bb
+        result.append(lsb.bit_length() - 1)
+        bb ^= lsb
+    return result
+
+class CheckInfo(NamedTuple):
+    '''
+        Everything needed to decide the legality of a move for one side without simulating it.
+
+        king :: int : bitboard of the side's kings
+
+        checkers :: int : bitboard of the opponent pieces attacking the king
+
+        evasions :: int : squares a non-king piece may move to (everything when not in check, the
+        checker and the squares between it and the king in single check, nothing in double check)
+
+        pinned :: Dict[int, int] : maps the square of each pinned piece to the squares it may move to
+
+        attacked :: int : squares attacked by the opponent, with the king removed from the board so
+        that it cannot retreat along a checking ray
+    '''
+    king: int
+    checkers: int
+    evasions: int
+    pinned: Dict[int, int]
+    attacked: int
+
+class GardnerBitboards:
+    '''
+        Per-color, per-piece-type bitboards for a 5x5 board.
+
+        `pieces[color][piece_type]` is the set of squares holding a piece of that color and
+        type, and `colors[color]` is the union over all piece types of that color. Colors and
+        piece types are the integer indices defined in this module.
+
+        `zobrist` is the 64-bit Zobrist key of the piece placement, updated incrementally as
+        pieces are set and removed.
+
+        Moves are represented as `(from_sq, to_sq, promotion)` tuples, where `promotion` is
+        the piece type a pawn promotes to, or None.
+    '''
+
+    __slots__ = ('pieces', 'colors', 'zobrist')
+
+    def __init__(self) -> None:
+        self.pieces = [[0] * 6, [0] * 6]
+        self.colors = [0, 0]
+        self.zobrist = 0
+
+    def copy(self) -> 'GardnerBitboards':
+        bitboards = GardnerBitboards.__new__(GardnerBitboards)
+        bitboards.pieces = [self.pieces[WHITE].copy(), self.pieces[BLACK].copy()]
+        bitboards.colors = self.colors.copy()
+        bitboards.zobrist = self.zobrist
+        return bitboards
+
+    def set_piece(self, sq: int, color: int, piece_type: int) -> None:
+        bb = BB_SQUARES[sq]
+        self.pieces[color][piece_type] |= bb
+        self.colors[color] |= bb
+        self.zobrist ^= ZOBRIST_PIECES[color][piece_type][sq]
+
+    def remove_piece(self, sq: int, color: int, piece_type: int) -> None:
+        bb = ~BB_SQUARES[sq]
+        self.pieces[color][piece_type] &= bb
+        self.colors[color] &= bb
+        self.zobrist ^= ZOBRIST_PIECES[color][piece_type][sq]
+
+    def clear(self) -> None:
+        self.pieces = [[0] * 6, [0] * 6]
+        self.colors = [0, 0]
+        self.zobrist = 0
+
+    def compute_zobrist(self) -> int:
+        '''
+            Returns
+            -------
+            The Zobrist key of the piece placement, computed from scratch.
+        '''
+        key = 0
+        for color in (WHITE, BLACK):
+            for piece_type in range(len(PIECE_TYPES)):
+                for sq in squares(self.pieces[color][piece_type]):
+                    key ^= ZOBRIST_PIECES[color][piece_type][sq]
+        return key
+
+    @property
+    def occupied(self) -> int:
+        return self.colors[WHITE] | self.colors[BLACK]
+
+    def attackers(self, sq: int, by_color: int, occupied: int, exclude: int = 0) -> int:
+        '''
+            Parameters
+            ----------
+            sq :: int : the square being attacked
+
+            by_color :: int : the color of the attacking pieces
+
+            occupied :: int : the occupancy to use for sliding pieces
+
+            exclude :: int : a bitboard of squares whose pieces should be ignored (e.g. pieces that
+            are about to be captured)
+
+            Returns
+            -------
+            Bitboard of the pieces of color `by_color` that attack `sq`.
+        '''
+        pieces = self.pieces[by_color]
+        diagonal = pieces[BISHOP] | pieces[QUEEN]
+        straight = pieces[ROOK] | pieces[QUEEN]
+
+        attackers = (
+            (KNIGHT_ATTACKS[sq] & pieces[KNIGHT]) |
+            (KING_ATTACKS[sq] & pieces[KING]) |
+            (PAWN_ATTACKS[by_color ^ 1][sq] & pieces[PAWN]) |
+            (BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]] & diagonal) |
+            (ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]] & straight)
+        )
+
+        return attackers & ~exclude
+
+    def is_attacked(self, sq: int, by_color: int) -> bool:
+        return self.attackers(sq, by_color, self.occupied) != 0
+
+    def king_attacked(self, color: int) -> bool:
+        '''
+            Returns
+            -------
+            True if any king of color `color` can be captured by the opponent, False otherwise.
+        '''
+        occupied = self.occupied
+        for sq in squares(self.pieces[color][KING]):
+            if self.attackers(sq, color ^ 1, occupied):
+                return True
+        return False
+
+    def attacks_from(self, sq: int, color: int, piece_type: int, occupied: int) -> int:
+        '''
+            Returns
+            -------
+            Bitboard of the squares a piece of `piece_type` and `color` on `sq` attacks.
+        '''
+        if piece_type == PAWN:
+            return PAWN_ATTACKS[color][sq]
+        elif piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[sq]
+        elif piece_type == BISHOP:
+            return bishop_attacks(sq, occupied)
+        elif piece_type == ROOK:
+            return rook_attacks(sq, occupied)
+        elif piece_type == QUEEN:
+            return queen_attacks(sq, occupied)
+        else:
+            return KING_ATTACKS[sq]
+
+    def pseudo_legal_moves(self, color: int) -> List[Tuple[int, int, int]]:
+        '''
+            Returns
+            -------
+            List of all moves for `color`, ignoring whether they leave a king in check.
+        '''
+        own = self.colors[color]
+        opp = self.colors[color ^ 1]
+        occupied = own | opp
+        pieces = self.pieces[color]
+
+        moves = []
+
+        pushes = PAWN_PUSHES[color]
+        pawn_attacks = PAWN_ATTACKS[color]
+        bb = pieces[PAWN]
+        while bb:
+            lsb = bb & -bb
+            bb ^= lsb
+            from_sq = lsb.bit_length() - 1
+
+            targets = (pushes[from_sq] & ~occupied) | (pawn_attacks[from_sq] & opp)
+            while targets:
+                to_bb = targets & -targets
+                targets ^= to_bb
+                to_sq = to_bb.bit_length() - 1
+
+                if to_bb & BB_BACK_RANKS:
+                    for promotion in PROMOTIONS:
+                        moves.append((from_sq, to_sq, promotion))
+                else:
+                    moves.append((from_sq, to_sq, None))
+
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            bb = pieces[piece_type]
+            while bb:
+                lsb = bb & -bb
+                bb ^= lsb
+                from_sq = lsb.bit_length() - 1
+
+                if piece_type == KNIGHT:
+                    targets = KNIGHT_ATTACKS[from_sq]
+                elif piece_type == BISHOP:
+                    targets = BISHOP_TABLES[from_sq][occupied & BISHOP_MASKS[from_sq]]
+                elif piece_type == ROOK:
+                    targets = ROOK_TABLES[from_sq][occupied & ROOK_MASKS[from_sq]]
+                elif piece_type == QUEEN:
+                    targets = BISHOP_TABLES[from_sq][occupied & BISHOP_MASKS[from_sq]] | ROOK_TABLES[from_sq][occupied & ROOK_MASKS[from_sq]]
+                else:
+                    targets = KING_ATTACKS[from_sq]
+
+                targets &= ~own
+                while targets:
+                    to_bb = targets & -targets
+                    targets ^= to_bb
+                    moves.append((from_sq, to_bb.bit_length() - 1, None))
+
+        return moves
+
+    def iter_pseudo_legal_moves(self, color: int, captures_only: bool = False) -> Iterator[Tuple[int, int, int]]:
+        '''
+            Yields the moves of `pseudo_legal_moves` lazily, all captures before any quiet move.
+
+            The position must be the same whenever the generator resumes.
+        '''
+        own = self.colors[color]
+        opp = self.colors[color ^ 1]
+        occupied = own | opp
+        pieces = self.pieces[color]
+
+        pushes = PAWN_PUSHES[color]
+
+        for captures in ((True,) if captures_only else (True, False)):
+            allowed = opp if captures else BB_ALL & ~occupied
+
+            for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+                bb = pieces[piece_type]
+                while bb:
+                    lsb = bb & -bb
+                    bb ^= lsb
+                    from_sq = lsb.bit_length() - 1
+
+                    if piece_type == PAWN and not captures:
+                        targets = pushes[from_sq] & allowed
+                    else:
+                        targets = self.attacks_from(from_sq, color, piece_type, occupied) & allowed
+
+                    while targets:
+                        to_bb = targets & -targets
+                        targets ^= to_bb
+                        to_sq = to_bb.bit_length() - 1
+
+                        if piece_type == PAWN and to_bb & BB_BACK_RANKS:
+                            for promotion in PROMOTIONS:
+                                yield (from_sq, to_sq, promotion)
+                        else:
+                            yield (from_sq, to_sq, None)
+
+    def iter_legal_moves(self, color: int, captures_only: bool = False) -> Iterator[Tuple[int, int, int]]:
+        '''
+            Yields the moves of `legal_moves` lazily, all captures before any quiet move.
+
+            The position must be the same whenever the generator resumes.
+        '''
+        info = self.check_info(color)
+
+        for move in self.iter_pseudo_legal_moves(color, captures_only):
+            if self.is_legal(color, move, info):
+                yield move
+
+    def leaves_king_attacked(self, color: int, move: Tuple[int, int, int]) -> bool:
+        '''
+            Returns
+            -------
+            True if making `move` for `color` under Gardner rules (the capturing piece replaces the
+            captured piece) would let the opponent capture one of `color`'s kings.
+        '''
+        from_sq, to_sq, _ = move
+        from_bb = BB_SQUARES[from_sq]
+        to_bb = BB_SQUARES[to_sq]
+
+        kings = self.pieces[color][KING]
+        if not kings:
+            return False
+
+        if kings & from_bb:
+            kings ^= from_bb | to_bb
+
+        occupied = (self.colors[color] ^ from_bb | to_bb) | (self.colors[color ^ 1] & ~to_bb)
+
+        while kings:
+            lsb = kings & -kings
+            kings ^= lsb
+            if self.attackers(lsb.bit_length() - 1, color ^ 1, occupied, to_bb):
+                return True
+
+        return False
+
+    def attacked_squares(self, color: int, occupied: int) -> int:
+        '''
+            Returns
+            -------
+            Bitboard of every square attacked by a piece of color `color`, using `occupied` for sliding pieces.
+        '''
+        pieces = self.pieces[color]
+        attacked = 0
+
+        pawn_attacks = PAWN_ATTACKS[color]
+        for sq in squares(pieces[PAWN]):
+            attacked |= pawn_attacks[sq]
+        for sq in squares(pieces[KNIGHT]):
+            attacked |= KNIGHT_ATTACKS[sq]
+        for sq in squares(pieces[BISHOP] | pieces[QUEEN]):
+            attacked |= BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]]
+        for sq in squares(pieces[ROOK] | pieces[QUEEN]):
+            attacked |= ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]]
+        for sq in squares(pieces[KING]):
+            attacked |= KING_ATTACKS[sq]
+
+        return attacked
+
+    def check_info(self, color: int) -> CheckInfo:
+        '''
+            Computes the checkers, pins and opponent attack map for `color` in the current position.
+
+            Returns
+            -------
+            CheckInfo for `color`.
+        '''
+        king = self.pieces[color][KING]
+        opp_color = color ^ 1
+
+        # with no king there is nothing to protect, and with several kings we fall back
+        # to `leaves_king_attacked` (see `is_legal`)
+        if not king or king & (king - 1):
+            return CheckInfo(king, 0, BB_ALL, {}, 0)
+
+        king_sq = king.bit_length() - 1
+        own = self.colors[color]
+        occupied = own | self.colors[opp_color]
+        opp_pieces = self.pieces[opp_color]
+
+        checkers = self.attackers(king_sq, opp_color, occupied)
+
+        if not checkers:
+            evasions = BB_ALL
+        elif checkers & (checkers - 1):
+            evasions = 0
+        else:
+            evasions = checkers | BETWEEN[king_sq][checkers.bit_length() - 1]
+
+        # sliders that would attack the king through exactly one of our pieces pin that piece
+        pinned = {}
+        snipers = (
+            (ROOK_TABLES[king_sq][0] & (opp_pieces[ROOK] | opp_pieces[QUEEN])) |
+            (BISHOP_TABLES[king_sq][0] & (opp_pieces[BISHOP] | opp_pieces[QUEEN]))
+        )
+        for sniper_sq in squares(snipers):
+            between = BETWEEN[king_sq][sniper_sq]
+            blockers = between & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned[blockers.bit_length() - 1] = between | BB_SQUARES[sniper_sq]
+
+        attacked = self.attacked_squares(opp_color, occupied ^ king)
+
+        return CheckInfo(king, checkers, evasions, pinned, attacked)
+
+    def is_legal(self, color: int, move: Tuple[int, int, int], info: CheckInfo) -> bool:
+        '''
+            Parameters
+            ----------
+            color :: int : the color making `move`
+
+            move :: Tuple[int, int, int] : a pseudo-legal move for `color`
+
+            info :: CheckInfo : the result of `check_info(color)` for the current position
+
+            Returns
+            -------
+            True if `move` does not leave one of `color`'s kings capturable, False otherwise.
+        '''
+        king = info.king
+        if not king:
+            return True
+        if king & (king - 1):
+            return not self.leaves_king_attacked(color, move)
+
+        from_sq, to_sq, _ = move
+        to_bb = BB_SQUARES[to_sq]
+
+        if king == BB_SQUARES[from_sq]:
+            return not info.attacked & to_bb
+
+        if not info.evasions & to_bb:
+            return False
+
+        pin = info.pinned.get(from_sq)
+        return pin is None or bool(pin & to_bb)
+
+    def legal_moves(self, color: int) -> List[Tuple[int, int, int]]:
+        '''
+            Returns
+            -------
+            List of all moves for `color` that do not leave one of its kings capturable.
+        '''
+        moves = self.pseudo_legal_moves(color)
+
+        king = self.pieces[color][KING]
+        if not king:
+            return moves
+        if king & (king - 1):
+            return [move for move in moves if not self.leaves_king_attacked(color, move)]
+
+        info = self.check_info(color)
+
+        king_sq = king.bit_length() - 1
+        attacked = info.attacked
+        evasions = info.evasions
+        pinned = info.pinned
+
+        legal = []
+        for move in moves:
+            from_sq = move[0]
+            to_bb = BB_SQUARES[move[1]]
+
+            if from_sq == king_sq:
+                if not attacked & to_bb:
+                    legal.append(move)
+            elif evasions & to_bb:
+                pin = pinned.get(from_sq)
+                if pin is None or pin & to_bb:
+                    legal.append(move)
+
+        return legal
+
+    def legal_targets(self, color: int) -> int:
+        '''
+            Returns
+            -------
+            Bitboard of the squares that the moves of `legal_moves(color)` move to, computed from the
+            attack maps without generating the moves.
+        '''
+        king = self.pieces[color][KING]
+
+        if king & (king - 1):
+            targets = 0
+            for _, to_sq, _ in self.legal_moves(color):
+                targets |= BB_SQUARES[to_sq]
+            return targets
+
+        own = self.colors[color]
+        opp = self.colors[color ^ 1]
+        occupied = own | opp
+        pieces = self.pieces[color]
+
+        if king:
+            info = self.check_info(color)
+            evasions = info.evasions
+            pinned = info.pinned
+            targets = KING_ATTACKS[king.bit_length() - 1] & ~own & ~info.attacked
+
+            if not evasions: return targets
+        else:
+            evasions = BB_ALL
+            pinned = {}
+            targets = 0
+
+        pushes = PAWN_PUSHES[color]
+        pawn_attacks = PAWN_ATTACKS[color]
+
+        for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN):
+            bb = pieces[piece_type]
+            while bb:
+                lsb = bb & -bb
+                bb ^= lsb
+                from_sq = lsb.bit_length() - 1
+
+                if piece_type == PAWN:
+                    reach = (pushes[from_sq] & ~occupied) | (pawn_attacks[from_sq] & opp)
+                else:
+                    reach = self.attacks_from(from_sq, color, piece_type, occupied) & ~own
+
+                reach &= evasions
+
+                pin = pinned.get(from_sq)
+                if pin is not None: reach &= pin
+
+                targets |= reach
+
+        return targets
+
+    def codes(self) -> bytearray:
+        '''
+            Returns
+            -------
+            bytearray of the `piece_code` of every square, indexed by square.
+        '''
+        codes = bytearray(NUM_SQUARES)
+
+        for color in (WHITE, BLACK):
+            for piece_type, bb in enumerate(self.pieces[color]):
+                for sq in squares(bb):
+                    codes[sq] = piece_code(color, piece_type)
+
+        return codes
+
+    def has_only_kings(self) -> bool:
+        pieces = self.pieces
+        return (self.colors[WHITE] | self.colors[BLACK]) == (pieces[WHITE][KING] | pieces[BLACK][KING])
@@ -0,0 +1,864 @@
+from minichess.games.gardner.action import GardnerChessAction, GardnerChessActionVisitor, LEN_ACTION_SPACE
+from minichess.games.abstract.action import AbstractActionFlags, AbstractChessAction
+from typing import Callable, Iterator, List
+from minichess.games.abstract.piece import AbstractChessPiece, PieceColor
+from minichess.games.gardner.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from minichess.games.abstract.board import AbstractChessBoard, AbstractChessTile, AbstractBoardStatus
+from minichess.games.gardner.action_tables import NO_PROMOTION, encode_move
+from minichess.games.gardner.move import GardnerMove, MOVES
+from minichess.games.gardner.bitboard import GardnerBitboards, PIECE_INDEX, SQUARE_POSITIONS, ZOBRIST_BLACK_TO_MOVE, BB_ALL, NUM_SQUARES, PIECE_TYPES, BB_SQUARES, EMPTY, CODE_COLORS, CODE_TYPES, BB_BACK_RANKS, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, square
+
+import numpy as np
+
+PAWN_VALUE   = 100
+KNIGHT_VALUE = 305
+BISHOP_VALUE = 333
+ROOK_VALUE   = 563
+QUEEN_VALUE  = 950
+KING_VALUE   = 10000
+
+# by bitboard piece type
+PIECE_VALUES = (PAWN_VALUE, KNIGHT_VALUE, BISHOP_VALUE, ROOK_VALUE, QUEEN_VALUE, KING_VALUE)
+
+# the modifier flag of each promotion, queen included, by bitboard piece type
+PROMOTION_FLAG_BY_TYPE = {
+    QUEEN: AbstractActionFlags.PROMOTE_QUEEN,
+    KNIGHT: AbstractActionFlags.PROMOTE_KNIGHT,
+    BISHOP: AbstractActionFlags.PROMOTE_BISHOP,
+    ROOK: AbstractActionFlags.PROMOTE_ROOK
+}
+
+class GardnerChessTile(AbstractChessTile):
+    '''
+        A chess tile that mirrors every change of its piece into the bitboards of its board,
+        so that the tile/piece API remains a view of the bitboard state.
+    '''
+
+    __slots__ = ('bitboards', 'square')
+
+    def __init__(self, color: PieceColor, position: tuple, piece: AbstractChessPiece, bitboards: GardnerBitboards) -> None:
+        self.bitboards = bitboards
+        self.square = square(position)
+        super().__init__(color, position, None)
+
+        self.push(piece)
+
+    def push(self, piece: AbstractChessPiece):
+        super().push(piece)
+
+        if piece is not None:
+            self.bitboards.set_piece(self.square, piece.color.value, PIECE_INDEX[type(piece)])
+
+    def pop(self):
+        piece = super().pop()
+
+        if piece is not None:
+            self.bitboards.remove_piece(self.square, piece.color.value, PIECE_INDEX[type(piece)])
+
+        return piece
+
+class GardnerChessBoard(AbstractChessBoard):
+
+    def __init__(self, board=None) -> None:
+        # must exist before the tiles are created
+        self.bitboards = GardnerBitboards()
+
+        # move generation results for the position identified by `_cache_key`
+        self._cache_key = None
+        self._cache = {}
+
+        super().__init__(5)
+
+        if board == None: self._populate_board()
+        else:
+            for row in board:
+                for tile in row:
+                    self.get(tile.position).push(tile.peek())
+
+    def _make_tile(self, color: PieceColor, position: tuple):
+        return GardnerChessTile(color, position, None, self.bitboards)
+
+    def _populate_board(self):
+        '''
+            Places the pieces on the board according to the Gardner MiniChess rules.
+        '''
+
+        black_pawns = [Pawn(PieceColor.BLACK, (-1, -1), PAWN_VALUE) for _ in range(5)]
+        black_knight = Knight(PieceColor.BLACK, (-1, -1), KNIGHT_VALUE)
+        black_bishop = Bishop(PieceColor.BLACK, (-1, -1), BISHOP_VALUE)
+        black_rook = Rook(PieceColor.BLACK, (-1, -1), ROOK_VALUE)
+        black_queen = Queen(PieceColor.BLACK, (-1, -1), QUEEN_VALUE)
+        black_king = King(PieceColor.BLACK, (-1, -1), KING_VALUE)
+
+        for i in range(self.width):
+            self.get((1, i)).push(black_pawns[i])
+
+        self.get((0, 0)).push(black_rook)
+        self.get((0, 1)).push(black_knight)
+        self.get((0, 2)).push(black_bishop)
+        self.get((0, 3)).push(black_queen)
+        self.get((0, 4)).push(black_king)
+
+        white_pawns = [Pawn(PieceColor.WHITE, (-1, -1), PAWN_VALUE) for _ in range(5)]
+        white_knight = Knight(PieceColor.WHITE, (-1, -1), KNIGHT_VALUE)
+        white_bishop = Bishop(PieceColor.WHITE, (-1, -1), BISHOP_VALUE)
+        white_rook = Rook(PieceColor.WHITE, (-1, -1), ROOK_VALUE)
+        white_queen = Queen(PieceColor.WHITE, (-1, -1), QUEEN_VALUE)
+        white_king = King(PieceColor.WHITE, (-1, -1), KING_VALUE)
+
+        for i in range(self.width):
+            self.get((3, i)).push(white_pawns[i])
+        
+        self.get((4, 0)).push(white_rook)
+        self.get((4, 1)).push(white_knight)
+        self.get((4, 2)).push(white_bishop)
+        self.get((4, 3)).push(white_queen)
+        self.get((4, 4)).push(white_king)
+
+    @staticmethod
+    def from_vector(vector):
+        '''
+            Decodes a Chess Board from a vector.
+
+            Returns
+            -------
+            AbstractChessBoard that the vector represents.
+        '''
+
+        id_to_piece = {
+            0: (Pawn, PAWN_VALUE),
+            1: (Knight, KNIGHT_VALUE),
+            2: (Bishop, BISHOP_VALUE),
+            3: (Rook, ROOK_VALUE),
+            4: (Queen, QUEEN_VALUE),
+            5: (King, KING_VALUE)
+        }
+
+        g = GardnerChessBoard()
+
+        for row in range(g.height):
+            for col in range(g.width):
+                v_i = vector[row][col]
+
+                assert v_i.shape == (12,)
+                
+                if np.all(v_i == 0):
+                    g.get((row,col)).push(None)
+                else:
+                    argmax = np.argmax(v_i)
+                    color = PieceColor.WHITE if argmax < 6 else PieceColor.BLACK
+                    Piece,value = id_to_piece[argmax % 6]
+
+                    g.get((row,col)).push(Piece(color, (-1, -1), value))
+
+        return g
+
+    def wipe_board(self):
+        '''
+            Removes all pieces from this board.
+        '''
+        for tile in self:
+            tile.pop()
+
+    def is_empty(self):
+        '''
+            Returns
+            -------
+            True if there are no pieces on the board, False otherwise.
+        '''
+        for tile in self:
+            if tile.peek() != None:
+                return False
+        return True
+
+    def push(self, action: AbstractChessAction, check_for_check=True):
+
+        from_pos = action.from_pos
+        to_pos = action.to_pos
+
+        if check_for_check: self._flag_checks(action)
+
+        agent = self.get(from_pos).pop()
+        self.get(to_pos).pop()
+        self.get(to_pos).push(agent)
+
+        # check for promotions
+        if type(agent) == Pawn and agent.position[0] in [0, 4]:
+            if AbstractActionFlags.PROMOTE_BISHOP in action.modifier_flags:
+                self.get(to_pos).pop()
+                self.get(to_pos).push(Bishop(agent.color, to_pos, BISHOP_VALUE))
+            elif AbstractActionFlags.PROMOTE_KNIGHT in action.modifier_flags:
+                self.get(to_pos).pop()
+                self.get(to_pos).push(Knight(agent.color, to_pos, KNIGHT_VALUE))
+            elif AbstractActionFlags.PROMOTE_ROOK in action.modifier_flags:
+                self.get(to_pos).pop()
+                self.get(to_pos).push(Rook(agent.color, to_pos, ROOK_VALUE))
+            else:
+                self.get(to_pos).pop()
+                self.get(to_pos).push(Queen(agent.color, to_pos, QUEEN_VALUE))
+
+        self.move_history.append(action)
+
+        self.active_color = self.active_color.invert()
+
+    def _flag_checks(self, action: AbstractChessAction):
+        '''
+            Adds the CHECK and CHECKMATE flags to `action` if it checks or checkmates the opponent.
+
+            Actions may be shared through the position cache, so each flag is only added once.
+        '''
+        checking_move, opp_cant_move = self._is_checking_action(action, self.active_color)
+
+        if checking_move and AbstractActionFlags.CHECK not in action.modifier_flags:
+            action.modifier_flags.append(AbstractActionFlags.CHECK)
+        if checking_move and opp_cant_move and AbstractActionFlags.CHECKMATE not in action.modifier_flags:
+            action.modifier_flags.append(AbstractActionFlags.CHECKMATE)
+
+    def pop(self) -> AbstractChessAction:
+
+        if len(self.move_history) == 0: return None
+
+        action = self.move_history.pop()
+
+        from_pos = action.from_pos
+        to_pos = action.to_pos
+        agent = action.agent
+        captured_piece = action.captured_piece
+
+        self.get(from_pos).pop()
+        self.get(from_pos).push(agent)
+
+        self.get(to_pos).pop()
+        if captured_piece is not None: self.get(to_pos).push(captured_piece)
+
+        self.active_color = self.active_color.invert()
+
+        return action
+
+    def peek(self):
+        return self.move_history[-1]
+
+    def reward(self) -> float:
+        reward = 0
+
+        for tile in self:
+            reward += tile.reward()
+
+        return reward
+
+    @property
+    def zobrist(self) -> int:
+        '''
+            The 64-bit Zobrist key of this board.
+
+            The piece placement part of the key is updated incrementally by the tiles as `push` and `pop`
+            (including the collateral captures of variants such as Atomic) move pieces, and the side to
+            move is mixed in on access.
+        '''
+        key = self.bitboards.zobrist
+        return key ^ ZOBRIST_BLACK_TO_MOVE if self.active_color == PieceColor.BLACK else key
+
+    def _position_key(self):
+        '''
+            Returns
+            -------
+            A hashable key identifying the placement of pieces on this board.
+        '''
+        return self.bitboards.zobrist
+
+    def _position_cache(self) -> dict:
+        '''
+            Returns the move generation results cached for the current position.
+
+            The cache is keyed by `_position_key`, so it is dropped automatically as soon as the
+            position changes, whether through `push`, `pop` or editing tiles directly.
+
+            Returns
+            -------
+            dict of cached results for the current position.
+        '''
+        key = self._position_key()
+
+        if key != self._cache_key:
+            self._cache_key = key
+            self._cache = {}
+
+        return self._cache
+
+    def legal_actions_for_color(self, color: PieceColor, filter_for_check=True) -> List[AbstractChessAction]:
+        return [move.to_action(self) for move in self._cached_moves(color, filter_for_check)]
+
+    def _cached_moves(self, color: PieceColor, filter_for_check=True) -> tuple:
+        '''
+            Returns
+            -------
+            tuple of the interned GardnerMoves of `legal_actions_for_color(color, filter_for_check)`.
+
+            Only moves are cached, not actions: a position can recur with different piece objects on
+            its tiles, and actions must refer to the pieces that are on the board now.
+        '''
+        cache = self._position_cache()
+
+        entry = ('moves', color, filter_for_check)
+        moves = cache.get(entry)
+
+        if moves is None:
+            moves = cache[entry] = self._generate_moves(color, filter_for_check)
+
+        return moves
+
+    def _generate_moves(self, color: PieceColor, filter_for_check=True) -> tuple:
+        '''
+            Generates the interned GardnerMoves of `_generate_actions(color, filter_for_check)`, bypassing
+            the position cache. Gardner rules go straight from bitboard moves to interned moves.
+
+            Variants that override `_generate_actions` override this too, to go through their actions.
+        '''
+        if filter_for_check:
+            moves = self.bitboards.legal_moves(color.value)
+        else:
+            moves = self.bitboards.pseudo_legal_moves(color.value)
+
+        return tuple(self._intern(color, move) for move in moves)
+
+    def _intern(self, color: PieceColor, move) -> GardnerMove:
+        '''
+            Returns
+            -------
+            The interned GardnerMove of a `(from_sq, to_sq, promotion)` bitboard move of `color`.
+        '''
+        from_sq, to_sq, promotion = move
+        return MOVES[color.value][encode_move(color.value, from_sq, to_sq, NO_PROMOTION if promotion is None or promotion == QUEEN else promotion)]
+
+    def _generate_actions(self, color: PieceColor, filter_for_check=True) -> List[AbstractChessAction]:
+        '''
+            Generates the actions for `color` in the current position, bypassing the position cache.
+
+            Variants with different movement rules override this rather than `legal_actions_for_color`.
+        '''
+        if filter_for_check:
+            moves = self.bitboards.legal_moves(color.value)
+        else:
+            moves = self.bitboards.pseudo_legal_moves(color.value)
+
+        return [self._action_from_move(move) for move in moves]
+
+    def iter_legal_moves(self, color: PieceColor = None, captures_only: bool = False) -> Iterator[GardnerMove]:
+        '''
+            Yields the interned GardnerMoves of the legal actions of `color` (the active color if None),
+            all captures before any quiet move, generating them only as far as they are consumed.
+
+            The position must be the same whenever the generator resumes, e.g. moves may be pushed
+            and popped again between two moves.
+
+            Parameters
+            ----------
+            color :: PieceColor : the color to move
+
+            captures_only :: bool : only yield captures
+        '''
+        if color is None: color = self.active_color
+
+        cache = self._position_cache()
+        entry = ('moves', color, True)
+        moves = cache.get(entry)
+
+        if moves is not None:
+            # already generated, only the order is staged
+            opp = self.bitboards.colors[color.invert().value]
+
+            yield from (move for move in moves if BB_SQUARES[move.to_sq] & opp)
+
+            if not captures_only:
+                yield from (move for move in moves if not BB_SQUARES[move.to_sq] & opp)
+
+            return
+
+        generated = []
+
+        for move in self._iter_generated_moves(color, captures_only):
+            generated.append(move)
+            yield move
+
+        # a full pass generated every move, keep them for `legal_actions_for_color`
+        if not captures_only: cache[entry] = tuple(generated)
+
+    def iter_legal_actions(self, color: PieceColor = None) -> Iterator[GardnerChessAction]:
+        '''
+            Yields the legal actions of `color` (the active color if None), captures first. See `iter_legal_moves`.
+        '''
+        for move in self.iter_legal_moves(color):
+            yield move.to_action(self)
+
+    def iter_captures(self, color: PieceColor = None) -> Iterator[GardnerChessAction]:
+        '''
+            Yields the legal capturing actions of `color` (the active color if None). See `iter_legal_moves`.
+        '''
+        for move in self.iter_legal_moves(color, captures_only=True):
+            yield move.to_action(self)
+
+    def has_legal_action(self, color: PieceColor = None) -> bool:
+        '''
+            Returns
+            -------
+            True if `color` (the active color if None) has a legal action, generating moves only until one is found.
+        '''
+        for _ in self.iter_legal_moves(color):
+            return True
+
+        return False
+
+    def _iter_generated_moves(self, color: PieceColor, captures_only: bool = False) -> Iterator[GardnerMove]:
+        '''
+            Generates the legal moves of `color` lazily, captures first, bypassing the position cache.
+
+            Variants that override `_generate_actions` override this too, see `_iter_filtered_moves`.
+        '''
+        for move in self.bitboards.iter_legal_moves(color.value, captures_only):
+            yield self._intern(color, move)
+
+    def _iter_filtered_moves(self, actions: List[AbstractChessAction], is_legal: Callable, captures_only: bool = False) -> Iterator[GardnerMove]:
+        '''
+            Yields the moves of the candidate `actions` that pass `is_legal`, captures first, calling
+            `is_legal` only for the actions that are consumed. For variants whose legality check is
+            expensive.
+        '''
+        for captures in ((True,) if captures_only else (True, False)):
+            for action in actions:
+                if (action.captured_piece is not None) == captures and is_legal(action):
+                    yield GardnerMove.from_action(action)
+
+    def _piece_at(self, sq: int) -> AbstractChessPiece:
+        '''
+            Returns
+            -------
+            The piece on square `sq`, or None. A faster `get(position).peek()`.
+        '''
+        row, col = SQUARE_POSITIONS[sq]
+        return self._board[row][col].piece
+
+    def _action_from_move(self, move) -> GardnerChessAction:
+        '''
+            Builds the GardnerChessAction corresponding to a `(from_sq, to_sq, promotion)` bitboard move.
+        '''
+        from_sq, to_sq, promotion = move
+
+        from_pos = SQUARE_POSITIONS[from_sq]
+        to_pos = SQUARE_POSITIONS[to_sq]
+
+        agent = self._piece_at(from_sq)
+        captured_piece = self._piece_at(to_sq)
+
+        modifier_flags = [] if promotion is None else [PROMOTION_FLAG_BY_TYPE[promotion]]
+        if captured_piece is not None: modifier_flags.append(AbstractActionFlags.CAPTURE)
+
+        return GardnerChessAction(agent, from_pos, to_pos, captured_piece, modifier_flags)
+
+    def _promotion(self, move) -> int:
+        '''
+            Returns
+            -------
+            The bitboard piece type `move`, a GardnerMove, promotes to on this board, or None.
+        '''
+        if move.underpromotion is not None: return move.underpromotion
+
+        if self.bitboards.pieces[move.color.value][PAWN] & BB_SQUARES[move.from_sq] and BB_SQUARES[move.to_sq] & BB_BACK_RANKS:
+            return QUEEN
+
+        return None
+
+    def legal_moves(self) -> List[GardnerMove]:
+        '''
+            Returns
+            -------
+            List of the interned GardnerMoves of all legal actions for the active color.
+        '''
+        return list(self._cached_moves(self.active_color))
+
+    def push_move(self, move: GardnerMove, check_for_check=True):
+        '''
+            Plays `move`, a GardnerMove, on this board. See `push`.
+        '''
+        self.push(move.to_action(self), check_for_check)
+
+    def _visitor_actions_for_color(self, color: PieceColor, filter_for_check=True) -> List[AbstractChessAction]:
+        '''
+            The original move generator, which walks every tile with a `GardnerChessActionVisitor` and
+            filters for check by simulating every candidate with `_leads_to_check`.
+
+            This is kept as the reference implementation that the bitboard move generator is checked
+            against.
+        '''
+        referee = GardnerChessActionVisitor()
+        
+        possible_actions = []
+
+        for tile in self:
+            piece = tile.peek()
+
+            if piece is not None and piece.color == color:
+                possible_actions.extend(referee.visit(piece, self))
+
+        # filter for checks
+
+        if filter_for_check:
+            possible_actions = [action for action in possible_actions if not self._leads_to_check(action, color)]
+
+        return possible_actions
+
+    def _leads_to_check(self, action, color):
+        '''
+            Returns
+            -------
+            True if this action puts the player that made it in check, false otherwise.
+        '''
+        
+        # simulate this move
+        self.push(action, check_for_check=False)
+
+        anti_color = color.invert()
+
+        kings = self.bitboards.pieces[color.value][KING]
+
+        # only captures can take a king, and the first one that does settles it
+        can_capture_king = any(BB_SQUARES[to_sq] & kings for _, to_sq, _ in self.bitboards.iter_pseudo_legal_moves(anti_color.value, captures_only=True))
+
+        self.pop() # undo our move
+
+        return can_capture_king
+
+    def _is_checking_action(self, action, color):
+        '''
+            Returns
+            -------
+            tuple of (bool, bool) where
+            - the first item is True if this action puts the opponent in check, False otherwise.
+            - the second item is True if this action puts the opponent in checkmate, False otherwise.
+        '''
+        # simulate this move
+        self.push(action, check_for_check=False)
+
+        can_capture_king = self.bitboards.king_attacked(color.invert().value)
+
+        opponent_cannot_move_next = not self.has_legal_action(color.invert())
+
+        self.pop() # undo our move
+
+        return can_capture_king, opponent_cannot_move_next
+
+    def _in_check(self, color: PieceColor) -> bool:
+        '''
+            Returns
+            -------
+            True if the opponent of `color` could capture one of `color`'s kings, False otherwise.
+        '''
+        return self.bitboards.king_attacked(color.value)
+
+    def legal_action_indices(self) -> np.array:
+        '''
+            Returns
+            -------
+            numpy array of the action space indices of all legal actions for the active color.
+        '''
+        cache = self._position_cache()
+
+        entry = ('indices', self.active_color)
+        indices = cache.get(entry)
+
+        if indices is None:
+            indices = cache[entry] = np.fromiter((move.index for move in self._cached_moves(self.active_color)), dtype=np.intp)
+            indices.flags.writeable = False
+
+        return indices
+
+    def legal_action_mask(self, out: np.array = None) -> np.array:
+        if out is None:
+            mask = np.zeros(LEN_ACTION_SPACE)
+        else:
+            mask = out
+            mask[:] = 0
+
+        mask[self.legal_action_indices()] = 1
+
+        return mask
+
+    def state_vector(self, out: np.array = None, dtype=np.float64) -> np.array:
+        '''
+            Parameters
+            ----------
+            out :: np.array : optional shape (5, 5, 12) buffer to write the planes into
+
+            dtype :: np.dtype : dtype of the returned array when `out` is None
+
+            Returns
+            -------
+            shape (5, 5, 12) numpy array, where `[row, col, :]` is the `vector()` of the piece on
+            (row, col), or all zeros if the tile is empty.
+        '''
+        return self._encode(out, dtype, canonical=False)
+
+    def canonical_state_vector(self, out: np.array = None, dtype=np.float64) -> np.array:
+        '''
+            Parameters
+            ----------
+            out :: np.array : optional shape (5, 5, 12) buffer to write the planes into
+
+            dtype :: np.dtype : dtype of the returned array when `out` is None
+
+            Returns
+            -------
+            `state_vector()` from the perspective of the active color as if it were white, i.e. for black
+            the board is rotated by 180 degrees and the two colors' planes are swapped.
+        '''
+        return self._encode(out, dtype, canonical=True)
+
+    def _encode(self, out: np.array, dtype, canonical: bool) -> np.array:
+        if out is None:
+            return state_vectors([self], dtype=dtype, canonical=canonical)[0]
+
+        state_vectors([self], out=out[np.newaxis], canonical=canonical)
+
+        return out
+
+    def _visible_squares(self) -> int:
+        '''
+            Returns
+            -------
+            bitboard of the squares whose contents appear in `state_vector()`.
+        '''
+        return BB_ALL
+
+    @property
+    def status(self) -> AbstractBoardStatus:
+        cache = self._position_cache()
+
+        entry = ('status', self.active_color)
+        status = cache.get(entry)
+
+        if status is None:
+            status = cache[entry] = self._status()
+
+        return status
+
+    def _status(self) -> AbstractBoardStatus:
+        '''
+            Computes the status of this board in a single pass over the (cached) legal actions of both colors.
+        '''
+
+        # if active color in check...
+
+        opp_can_move = self.has_legal_action(self.active_color.invert())
+        opp_checking = self._in_check(self.active_color)
+
+        ac_can_move = self.has_legal_action(self.active_color)
+        ac_checking = self._in_check(self.active_color.invert())
+
+        if opp_checking and not ac_can_move:
+            return AbstractBoardStatus.BLACK_WIN if self.active_color == PieceColor.WHITE else AbstractBoardStatus.WHITE_WIN
+        elif ac_checking and not opp_can_move:
+            return AbstractBoardStatus.WHITE_WIN if self.active_color == PieceColor.WHITE else AbstractBoardStatus.BLACK_WIN
+        elif (not ((opp_checking or ac_can_move) and (ac_checking or opp_can_move))) or self.has_only_kings:
+            return AbstractBoardStatus.DRAW
+        else:
+            return AbstractBoardStatus.ONGOING
+
+        # OLD IMPLEMENTATION
+        # if len(self.move_history) == 0: return AbstractBoardStatus.ONGOING
+
+        # if AbstractActionFlags.CHECKMATE in self.peek().modifier_flags:
+        #     return AbstractBoardStatus.WHITE_WIN if self.active_color == PieceColor.BLACK else AbstractBoardStatus.BLACK_WIN
+        # elif len(self.legal_actions()) == 0 or self.has_only_kings:
+        #     return AbstractBoardStatus.DRAW
+        # else:
+        #     return AbstractBoardStatus.ONGOING
+
+    def status_for_color(self, color: PieceColor):
+        ac = self.active_color
+        self.active_color = color
+        status = self.status
+        self.active_color = ac
+        return status
+
+    @property
+    def has_only_kings(self) -> bool:
+        '''
+            Returns
+            -------
+            True if there are only kings left, false otherwise.
+        '''
+        
+        return self.bitboards.has_only_kings()
+
+    def to_bytes(self) -> bytes:
+        '''
+            Returns
+            -------
+            26 bytes encoding this position: the `piece_code` of each of the 25 squares, then the
+            value of the active color. Piece values and move history are not included.
+        '''
+        return bytes(self.bitboards.codes()) + bytes((self.active_color.value,))
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        '''
+            Decodes a board of this type from `to_bytes()`, with standard piece values and an empty move history.
+        '''
+        board = cls()
+        board.wipe_board()
+
+        for sq in range(NUM_SQUARES):
+            code = data[sq]
+
+            if code != EMPTY:
+                piece_type = CODE_TYPES[code]
+                piece = PIECE_TYPES[piece_type](PieceColor(CODE_COLORS[code]), (-1, -1), PIECE_VALUES[piece_type])
+                board.get(SQUARE_POSITIONS[sq]).push(piece)
+
+        board.active_color = PieceColor(data[NUM_SQUARES])
+
+        return board
+
+    def fliplr(self):
+        '''
+            Returns
+            -------
+            A new board with this position mirrored about the y-axis, with the same active color and an
+            empty move history. The legal actions of the mirrored board are the `fliplr` of this board's.
+        '''
+        data = self.to_bytes()
+        mirrored = b''.join(data[row * 5:(row + 1) * 5][::-1] for row in range(5))
+
+        return type(self).from_bytes(mirrored + data[NUM_SQUARES:])
+
+    def copy(self):
+        '''
+            Returns
+            -------
+            A deep copy of this board, including its move history, that shares no mutable state with it.
+        '''
+        new_board = object.__new__(type(self))
+        new_board.__dict__.update(self.__dict__)
+
+        new_board._cache_key = None
+        new_board._cache = {}
+
+        copy_piece = new_board._copy_position(self)
+        self._copy_history(new_board, copy_piece)
+
+        return new_board
+
+    def _copy_position(self, board) -> Callable:
+        '''
+            Replaces the pieces of this board, a new copy of `board`, with copies of the pieces of `board`.
+
+            Returns
+            -------
+            function mapping a piece of `board`, on or off the board, to its copy.
+        '''
+        copies = {}
+
+        def copy_piece(piece):
+            piece_copy = copies.get(id(piece))
+
+            if piece_copy is None:
+                piece_copy = copies[id(piece)] = piece.copy()
+
+            return piece_copy
+
+        self.bitboards = GardnerBitboards()
+        self._board = self._init_board(board.height, board.width)
+
+        for tile in board:
+            if tile.piece is not None:
+                self.get(tile.position).push(copy_piece(tile.piece))
+
+        return copy_piece
+
+    def _copy_history(self, board, copy_piece: Callable = None):
+        '''
+            Gives `board`, a copy of this board, its own copy of this board's move history.
+
+            Parameters
+            ----------
+            copy_piece :: Callable : maps the pieces of this board to the pieces of `board`, or None if the
+            boards can share pieces, and therefore actions
+        '''
+        if copy_piece is None:
+            board.move_history = self.move_history.copy()
+        else:
+            board.move_history = [action.copy(copy_piece) for action in self.move_history]
+
+def legal_action_masks(boards: List[GardnerChessBoard], out: np.array = None) -> np.array:
+    '''
+        Builds the legal action masks of many boards at once.
+
+        Parameters
+        ----------
+        boards :: List[GardnerChessBoard] : the boards to build masks for
+
+        out :: np.array : optional shape (len(boards), NUM_ACTIONS) buffer to write the masks into
+
+        Returns
+        -------
+        shape (len(boards), NUM_ACTIONS) numpy array where row `i` is `boards[i].legal_action_mask()`.
+    '''
+    if out is None:
+        masks = np.zeros((len(boards), LEN_ACTION_SPACE))
+    else:
+        masks = out
+        masks[:] = 0
+
+    indices = [board.legal_action_indices() for board in boards]
+    rows = np.repeat(np.arange(len(boards)), [len(idx) for idx in indices])
+
+    if len(rows) > 0:
+        masks[rows, np.concatenate(indices)] = 1
+
+    return masks
+
+def state_vectors(boards: List[GardnerChessBoard], out: np.array = None, dtype=np.float64, canonical: bool = False) -> np.array:
+    '''
+        Encodes the piece planes of many boards at once, straight from their bitboards.
+
+        Parameters
+        ----------
+        boards :: List[GardnerChessBoard] : the boards to encode
+
+        out :: np.array : optional shape (len(boards), 5, 5, 12) buffer, e.g. uint8 or float32, to write the planes into
+
+        dtype :: np.dtype : dtype of the returned array when `out` is None
+
+        canonical :: bool : if True, encode `canonical_state_vector()` instead of `state_vector()`
+
+        Returns
+        -------
+        shape (len(boards), 5, 5, 12) numpy array where entry `i` is `boards[i].state_vector()`
+        (or `boards[i].canonical_state_vector()`).
+    '''
+    if out is None:
+        out = np.empty((len(boards), 5, 5, 2 * len(PIECE_TYPES)), dtype=dtype)
+
+    # one 32-bit word per plane: white's six piece types, then black's
+    words = np.empty((len(boards), 2, len(PIECE_TYPES)), dtype='<u4')
+    flip = np.zeros(len(boards), dtype=bool)
+
+    for i, board in enumerate(boards):
+        pieces = board.bitboards.pieces
+        visible = board._visible_squares()
+
+        flip[i] = canonical and board.active_color == PieceColor.BLACK
+        first, second = (pieces[1], pieces[0]) if flip[i] else (pieces[0], pieces[1])
+
+        words[i, 0] = [bb & visible for bb in first]
+        words[i, 1] = [bb & visible for bb in second]
+
+    # (N, 12, 25) bits, indexed by square
+    bits = np.unpackbits(words.view(np.uint8).reshape(len(boards), -1, 4), axis=2, bitorder='little')[:, :, :NUM_SQUARES]
+
+    if flip.any():
+        # rotating the board by 180 degrees maps square s to square 24 - s
+        bits[flip] = bits[flip, :, ::-1]
+
+    out[...] = bits.reshape(len(boards), -1, 5, 5).transpose(0, 2, 3, 1)
+
+    return out
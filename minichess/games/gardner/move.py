@@ -0,0 +1,111 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action_tables import DECODE, NO_PROMOTION
+from minichess.games.gardner.bitboard import SQUARE_POSITIONS
+
+from typing import Optional
+
+INDEX_BITS = 11
+
+class GardnerMove:
+    '''
+        A compact, immutable move: the geometry of one entry of the 1225-wide action space for one color.
+
+        Every possible move is interned in `MOVES`, so moves are compared by identity and storing one
+        costs a reference. A move packs into a 12-bit int, `int(move)`, for arrays and records.
+
+        Only the position-independent part of an action is stored. Whether it captures, checks or
+        promotes to a queen depends on the board it is played on, and is recovered by `to_action`.
+
+        Attributes
+        ----------
+        color :: PieceColor : the color making this move
+
+        index :: int : the index of this move in the action space, see `GardnerChessAction.index`
+
+        from_sq :: int : the square the piece moves from
+
+        to_sq :: int : the square the piece moves to
+
+        underpromotion :: int : the bitboard piece type of an underpromotion, or None
+    '''
+    __slots__ = ('color', 'index', 'from_sq', 'to_sq', 'underpromotion', '_key')
+
+    def __init__(self, color: PieceColor, index: int, from_sq: int, to_sq: int, underpromotion: Optional[int]) -> None:
+        object.__setattr__(self, 'color', color)
+        object.__setattr__(self, 'index', index)
+        object.__setattr__(self, 'from_sq', from_sq)
+        object.__setattr__(self, 'to_sq', to_sq)
+        object.__setattr__(self, 'underpromotion', underpromotion)
+        object.__setattr__(self, '_key', (color.value << INDEX_BITS) | index)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('GardnerMove is immutable')
+
+    @property
+    def from_pos(self) -> tuple:
+        return SQUARE_POSITIONS[self.from_sq]
+
+    @property
+    def to_pos(self) -> tuple:
+        return SQUARE_POSITIONS[self.to_sq]
+
+    def __int__(self) -> int:
+        return self._key
+
+    def __hash__(self) -> int:
+        return self._key
+
+    def __reduce__(self):
+        # unpickle to the interned instance
+        return (unpack, (self._key,))
+
+    def __repr__(self) -> str:
+        promotion = '' if self.underpromotion is None else ', underpromotion={}'.format(self.underpromotion)
+        return 'GardnerMove({}, {} -> {}{})'.format(self.color, self.from_pos, self.to_pos, promotion)
+
+    @staticmethod
+    def from_action(action) -> 'GardnerMove':
+        '''
+            Returns
+            -------
+            The interned GardnerMove of `action`.
+        '''
+        return MOVES[action.agent.color.value][action.index()]
+
+    def to_action(self, board):
+        '''
+            Rebuilds the full action this move represents on `board`, the position it is played from.
+
+            Returns
+            -------
+            GardnerChessAction with the agent, captured piece and modifier flags read from `board`.
+        '''
+        return board._action_from_move((self.from_sq, self.to_sq, board._promotion(self)))
+
+def unpack(key: int) -> GardnerMove:
+    '''
+        Returns
+        -------
+        The interned GardnerMove whose `int()` is `key`.
+    '''
+    move = MOVES[key >> INDEX_BITS][key & ((1 << INDEX_BITS) - 1)]
+
+    if move is None: raise ValueError('{} is not a valid packed move'.format(key))
+
+    return move
+
+def _build_moves(color: PieceColor) -> tuple:
+    moves = []
+
+    for index, (from_sq, to_sq, promotion) in enumerate(DECODE[color.value].tolist()):
+        if from_sq < 0:
+            # this index never names a move for this color
+            moves.append(None)
+            continue
+
+        moves.append(GardnerMove(color, index, from_sq, to_sq, None if promotion == NO_PROMOTION else promotion))
+
+    return tuple(moves)
+
+# MOVES[color.value][index] is the interned move, or None where the index leaves the board
+MOVES = (_build_moves(PieceColor.WHITE), _build_moves(PieceColor.BLACK))
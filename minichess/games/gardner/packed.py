@@ -0,0 +1,186 @@
+from minichess.games.abstract.board import AbstractChessTile
+from minichess.games.abstract.piece import AbstractChessPiece, PieceColor
+from minichess.games.gardner.bitboard import NUM_SQUARES, PIECE_INDEX, PIECE_TYPES, SQUARE_POSITIONS, CODE_COLORS, CODE_TYPES, EMPTY, piece_code
+from minichess.games.gardner.board import GardnerChessBoard, PIECE_VALUES
+
+from typing import Iterable, Union
+
+class PackedChessTile(AbstractChessTile):
+    '''
+        A view of one square of a `PackedChessBoard`.
+
+        Views are created on demand by `get` and iteration, and hold no state of their own: reading
+        or changing the piece reads or changes the board's piece codes.
+    '''
+    __slots__ = ('board', 'square')
+
+    def __init__(self, board: 'PackedChessBoard', square: int) -> None:
+        self.board = board
+        self.square = square
+
+    @property
+    def color(self) -> PieceColor:
+        # tiles alternate colors starting with black in the top left corner
+        return PieceColor.BLACK if self.square % 2 == 0 else PieceColor.WHITE
+
+    @property
+    def position(self) -> tuple:
+        return SQUARE_POSITIONS[self.square]
+
+    @property
+    def piece(self) -> AbstractChessPiece:
+        return self.board._piece_at(self.square)
+
+    def occupied(self) -> bool:
+        return self.board._squares[self.square] != EMPTY
+
+    def capturable(self, color: PieceColor) -> bool:
+        code = self.board._squares[self.square]
+        return code != EMPTY and CODE_COLORS[code] != color.value
+
+    def push(self, piece: AbstractChessPiece):
+        self.board._own()
+        self.pop()
+
+        if piece is not None:
+            color, piece_type = piece.color.value, PIECE_INDEX[type(piece)]
+
+            self.board._squares[self.square] = piece_code(color, piece_type)
+            self.board.bitboards.set_piece(self.square, color, piece_type)
+
+            piece.set_position(self.position)
+
+    def pop(self):
+        piece = self.board._piece_at(self.square)
+
+        if piece is not None:
+            self.board._own()
+
+            code = self.board._squares[self.square]
+
+            self.board._squares[self.square] = EMPTY
+            self.board.bitboards.remove_piece(self.square, CODE_COLORS[code], CODE_TYPES[code])
+
+        return piece
+
+    def peek(self):
+        return self.board._piece_at(self.square)
+
+    def copy(self):
+        return AbstractChessTile(self.color, self.position, self.peek())
+
+class PackedChessBoard:
+    '''
+        Array-backed storage for `GardnerChessBoard` and its variants, mixed in ahead of the board
+        class, e.g. `class PackedAtomicChessBoard(PackedChessBoard, AtomicChessBoard)`.
+
+        The position is a 25-byte `bytearray` of piece codes (see `bitboard.piece_code`) next to the
+        bitboards and the active color, instead of 25 tiles each holding a piece object. Tiles and
+        pieces returned by `get`, iteration and actions are views created on demand, so the tile/piece
+        API keeps working, and `copy()` only copies the codes, the bitboards and the history stacks.
+        `snapshot()` defers even that until one of the boards changes.
+
+        Pieces are stored by color and type only, so pieces read back from the board always carry the
+        standard piece values of `GardnerChessBoard`.
+    '''
+
+    # True while this board shares its storage with a `snapshot`
+    _shared = False
+
+    def _init_board(self, height, width):
+        self.height = height
+        self.width = width
+
+        self._squares = bytearray(height * width)
+
+        # no tiles are kept, see `_board`
+        return None
+
+    @property
+    def _board(self):
+        '''
+            Rows of tile views, for code written against the list-of-tiles layout.
+        '''
+        return [[PackedChessTile(self, row * self.width + col) for col in range(self.width)] for row in range(self.height)]
+
+    @_board.setter
+    def _board(self, value):
+        # AbstractChessBoard.__init__ assigns the result of `_init_board`
+        assert value is None, 'A PackedChessBoard cannot hold tiles.'
+
+    def get(self, index: Union[str, Iterable[int]]):
+        if type(index) == tuple:
+            row, col = index
+            return PackedChessTile(self, row * self.width + col)
+
+        return super().get(index)
+
+    def __iter__(self):
+        for sq in range(NUM_SQUARES):
+            yield PackedChessTile(self, sq)
+
+    def _piece_at(self, sq: int) -> AbstractChessPiece:
+        code = self._squares[sq]
+
+        if code == EMPTY: return None
+
+        piece_type = CODE_TYPES[code]
+
+        return PIECE_TYPES[piece_type](PieceColor(CODE_COLORS[code]), SQUARE_POSITIONS[sq], PIECE_VALUES[piece_type])
+
+    def reward(self) -> float:
+        white, black = self.bitboards.pieces
+
+        return sum(
+            (bin(white[piece_type]).count('1') - bin(black[piece_type]).count('1')) * value
+            for piece_type, value in enumerate(PIECE_VALUES)
+        )
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._squares) + bytes((self.active_color.value,))
+
+    def _copy_position(self, board):
+        self._squares = bytearray(board._squares)
+        self.bitboards = board.bitboards.copy()
+        self._shared = False
+
+        # pieces are views, so pieces and actions can be shared
+        return None
+
+    def snapshot(self):
+        '''
+            Returns
+            -------
+            A copy-on-write copy of this board: the copy and this board share their squares, bitboards
+            and history until either of them changes, which then takes its own copy first.
+        '''
+        new_board = object.__new__(type(self))
+        new_board.__dict__.update(self.__dict__)
+
+        new_board._cache_key = None
+        new_board._cache = {}
+
+        self._shared = new_board._shared = True
+
+        return new_board
+
+    def _own(self):
+        '''
+            Gives this board its own squares, bitboards and history if it still shares them with a snapshot.
+        '''
+        if self._shared:
+            self._squares = bytearray(self._squares)
+            self.bitboards = self.bitboards.copy()
+            self._copy_history(self)
+            self._shared = False
+
+    def push(self, action, check_for_check=True):
+        self._own()
+        super().push(action, check_for_check)
+
+    def pop(self):
+        self._own()
+        return super().pop()
+
+class PackedGardnerChessBoard(PackedChessBoard, GardnerChessBoard):
+    pass
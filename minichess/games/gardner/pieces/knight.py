@@ -3,6 +3,8 @@ import numpy as np
 from minichess.games.abstract.piece import AbstractChessPiece, PieceColor
 
 class Knight(AbstractChessPiece):
+    __slots__ = ()
+
     def __init__(self, color: PieceColor, position: tuple, value: int) -> None:
         super().__init__(color, position, value)
 
@@ -3,6 +3,8 @@ from minichess.games.abstract.piece import AbstractChessPiece, PieceColor
 from minichess.resources import BLACK_PAWN, WHITE_PAWN
 
 class Pawn(AbstractChessPiece):
+    __slots__ = ()
+
     def __init__(self, color: PieceColor, position: tuple, value: int) -> None:
         super().__init__(color, position, value)
 
@@ -3,6 +3,8 @@ from minichess.games.abstract.piece import AbstractChessPiece, PieceColor
 from minichess.resources import WHITE_QUEEN, BLACK_QUEEN
 
 class Queen(AbstractChessPiece):
+    __slots__ = ()
+
     def __init__(self, color: PieceColor, position: tuple, value: int) -> None:
         super().__init__(color, position, value)
 
@@ -17,7 +17,7 @@ class RifleChessActionVisitor(GardnerChessActionVisitor):
         pieces post-capture)
     '''
 
-    def _pawn_move_helper(self, piece: Pawn, board, new_position: tuple, is_capture) -> List[AbstractChessAction]:
+    def _pawn_move_helper(self, piece: Pawn, board, new_position: tuple, is_capture = False) -> List[AbstractChessAction]:
         '''
             Helper function for pawn moves.
         '''
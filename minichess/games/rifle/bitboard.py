@@ -0,0 +1,73 @@
+'''
+    Rifle move legality straight from bitboards.
+
+    Rifle pieces capture along the same lines as Gardner pieces, so the attack tables of
+    `minichess.games.gardner.bitboard` also tell which squares a Rifle piece threatens. What differs is
+    the position after a capture: the captured piece leaves the board but the capturing piece stays
+    where it is. A quiet move is therefore decided exactly as in Gardner, while a capture can only
+    expose a king by opening the line through the captured square, or fail to stop a check by leaving
+    the other checkers in place. Neither needs the move to be simulated.
+
+    Moves are the `(from_sq, to_sq, promotion)` tuples of `GardnerBitboards`.
+'''
+from minichess.games.gardner.bitboard import GardnerBitboards, CheckInfo, BB_SQUARES, KING, squares
+
+from typing import Iterator, List, Tuple
+
+def capture_exposes_king(bitboards: GardnerBitboards, color: int, to_sq: int) -> bool:
+    '''
+        Returns
+        -------
+        True if a capture by `color` on `to_sq` would leave one of `color`'s kings attacked, given that the
+        capturing piece stays in place.
+    '''
+    to_bb = BB_SQUARES[to_sq]
+    occupied = bitboards.occupied ^ to_bb
+
+    for king_sq in squares(bitboards.pieces[color][KING]):
+        if bitboards.attackers(king_sq, color ^ 1, occupied, to_bb):
+            return True
+
+    return False
+
+def is_legal(bitboards: GardnerBitboards, color: int, move: Tuple[int, int, int], info: CheckInfo) -> bool:
+    '''
+        Parameters
+        ----------
+        color :: int : the color making `move`
+
+        move :: Tuple[int, int, int] : a pseudo-legal move for `color`
+
+        info :: CheckInfo : the result of `bitboards.check_info(color)` for the current position
+
+        Returns
+        -------
+        True if `move` does not leave one of `color`'s kings capturable under Rifle rules, False otherwise.
+    '''
+    if bitboards.colors[color ^ 1] & BB_SQUARES[move[1]]:
+        # a capture takes no piece of `color` off its square, so pins and king moves do not apply
+        return not capture_exposes_king(bitboards, color, move[1])
+
+    return bitboards.is_legal(color, move, info)
+
+def iter_legal_moves(bitboards: GardnerBitboards, color: int, captures_only: bool = False) -> Iterator[Tuple[int, int, int]]:
+    '''
+        Yields the moves of `legal_moves` lazily, all captures before any quiet move.
+
+        The position must be the same whenever the generator resumes.
+    '''
+    info = bitboards.check_info(color)
+
+    for move in bitboards.iter_pseudo_legal_moves(color, captures_only):
+        if is_legal(bitboards, color, move, info):
+            yield move
+
+def legal_moves(bitboards: GardnerBitboards, color: int) -> List[Tuple[int, int, int]]:
+    '''
+        Returns
+        -------
+        List of all moves for `color` that do not leave one of its kings capturable under Rifle rules.
+    '''
+    info = bitboards.check_info(color)
+
+    return [move for move in bitboards.pseudo_legal_moves(color) if is_legal(bitboards, color, move, info)]
@@ -1,23 +1,42 @@
 from minichess.games.abstract.action import AbstractActionFlags, AbstractChessAction
+from minichess.games.gardner.packed import PackedChessBoard
+from minichess.games.gardner.move import GardnerMove
+from minichess.games.rifle import bitboard as rifle_bitboard
 from minichess.games.gardner.board import GardnerChessBoard, PAWN_VALUE, KNIGHT_VALUE, BISHOP_VALUE, ROOK_VALUE, QUEEN_VALUE, KING_VALUE, LEN_ACTION_SPACE
+from minichess.games.abstract.piece import PieceColor
 from minichess.games.rifle.pieces import *
 
+from typing import Iterator, List
+
 
 class RifleChessBoard(GardnerChessBoard):
     '''
         A MiniChess variant where captures are made from range. That is, pieces do not move to the spaces of pieces they capture, and a single capture necessitates a full turn.
     '''
 
+    def _generate_actions(self, color: PieceColor, filter_for_check=True) -> List[AbstractChessAction]:
+        if not filter_for_check:
+            return super()._generate_actions(color, filter_for_check=False)
+
+        # captures leave the capturing piece in place, so the Gardner check filter does not apply
+        return [self._action_from_move(move) for move in rifle_bitboard.legal_moves(self.bitboards, color.value)]
+
+    def _generate_moves(self, color: PieceColor, filter_for_check=True) -> tuple:
+        if not filter_for_check:
+            return super()._generate_moves(color, filter_for_check=False)
+
+        return tuple(self._intern(color, move) for move in rifle_bitboard.legal_moves(self.bitboards, color.value))
+
+    def _iter_generated_moves(self, color: PieceColor, captures_only=False) -> Iterator[GardnerMove]:
+        for move in rifle_bitboard.iter_legal_moves(self.bitboards, color.value, captures_only):
+            yield self._intern(color, move)
+
     def push(self, action: AbstractChessAction, check_for_check=True):
 
         from_pos = action.from_pos
         to_pos = action.to_pos
 
-        if check_for_check:
-            checking_move, opp_cant_move = self._is_checking_action(action, self.active_color)
-
-            if checking_move: action.modifier_flags.append(AbstractActionFlags.CHECK)
-            if checking_move and opp_cant_move: action.modifier_flags.append(AbstractActionFlags.CHECKMATE)
+        if check_for_check: self._flag_checks(action)
 
         is_capture = AbstractActionFlags.CAPTURE in action.modifier_flags
 
@@ -49,4 +68,8 @@ class RifleChessBoard(GardnerChessBoard):
 
         self.move_history.append(action)
 
-        self.active_color = self.active_color.invert()
\ No newline at end of file
+        self.active_color = self.active_color.invert()
+
+
+class PackedRifleChessBoard(PackedChessBoard, RifleChessBoard):
+    pass
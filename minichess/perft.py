@@ -0,0 +1,187 @@
+'''
+    Perft: counts the leaf nodes of the legal move tree to a fixed depth, to check move generation
+    against known counts and to measure its speed.
+
+    Usage: python -m minichess.perft [--variant gardner] [--position start | --fen FEN] [--depth 3] [--divide]
+'''
+from minichess.games.abstract.board import LETTER_TO_COLUMN
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.bitboard import NUM_SQUARES, SIDE_LENGTH, SQUARE_POSITIONS, CODE_COLORS, CODE_TYPES, EMPTY, piece_code
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.rifle.board import RifleChessBoard
+from minichess.games.atomic.board import AtomicChessBoard
+
+from typing import Dict, NamedTuple
+
+import argparse
+import time
+
+VARIANTS = {
+    'gardner': GardnerChessBoard,
+    'rifle': RifleChessBoard,
+    'atomic': AtomicChessBoard
+}
+
+# FEN-style positions: rows from row 0 (black's back rank) down, white pieces in upper case, digits
+# for runs of empty squares, then the side to move
+POSITIONS = {
+    'start': 'rnbqk/ppppp/5/PPPPP/RNBQK w',
+    'open': 'rn1qk/p1bp1/1p2p/P1PP1/RNBQK b',
+    'promotion': 'k4/1P3/5/3p1/4K w',
+    'pin': 'k1q2/5/5/2R2/2K2 w',
+    'check': 'k4/5/2q2/5/2K1R w',
+    'crowded': 'r1b1k/pp1pp/n1q2/PPP1P/RNBQK w'
+}
+
+_PIECE_LETTERS = 'pnbrqk'
+
+_COLUMN_LETTERS = {column: letter for letter, column in LETTER_TO_COLUMN.items()}
+
+def board_from_fen(fen: str, board_type: type = GardnerChessBoard):
+    '''
+        Returns
+        -------
+        A `board_type` board with the position described by `fen`, see `POSITIONS`.
+    '''
+    placement, side = fen.split()
+
+    codes = bytearray()
+
+    for row in placement.split('/'):
+        for char in row:
+            if char.isdigit():
+                codes.extend([EMPTY] * int(char))
+            else:
+                color = PieceColor.WHITE if char.isupper() else PieceColor.BLACK
+                codes.append(piece_code(color.value, _PIECE_LETTERS.index(char.lower())))
+
+    assert len(codes) == NUM_SQUARES, 'Expected {} squares in {}'.format(NUM_SQUARES, fen)
+
+    codes.append((PieceColor.WHITE if side == 'w' else PieceColor.BLACK).value)
+
+    return board_type.from_bytes(bytes(codes))
+
+def fen(board) -> str:
+    '''
+        Returns
+        -------
+        The FEN-style description of `board`'s position, see `POSITIONS`.
+    '''
+    data = board.to_bytes()
+    rows = []
+
+    for row in range(SIDE_LENGTH):
+        text, empty = '', 0
+
+        for code in data[row * SIDE_LENGTH:(row + 1) * SIDE_LENGTH]:
+            if code == EMPTY:
+                empty += 1
+                continue
+
+            if empty > 0: text += str(empty)
+            empty = 0
+
+            letter = _PIECE_LETTERS[CODE_TYPES[code]]
+            text += letter.upper() if CODE_COLORS[code] == PieceColor.WHITE.value else letter
+
+        rows.append(text + (str(empty) if empty > 0 else ''))
+
+    return '/'.join(rows) + (' w' if data[NUM_SQUARES] == PieceColor.WHITE.value else ' b')
+
+def square_name(sq: int) -> str:
+    '''
+        Returns
+        -------
+        The chess convention name of square `sq`, as accepted by `AbstractChessBoard.get`.
+    '''
+    row, col = SQUARE_POSITIONS[sq]
+    return _COLUMN_LETTERS[col] + str(row + 1)
+
+def move_name(move) -> str:
+    '''
+        Returns
+        -------
+        `move`, a GardnerMove, as its from and to squares plus any underpromotion, e.g. `c4c5` or `b2b1n`.
+    '''
+    name = square_name(move.from_sq) + square_name(move.to_sq)
+
+    if move.underpromotion is not None:
+        name += _PIECE_LETTERS[move.underpromotion]
+
+    return name
+
+def perft(board, depth: int) -> int:
+    '''
+        Returns
+        -------
+        The number of leaf nodes of the legal move tree of `board` `depth` plies deep.
+    '''
+    if depth == 0: return 1
+
+    moves = board.legal_moves()
+
+    # bulk counting: the last ply needs no moves to be played
+    if depth == 1: return len(moves)
+
+    nodes = 0
+
+    for move in moves:
+        board.push_move(move, check_for_check=False)
+        nodes += perft(board, depth - 1)
+        board.pop()
+
+    return nodes
+
+def divide(board, depth: int) -> Dict[str, int]:
+    '''
+        Returns
+        -------
+        dict of `move_name` to the perft count below that root move, `depth - 1` plies deep.
+    '''
+    counts = {}
+
+    for move in board.legal_moves():
+        board.push_move(move, check_for_check=False)
+        counts[move_name(move)] = perft(board, depth - 1)
+        board.pop()
+
+    return counts
+
+class PerftResult(NamedTuple):
+    nodes: int
+    seconds: float
+    nps: float
+
+def timed_perft(board, depth: int) -> PerftResult:
+    '''
+        Returns
+        -------
+        PerftResult with the perft count of `board` and how long it took.
+    '''
+    start = time.perf_counter()
+    nodes = perft(board, depth)
+    seconds = time.perf_counter() - start
+
+    return PerftResult(nodes, seconds, nodes / seconds if seconds > 0 else 0.0)
+
+def main():
+    parser = argparse.ArgumentParser(description='Count the leaf nodes of the legal move tree.')
+    parser.add_argument('--variant', choices=sorted(VARIANTS), default='gardner')
+    parser.add_argument('--position', choices=sorted(POSITIONS), default='start')
+    parser.add_argument('--fen', help='a FEN-style position, overrides --position')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--divide', action='store_true', help='print the count below every root move')
+    args = parser.parse_args()
+
+    board = board_from_fen(args.fen or POSITIONS[args.position], VARIANTS[args.variant])
+
+    if args.divide:
+        for name, nodes in sorted(divide(board, args.depth).items()):
+            print('{}: {}'.format(name, nodes))
+
+    result = timed_perft(board, args.depth)
+
+    print('nodes {}  time {:.2f}s  nps {:.0f}'.format(result.nodes, result.seconds, result.nps))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+from minichess.games.abstract.board import AbstractBoardStatus
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action import GardnerChessAction, LEN_ACTION_SPACE
+from minichess.games.gardner.action_tables import decode_index
+from minichess.games.gardner.bitboard import SQUARE_POSITIONS, KING
+from minichess.players.abstract import Player
+from minichess.search.tt import Bound, ReplacementPolicy, TranspositionTable, NO_MOVE
+
+from typing import NamedTuple
+
+import time
+
+MATE_SCORE = 1000000
+INFINITY = 2 * MATE_SCORE
+
+# scores beyond MATE_BOUND are mates, found at most MAX_PLY plies away
+MAX_PLY = 1000
+MATE_BOUND = MATE_SCORE - MAX_PLY
+
+# how often (in nodes) to check the clock
+CLOCK_INTERVAL = 1024
+
+class SearchResult(NamedTuple):
+    '''
+        Summary of a single `AlphaBetaPlayer` search.
+
+        action :: GardnerChessAction : the best action found, or None if there was no legal action
+
+        score :: float : the score of `action` from the perspective of the side to move
+
+        depth :: int : the deepest fully completed iteration
+
+        nodes :: int : the number of nodes visited, including quiescence nodes
+
+        elapsed :: float : wall-clock duration of the search in seconds
+
+        nps :: float : nodes searched per second
+    '''
+    action: GardnerChessAction
+    score: float
+    depth: int
+    nodes: int
+    elapsed: float
+    nps: float
+
+class _SearchAborted(Exception):
+    pass
+
+def _move_key(action) -> tuple:
+    return (action.from_pos, action.to_pos)
+
+def _index_move_key(index: int, color: PieceColor) -> tuple:
+    '''
+        Returns
+        -------
+        The `_move_key` of the action with index `index` for `color`, without looking at a board.
+    '''
+    from_sq, to_sq, _ = decode_index(color.value, index)
+
+    return (SQUARE_POSITIONS[from_sq], SQUARE_POSITIONS[to_sq])
+
+def _score_to_tt(score: float, ply: int) -> float:
+    '''
+        Returns
+        -------
+        `score`, found `ply` plies from the root, as stored in the transposition table. Mate scores count
+        plies from the root, so they are stored as the distance from the node instead.
+    '''
+    if score >= MATE_BOUND: return score + ply
+    if score <= -MATE_BOUND: return score - ply
+    return score
+
+def _score_from_tt(value: float, ply: int) -> float:
+    '''
+        Returns
+        -------
+        The inverse of `_score_to_tt`: a transposition table `value` as a score found `ply` plies from the root.
+    '''
+    if value >= MATE_BOUND: return value - ply
+    if value <= -MATE_BOUND: return value + ply
+    return value
+
+class AlphaBetaPlayer(Player):
+    '''
+        A player that searches with negamax alpha-beta and iterative deepening.
+
+        Moves are ordered by transposition table move, MVV-LVA for captures, then killer and history
+        heuristics for quiet moves, and leaves are resolved with a quiescence search over `CAPTURE`-flagged
+        actions. The search only uses `push`, `pop` and the legal action API, so it works with
+        `GardnerChessBoard` and every variant built on it.
+
+        Parameters
+        ----------
+        max_depth :: int : the maximum iterative deepening depth
+
+        time_limit :: float : if given, stop searching after this many seconds
+
+        node_limit :: int : if given, stop searching after this many nodes
+
+        tt :: TranspositionTable : the transposition table to use, a new `tt_size_mb` table if None
+
+        tt_size_mb :: float : size of the transposition table created when `tt` is None
+    '''
+    def __init__(self, max_depth: int = 4, time_limit: float = None, node_limit: int = None, tt: TranspositionTable = None, tt_size_mb: float = 16):
+        super().__init__(LEN_ACTION_SPACE)
+
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.tt = tt if tt is not None else TranspositionTable(tt_size_mb, ReplacementPolicy.TWO_TIER)
+
+        self.last_search = None
+
+    def propose_action(self, board, color, action_mask):
+        result = self.search(board)
+
+        if result.action is None: return False, None
+
+        return True, result.action
+
+    def search(self, board) -> SearchResult:
+        '''
+            Searches the current position of `board` (for its active color) within the configured budget.
+
+            Returns
+            -------
+            SearchResult for the search, which is also stored as `last_search`.
+        '''
+        self.nodes = 0
+        self.start_time = time.perf_counter()
+        self.killers = [[None, None] for _ in range(self.max_depth + 1)]
+        self.history = {}
+        self.tt.new_search()
+
+        best_action, best_score, completed_depth = None, 0, 0
+
+        root_actions = board.legal_actions()
+
+        if len(root_actions) > 0:
+            # always have something to play, even if the first iteration is aborted
+            best_action = root_actions[0]
+
+            history_length = len(board.move_history)
+
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    score, action = self._root(board, depth)
+                except _SearchAborted:
+                    # unwind whatever the aborted iteration left on the board
+                    while len(board.move_history) > history_length:
+                        board.pop()
+                    break
+
+                best_action, best_score, completed_depth = action, score, depth
+
+                if abs(score) >= MATE_SCORE - self.max_depth or self._out_of_budget():
+                    break
+
+        elapsed = time.perf_counter() - self.start_time
+
+        self.last_search = SearchResult(best_action, best_score, completed_depth, self.nodes, elapsed, self.nodes / elapsed if elapsed > 0 else 0.0)
+
+        return self.last_search
+
+    def _out_of_budget(self) -> bool:
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            return True
+        if self.time_limit is not None and time.perf_counter() - self.start_time >= self.time_limit:
+            return True
+        return False
+
+    def _visit(self):
+        self.nodes += 1
+
+        if self.nodes % CLOCK_INTERVAL == 0 or self.node_limit is not None:
+            if self._out_of_budget():
+                raise _SearchAborted
+
+    def _evaluate(self, board) -> float:
+        '''
+            Returns
+            -------
+            The material balance of `board` from the perspective of the side to move.
+        '''
+        reward = board.reward()
+        return reward if board.active_color == PieceColor.WHITE else -reward
+
+    def _terminal_score(self, board, ply: int) -> float:
+        '''
+            Returns
+            -------
+            The score of a position with no legal actions, from the perspective of the side to move.
+        '''
+        status = board.status
+
+        if status == AbstractBoardStatus.DRAW or status == AbstractBoardStatus.ONGOING:
+            return 0
+
+        winner = PieceColor.WHITE if status == AbstractBoardStatus.WHITE_WIN else PieceColor.BLACK
+
+        # prefer quicker wins and slower losses
+        return MATE_SCORE - ply if winner == board.active_color else -MATE_SCORE + ply
+
+    def _order(self, board, actions, tt_move: int, ply: int):
+        '''
+            Sorts `actions` in place, most promising first.
+        '''
+        killers = self.killers[ply] if ply < len(self.killers) else [None, None]
+        color = board.active_color
+        tt_key = _index_move_key(tt_move, color) if tt_move != NO_MOVE else None
+
+        def score(action):
+            key = _move_key(action)
+            if key == tt_key:
+                return 4 * MATE_SCORE
+            if action.captured_piece is not None:
+                # most valuable victim, least valuable attacker
+                return 2 * MATE_SCORE + 10 * action.captured_piece.value - action.agent.value
+            if key == killers[0]:
+                return MATE_SCORE + 2
+            if key == killers[1]:
+                return MATE_SCORE + 1
+            return self.history.get((color, key), 0)
+
+        actions.sort(key=score, reverse=True)
+
+    def _root(self, board, depth: int):
+        alpha, beta = -INFINITY, INFINITY
+
+        entry = self.tt.probe(board.zobrist)
+        actions = board.legal_actions()
+        self._order(board, actions, entry.move if entry is not None else NO_MOVE, 0)
+
+        best_score, best_action = -INFINITY, actions[0]
+
+        for action in actions:
+            board.push(action, check_for_check=False)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            board.pop()
+
+            if score > best_score:
+                best_score, best_action = score, action
+            alpha = max(alpha, score)
+
+        self.tt.store(board.zobrist, depth, Bound.EXACT, best_action.index(), _score_to_tt(best_score, 0))
+
+        return best_score, best_action
+
+    def _king_lost(self, board) -> bool:
+        '''
+            Returns
+            -------
+            True if the side to move has lost its king while the opponent kept theirs. Variants may end the
+            game this way (e.g. Atomic explosions).
+        '''
+        pieces = board.bitboards.pieces
+        return not pieces[board.active_color.value][KING] and pieces[board.active_color.invert().value][KING] != 0
+
+    def _negamax(self, board, depth: int, alpha: float, beta: float, ply: int) -> float:
+        self._visit()
+
+        if self._king_lost(board):
+            return -MATE_SCORE + ply
+
+        if depth <= 0:
+            return self._quiescence(board, alpha, beta, ply)
+
+        key = board.zobrist
+        original_alpha = alpha
+
+        entry = self.tt.probe(key)
+        if entry is not None and entry.depth >= depth:
+            value = _score_from_tt(entry.value, ply)
+
+            if entry.bound == Bound.EXACT:
+                return value
+            elif entry.bound == Bound.LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+
+            if alpha >= beta:
+                return value
+
+        actions = board.legal_actions()
+
+        if len(actions) == 0:
+            return self._terminal_score(board, ply)
+
+        self._order(board, actions, entry.move if entry is not None else NO_MOVE, ply)
+
+        best_score, best_action = -INFINITY, None
+
+        for action in actions:
+            board.push(action, check_for_check=False)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best_score:
+                best_score, best_action = score, action
+
+            if score > alpha:
+                alpha = score
+
+            if alpha >= beta:
+                if action.captured_piece is None:
+                    self._record_cutoff(board, action, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+
+        self.tt.store(key, depth, bound, best_action.index(), _score_to_tt(best_score, ply))
+
+        return best_score
+
+    def _record_cutoff(self, board, action, depth: int, ply: int):
+        '''
+            Updates the killer and history heuristics with a quiet action that caused a beta cutoff.
+        '''
+        key = _move_key(action)
+
+        if ply < len(self.killers) and self.killers[ply][0] != key:
+            self.killers[ply][1] = self.killers[ply][0]
+            self.killers[ply][0] = key
+
+        history_key = (board.active_color, key)
+        self.history[history_key] = self.history.get(history_key, 0) + depth * depth
+
+    def _quiescence(self, board, alpha: float, beta: float, ply: int) -> float:
+        '''
+            Searches only capturing actions until the position is quiet.
+        '''
+        self._visit()
+
+        if self._king_lost(board):
+            return -MATE_SCORE + ply
+
+        stand_pat = self._evaluate(board)
+
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = list(board.iter_captures())
+        captures.sort(key=lambda action: 10 * action.captured_piece.value - action.agent.value if action.captured_piece is not None else 0, reverse=True)
+
+        for action in captures:
+            board.push(action, check_for_check=False)
+            score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        return alpha
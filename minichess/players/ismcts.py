@@ -0,0 +1,426 @@
+'''
+    Information-set Monte Carlo tree search for Dark Chess.
+
+    The player to move cannot see every opponent piece, so it searches sampled determinizations:
+    complete positions that look exactly like what it observes. Each determinization is searched
+    with an `MCTSPlayer` as a perfect-information game, and the root visit counts, which share the
+    1225-wide action space, are summed into one policy over the actions of the real position.
+
+    A determinization is consistent when the observer sees the same thing in it as in the real game:
+    the same visible squares with the same contents, and the same legal actions. The opponent pieces
+    hidden in it are its starting pieces, less those the observer captured and those in sight.
+    Searched determinizations are carried over to the next move by replaying the observer's move and
+    every opponent reply in them, keeping the successors still consistent with what is observed then.
+'''
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action import LEN_ACTION_SPACE
+from minichess.games.gardner.bitboard import BB_ALL, BB_SQUARES, NUM_SQUARES, SIDE_LENGTH, PIECE_INDEX, PIECE_TYPES, PAWN, KING, EMPTY, CODE_COLORS, CODE_TYPES, piece_code
+from minichess.games.gardner.move import MOVES
+from minichess.players.abstract import Player
+from minichess.players.mcts import Evaluator, MCTSPlayer, uniform_evaluator
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+import os
+import time
+
+# squares a pawn of either color can stand on: it starts on the second rank and promotes on the last
+PAWN_SQUARES = sum(BB_SQUARES[sq] for sq in range(SIDE_LENGTH, NUM_SQUARES - SIDE_LENGTH))
+
+class Observation(NamedTuple):
+    '''
+        What one color knows about a position it is to move in.
+
+        visible :: int : bitboard of the squares it can see
+
+        codes :: bytes : the piece code of every visible square, `EMPTY` for the squares it cannot see
+
+        actions :: frozenset : its legal action indices
+    '''
+    visible: int
+    codes: bytes
+    actions: frozenset
+
+def observe(board, color: PieceColor) -> Observation:
+    '''
+        Returns
+        -------
+        The Observation of `board`, a DarkChessBoard with `color` to move, for `color`.
+    '''
+    visible = board.visibility_bitboard(color)
+    codes = board.bitboards.codes()
+
+    return Observation(
+        visible,
+        bytes(code if BB_SQUARES[sq] & visible else EMPTY for sq, code in enumerate(codes)),
+        frozenset(board.legal_action_indices().tolist())
+    )
+
+def hidden_pieces(board, color: PieceColor) -> List[int]:
+    '''
+        Works out the opponent pieces `color` cannot see from its starting pieces, the pieces `color`
+        captured and the pieces in sight. Promotions `color` did not see are taken out of the pawns.
+
+        Returns
+        -------
+        List of the bitboard piece types of the hidden opponent pieces.
+    '''
+    opp = color.invert().value
+
+    start = board.copy()
+    while len(start.move_history) > 0:
+        start.pop()
+
+    counts = [0] * len(PIECE_TYPES)
+
+    for code in start.bitboards.codes():
+        if code != EMPTY and CODE_COLORS[code] == opp:
+            counts[CODE_TYPES[code]] += 1
+
+    for action in board.move_history:
+        if action.agent.color == color and action.captured_piece is not None:
+            counts[PIECE_INDEX[type(action.captured_piece)]] -= 1
+
+    visible = board.visibility_bitboard(color)
+
+    for piece_type in range(len(PIECE_TYPES)):
+        counts[piece_type] -= bin(board.bitboards.pieces[opp][piece_type] & visible).count('1')
+
+    for piece_type in range(len(PIECE_TYPES)):
+        if piece_type != PAWN and counts[piece_type] < 0:
+            counts[PAWN] += counts[piece_type]
+            counts[piece_type] = 0
+
+    return [piece_type for piece_type in range(len(PIECE_TYPES)) for _ in range(max(counts[piece_type], 0))]
+
+def sample_determinization(board, color: PieceColor, rng: np.random.Generator, hidden: List[int] = None,
+                           observation: Observation = None, max_attempts: int = 100, check: bool = True):
+    '''
+        Samples a position that `color`, to move on `board`, cannot tell apart from `board`, by placing
+        the hidden opponent pieces on the squares `color` cannot see until the result is consistent.
+
+        Parameters
+        ----------
+        board :: DarkChessBoard : the real position
+
+        color :: PieceColor : the observing color, to move on `board`
+
+        rng :: np.random.Generator : source of the placements
+
+        hidden :: List[int] : `hidden_pieces(board, color)`, computed if None
+
+        observation :: Observation : `observe(board, color)`, computed if None
+
+        max_attempts :: int : the number of placements to try
+
+        check :: bool : if False, return the first placement without checking its consistency
+
+        Returns
+        -------
+        A new board of the type of `board`, without move history, or None if no attempt was consistent.
+    '''
+    if hidden is None: hidden = hidden_pieces(board, color)
+    if observation is None: observation = observe(board, color)
+
+    opp = color.invert().value
+    free = [sq for sq in range(NUM_SQUARES) if BB_SQUARES[sq] & BB_ALL & ~observation.visible]
+
+    # the pawns first, which are the most constrained, then the king, which must not be left out
+    hidden = sorted(hidden, key=lambda piece_type: (piece_type != PAWN, piece_type != KING))
+
+    for _ in range(max_attempts):
+        codes = bytearray(observation.codes)
+        squares = list(rng.permutation(free))
+
+        for piece_type in hidden:
+            allowed = [sq for sq in squares if piece_type != PAWN or BB_SQUARES[sq] & PAWN_SQUARES]
+            if len(allowed) == 0: continue
+
+            sq = allowed[rng.integers(len(allowed))]
+            squares.remove(sq)
+            codes[sq] = piece_code(opp, piece_type)
+
+        world = type(board).from_bytes(bytes(codes) + bytes((color.value,)))
+
+        if not check or observe(world, color) == observation:
+            return world
+
+    return None
+
+class ISMCTSResult(NamedTuple):
+    '''
+        Summary of a single `ISMCTSPlayer` search.
+
+        action :: GardnerChessAction : the chosen action, or None if there was no legal action
+
+        visits :: np.array : shape (1225,) root visit counts per action index, summed over the determinizations
+
+        value :: float : the mean root value of the determinizations for the side to move
+
+        determinizations :: int : the number of determinizations searched
+
+        reused :: int : how many of them were carried over from the previous search
+
+        inconsistent :: int : how many of them were placed without passing the consistency check, because
+        sampling ran out of attempts
+
+        simulations :: int : the number of simulations over all determinizations
+
+        elapsed :: float : wall-clock duration of the search in seconds
+    '''
+    action: object
+    visits: np.array
+    value: float
+    determinizations: int
+    reused: int
+    inconsistent: int
+    simulations: int
+    elapsed: float
+
+# the search of a worker process, set up by `_init_worker`
+_worker_player = None
+
+def _init_worker(evaluator: Evaluator, num_simulations: int, batch_size: int, c_puct: float) -> None:
+    global _worker_player
+    _worker_player = MCTSPlayer(evaluator, num_simulations, batch_size, c_puct=c_puct, reuse_tree=False)
+
+def _search_world(task: Tuple[type, bytes, int]) -> Tuple[np.array, float, int]:
+    return _search(_worker_player, *task)
+
+def _search(player: MCTSPlayer, board_type: type, data: bytes, seed: int) -> Tuple[np.array, float, int]:
+    '''
+        Searches the position `data`, a `to_bytes()` of a `board_type`.
+
+        Returns
+        -------
+        tuple of the root visit counts, the root value and the number of simulations.
+    '''
+    np.random.seed(seed)
+
+    result = player.search(board_type.from_bytes(data))
+
+    return result.visits, result.value, result.simulations
+
+class ISMCTSPlayer(Player):
+    '''
+        A Dark Chess player that searches sampled determinizations of what it sees, see the module
+        documentation.
+
+        Determinizations are searched by separate `MCTSPlayer`s in `num_workers` processes, which need
+        a picklable `evaluator`, e.g. a module-level function. With `num_workers=0` they are searched
+        one after the other in this process.
+
+        Parameters
+        ----------
+        evaluator :: Evaluator : batched function returning priors and values, `uniform_evaluator` if None
+
+        num_determinizations :: int : the number of determinizations searched per move
+
+        num_simulations :: int : the number of simulations per determinization
+
+        batch_size :: int : the maximum number of leaves per evaluator call
+
+        c_puct :: float : the weight of the exploration term
+
+        max_attempts :: int : the number of placements tried per sampled determinization
+
+        max_candidates :: int : the most determinizations carried over to check for consistency with
+        the next move, None for no limit
+
+        num_workers :: int : the number of search processes, one per determinization up to the number
+        of CPUs if None, 0 to search in this process
+
+        temperature :: float : 0 plays the most visited action, otherwise actions are sampled by visits ** (1 / temperature)
+
+        reuse_determinizations :: bool : whether to carry determinizations over between moves
+
+        seed :: int : seed of the sampling
+    '''
+    def __init__(self, evaluator: Evaluator = None, num_determinizations: int = 8, num_simulations: int = 100,
+                 batch_size: int = 16, c_puct: float = 1.5, max_attempts: int = 100, max_candidates: int = 256,
+                 num_workers: int = None, temperature: float = 0.0, reuse_determinizations: bool = True, seed: int = None):
+        super().__init__(LEN_ACTION_SPACE)
+
+        self.evaluator = evaluator if evaluator is not None else uniform_evaluator
+        self.num_determinizations = num_determinizations
+        self.num_simulations = num_simulations
+        self.batch_size = batch_size
+        self.c_puct = c_puct
+        self.max_attempts = max_attempts
+        self.max_candidates = max_candidates
+        self.num_workers = min(num_determinizations, os.cpu_count() or 1) if num_workers is None else num_workers
+        self.temperature = temperature
+        self.reuse_determinizations = reuse_determinizations
+        self.rng = np.random.default_rng(seed)
+
+        self.last_search = None
+
+        self._pool = None
+        self._player = None
+        self.reset()
+
+    def propose_action(self, board, color, action_mask):
+        result = self.search(board)
+
+        if result.action is None: return False, None
+
+        return True, result.action
+
+    def reset(self) -> None:
+        '''
+            Drops the determinizations kept for the next move, e.g. before a new game.
+        '''
+        self._worlds = []
+        self._history_length = None
+        self._color = None
+
+    def close(self) -> None:
+        '''
+            Shuts down the search processes.
+        '''
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> 'ISMCTSPlayer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def search(self, board) -> ISMCTSResult:
+        '''
+            Searches the current position of `board`, a DarkChessBoard, for its active color, using only
+            what that color can observe. `board` is not changed.
+
+            Returns
+            -------
+            ISMCTSResult for the search, which is also stored as `last_search`.
+        '''
+        start_time = time.perf_counter()
+
+        color = board.active_color
+        observation = observe(board, color)
+
+        worlds = self._carry_over(board, color, observation)
+        reused = len(worlds)
+
+        hidden = hidden_pieces(board, color)
+        inconsistent = 0
+
+        while len(worlds) < self.num_determinizations and len(observation.actions) > 0:
+            world = sample_determinization(board, color, self.rng, hidden, observation, self.max_attempts)
+
+            if world is None:
+                world = sample_determinization(board, color, self.rng, hidden, observation, check=False)
+                inconsistent += 1
+
+            worlds.append(world)
+
+        visits = np.zeros(LEN_ACTION_SPACE, dtype=np.int64)
+        values = []
+        simulations = 0
+
+        if len(worlds) > 0:
+            seeds = self.rng.integers(2 ** 31, size=len(worlds))
+            tasks = [(type(world), world.to_bytes(), int(seed)) for world, seed in zip(worlds, seeds)]
+
+            for world_visits, value, world_simulations in self._map(tasks):
+                visits += world_visits
+                values.append(value)
+                simulations += world_simulations
+
+        # determinizations that failed the check may have other legal actions
+        mask = np.zeros(LEN_ACTION_SPACE, dtype=bool)
+        mask[list(observation.actions)] = True
+        visits[~mask] = 0
+
+        action = None
+
+        if len(observation.actions) > 0:
+            action = MOVES[color.value][self._choose(visits, observation.actions)].to_action(board)
+
+        self._worlds = worlds
+        self._history_length = len(board.move_history)
+        self._color = color
+
+        self.last_search = ISMCTSResult(action, visits, float(np.mean(values)) if len(values) > 0 else 0.0,
+                                        len(worlds), reused, inconsistent, simulations, time.perf_counter() - start_time)
+
+        return self.last_search
+
+    def _choose(self, visits: np.array, actions: frozenset) -> int:
+        '''
+            Returns
+            -------
+            The action index to play from the summed visit counts.
+        '''
+        actions = np.array(sorted(actions))
+        counts = visits[actions].astype(np.float64)
+
+        if self.temperature == 0 or counts.sum() == 0:
+            return int(actions[np.argmax(counts)])
+
+        weights = counts ** (1 / self.temperature)
+
+        return int(self.rng.choice(actions, p=weights / weights.sum()))
+
+    def _map(self, tasks: List[tuple]) -> List[Tuple[np.array, float, int]]:
+        if self.num_workers == 0:
+            if self._player is None:
+                self._player = MCTSPlayer(self.evaluator, self.num_simulations, self.batch_size, c_puct=self.c_puct, reuse_tree=False)
+
+            return [_search(self._player, *task) for task in tasks]
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.num_workers, initializer=_init_worker,
+                                             initargs=(self.evaluator, self.num_simulations, self.batch_size, self.c_puct))
+
+        return list(self._pool.map(_search_world, tasks))
+
+    def _carry_over(self, board, color: PieceColor, observation: Observation) -> list:
+        '''
+            Plays the moves made on `board` since the last search in the determinizations of that search,
+            every possible opponent move for the moves `color` did not see.
+
+            Returns
+            -------
+            Up to `num_determinizations` of the resulting positions that are consistent with `observation`.
+        '''
+        if not self.reuse_determinizations or self._color != color or self._history_length is None: return []
+        if not self._history_length < len(board.move_history): return []
+
+        worlds = self._worlds
+
+        for action in board.move_history[self._history_length:]:
+            successors = []
+
+            if action.agent.color == color:
+                index = action.index()
+
+                for world in worlds:
+                    if world.active_color == color and index in world.legal_action_indices():
+                        world = world.copy()
+                        world.push_move(MOVES[color.value][index], check_for_check=False)
+                        successors.append(world)
+            else:
+                for world in worlds:
+                    for move in world.legal_moves():
+                        successor = world.copy()
+                        successor.push_move(move, check_for_check=False)
+                        successors.append(successor)
+
+            # keep one board per position
+            worlds = list({world.to_bytes(): world for world in successors}.values())
+
+            if self.max_candidates is not None and len(worlds) > self.max_candidates:
+                worlds = [worlds[i] for i in self.rng.choice(len(worlds), self.max_candidates, replace=False)]
+
+        worlds = [world for world in worlds if observe(world, color) == observation]
+
+        if len(worlds) > self.num_determinizations:
+            worlds = [worlds[i] for i in self.rng.choice(len(worlds), self.num_determinizations, replace=False)]
+
+        return worlds
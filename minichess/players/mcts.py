@@ -0,0 +1,399 @@
+from minichess.games.abstract.board import AbstractBoardStatus
+from minichess.games.gardner.action import LEN_ACTION_SPACE
+from minichess.games.gardner.move import MOVES
+from minichess.players.abstract import Player
+from minichess.vector_env import game_status, outcome
+
+from typing import Callable, List, NamedTuple, Tuple
+
+import math
+import numpy as np
+import time
+
+# evaluator(states, masks) -> (priors, values): states are shape (B, 5, 5, 12) `canonical_state_vector`s,
+# masks shape (B, 1225) legal action masks; priors are shape (B, 1225) move probabilities (need not be
+# normalized, only legal entries are read) and values shape (B,) in [-1, 1] for the side to move
+Evaluator = Callable[[np.array, np.array], Tuple[np.array, np.array]]
+
+def uniform_evaluator(states: np.array, masks: np.array) -> Tuple[np.array, np.array]:
+    '''
+        An evaluator with uniform priors over the legal actions and a value of 0 for every position.
+    '''
+    return masks, np.zeros(len(masks))
+
+class MCTSNode:
+    '''
+        A position in the search tree, holding the statistics of the edges to its children.
+
+        Edge statistics are arrays over `moves`, the legal action indices of the position. `values` are
+        summed from the perspective of the side to move here, so a child's entry is the negation of
+        that child's own values.
+
+        key :: bytes : `to_bytes()` of the position
+
+        moves :: np.array : the legal action indices
+
+        priors :: np.array : the evaluator's probability of each move
+
+        visits :: np.array : the number of completed simulations through each move
+
+        values :: np.array : the summed values of those simulations
+
+        virtual :: np.array : the number of simulations through each move still waiting for their leaf to be evaluated
+
+        children :: list : the child node of each move, None while unexpanded
+
+        terminal :: float : if the game is over here, its result for the side to move, otherwise None
+    '''
+    __slots__ = ('key', 'moves', 'priors', 'visits', 'values', 'virtual', 'children', 'terminal')
+
+    def __init__(self, key: bytes, moves: np.array, priors: np.array, terminal: float = None) -> None:
+        self.key = key
+        self.moves = moves
+        self.priors = priors
+        self.visits = np.zeros(len(moves), dtype=np.int32)
+        self.values = np.zeros(len(moves))
+        self.virtual = np.zeros(len(moves), dtype=np.int32)
+        self.children = [None] * len(moves)
+        self.terminal = terminal
+
+    def value(self) -> float:
+        '''
+            Returns
+            -------
+            The mean value of all simulations through this node, for the side to move.
+        '''
+        if self.terminal is not None: return self.terminal
+
+        total = self.visits.sum()
+        return float(self.values.sum() / total) if total > 0 else 0.0
+
+# marks a child whose leaf evaluation is queued in the current batch
+_PENDING = MCTSNode(b'', np.zeros(0, dtype=np.intp), np.zeros(0))
+
+class MCTSResult(NamedTuple):
+    '''
+        Summary of a single `MCTSPlayer` search.
+
+        action :: GardnerChessAction : the chosen action, or None if there was no legal action
+
+        visits :: np.array : shape (1225,) root visit counts per action index, the search policy
+
+        value :: float : the mean value of the root for the side to move
+
+        simulations :: int : the number of simulations run by this search
+
+        reused :: int : the number of root visits carried over from the previous search
+
+        nodes :: int : the number of nodes added to the tree
+
+        evaluations :: int : the number of positions passed to the evaluator
+
+        batches :: int : the number of evaluator calls
+
+        collisions :: int : the number of simulations that ran into a leaf already queued for evaluation
+
+        elapsed :: float : wall-clock duration of the search in seconds
+
+        sps :: float : simulations per second
+    '''
+    action: object
+    visits: np.array
+    value: float
+    simulations: int
+    reused: int
+    nodes: int
+    evaluations: int
+    batches: int
+    collisions: int
+    elapsed: float
+    sps: float
+
+class MCTSPlayer(Player):
+    '''
+        A player that searches with Monte Carlo tree search guided by PUCT and an `Evaluator`.
+
+        Simulations descend the tree by `Q + c_puct * P * sqrt(N) / (1 + n)`. Up to `batch_size` leaves
+        are collected per evaluator call: every simulation waiting for its leaf adds a virtual loss to
+        the moves on its path, which steers the next simulations of the batch elsewhere. Finished games
+        are scored without the evaluator.
+
+        The subtree of the position reached is kept between searches, so the next search starts from
+        the visits of the previous one when the game continued through the tree.
+
+        Parameters
+        ----------
+        evaluator :: Evaluator : batched function returning priors and values, `uniform_evaluator` if None
+
+        num_simulations :: int : the number of simulations per search
+
+        batch_size :: int : the maximum number of leaves per evaluator call
+
+        time_limit :: float : if given, stop searching after this many seconds
+
+        c_puct :: float : the weight of the exploration term
+
+        virtual_loss :: float : the value a pending simulation counts as, against the side that chose the move
+
+        temperature :: float : 0 plays the most visited action, otherwise actions are sampled by visits ** (1 / temperature)
+
+        dirichlet_alpha :: float : if given, Dirichlet noise with this concentration is mixed into the root priors
+
+        noise_fraction :: float : the weight of the Dirichlet noise
+
+        reuse_tree :: bool : whether to keep the subtree between searches
+    '''
+    def __init__(self, evaluator: Evaluator = None, num_simulations: int = 200, batch_size: int = 16, time_limit: float = None,
+                 c_puct: float = 1.5, virtual_loss: float = 1.0, temperature: float = 0.0, dirichlet_alpha: float = None,
+                 noise_fraction: float = 0.25, reuse_tree: bool = True):
+        super().__init__(LEN_ACTION_SPACE)
+
+        self.evaluator = evaluator if evaluator is not None else uniform_evaluator
+        self.num_simulations = num_simulations
+        self.batch_size = batch_size
+        self.time_limit = time_limit
+        self.c_puct = c_puct
+        self.virtual_loss = virtual_loss
+        self.temperature = temperature
+        self.dirichlet_alpha = dirichlet_alpha
+        self.noise_fraction = noise_fraction
+        self.reuse_tree = reuse_tree
+
+        self.root = None
+        self.last_search = None
+
+        self._states = np.zeros((batch_size, 5, 5, 12), dtype=np.float32)
+        self._masks = np.zeros((batch_size, LEN_ACTION_SPACE), dtype=np.float32)
+
+    def propose_action(self, board, color, action_mask):
+        result = self.search(board)
+
+        if result.action is None: return False, None
+
+        return True, result.action
+
+    def reset(self) -> None:
+        '''
+            Drops the search tree, e.g. before a new game.
+        '''
+        self.root = None
+
+    def search(self, board) -> MCTSResult:
+        '''
+            Searches the current position of `board` (for its active color). `board` is not changed.
+
+            Returns
+            -------
+            MCTSResult for the search, which is also stored as `last_search`.
+        '''
+        start_time = time.perf_counter()
+
+        board = board.copy()
+        self._nodes = self._evaluations = self._batches = self._collisions = 0
+
+        root = self._find_root(board.to_bytes()) if self.reuse_tree else None
+        if root is None:
+            root = self._expand_root(board)
+
+        self.root = root
+        reused = int(root.visits.sum())
+
+        simulations = 0
+
+        if root.terminal is None and len(root.moves) > 0:
+            priors = root.priors
+
+            if self.dirichlet_alpha is not None:
+                noise = np.random.dirichlet([self.dirichlet_alpha] * len(root.moves))
+                root.priors = (1 - self.noise_fraction) * priors + self.noise_fraction * noise
+
+            while simulations < self.num_simulations:
+                if self.time_limit is not None and time.perf_counter() - start_time >= self.time_limit:
+                    break
+
+                simulations += self._run_batch(board, root, min(self.batch_size, self.num_simulations - simulations))
+
+            root.priors = priors
+
+        visits = np.zeros(LEN_ACTION_SPACE, dtype=np.int32)
+        visits[root.moves] = root.visits
+
+        action = None
+
+        if root.terminal is None and len(root.moves) > 0:
+            move = MOVES[board.active_color.value][self._choose(root)]
+            action = move.to_action(board)
+
+        elapsed = time.perf_counter() - start_time
+
+        self.last_search = MCTSResult(action, visits, root.value(), simulations, reused, self._nodes, self._evaluations,
+                                      self._batches, self._collisions, elapsed, simulations / elapsed if elapsed > 0 else 0.0)
+
+        return self.last_search
+
+    def _find_root(self, key: bytes) -> MCTSNode:
+        '''
+            Returns
+            -------
+            The node of the previous tree at most two plies below its root with position `key`, or None.
+        '''
+        if self.root is None: return None
+
+        level = [self.root]
+
+        for _ in range(3):
+            for node in level:
+                if node.key == key: return node
+
+            level = [child for node in level for child in node.children if child is not None and child is not _PENDING]
+
+        return None
+
+    def _choose(self, root: MCTSNode) -> int:
+        '''
+            Returns
+            -------
+            The action index to play from `root`'s visit counts.
+        '''
+        if self.temperature == 0 or root.visits.sum() == 0:
+            # ties, e.g. with no simulations, go to the higher prior
+            return int(root.moves[np.lexsort((root.priors, root.visits))[-1]])
+
+        weights = root.visits.astype(np.float64) ** (1 / self.temperature)
+
+        return int(np.random.choice(root.moves, p=weights / weights.sum()))
+
+    def _expand_root(self, board) -> MCTSNode:
+        key = board.to_bytes()
+        status = game_status(board)
+
+        if status != AbstractBoardStatus.ONGOING:
+            return MCTSNode(key, np.zeros(0, dtype=np.intp), np.zeros(0), outcome(status, board.active_color))
+
+        board.canonical_state_vector(out=self._states[0])
+        board.legal_action_mask(out=self._masks[0])
+
+        priors, _ = self._evaluate(1)
+
+        return self._node(key, self._masks[0], priors[0])
+
+    def _evaluate(self, count: int):
+        self._evaluations += count
+        self._batches += 1
+
+        priors, values = self.evaluator(self._states[:count], self._masks[:count])
+
+        return np.asarray(priors), np.asarray(values)
+
+    def _node(self, key: bytes, mask: np.array, priors: np.array) -> MCTSNode:
+        self._nodes += 1
+
+        moves = np.flatnonzero(mask)
+        priors = np.maximum(np.asarray(priors, dtype=np.float64)[moves], 0)
+
+        total = priors.sum()
+        priors = priors / total if total > 0 else np.full(len(moves), 1 / max(len(moves), 1))
+
+        return MCTSNode(key, moves, priors)
+
+    def _select(self, node: MCTSNode) -> int:
+        '''
+            Returns
+            -------
+            The position in `node.moves` of the move maximizing Q + U.
+        '''
+        visits = node.visits + node.virtual
+        values = node.values - self.virtual_loss * node.virtual
+
+        # unvisited moves count as even
+        q = np.divide(values, visits, out=np.zeros(len(visits)), where=visits > 0)
+        u = self.c_puct * node.priors * math.sqrt(visits.sum() + 1) / (1 + visits)
+
+        return int(np.argmax(q + u))
+
+    def _run_batch(self, board, root: MCTSNode, size: int) -> int:
+        '''
+            Runs up to `size` simulations, evaluating their leaves in one evaluator call.
+
+            Returns
+            -------
+            The number of simulations completed.
+        '''
+        pending = []
+        completed = 0
+
+        for _ in range(size):
+            node, path = root, []
+
+            while True:
+                i = self._select(node)
+                path.append((node, i))
+                node.virtual[i] += 1
+
+                board.push_move(MOVES[board.active_color.value][node.moves[i]], check_for_check=False)
+
+                child = node.children[i]
+
+                if child is None or child is _PENDING or child.terminal is not None:
+                    break
+
+                node = child
+
+            if child is _PENDING:
+                # another simulation of this batch is already waiting on this leaf
+                self._collisions += 1
+                self._unwind(board, path)
+                for parent, i in path:
+                    parent.virtual[i] -= 1
+                break
+
+            if child is not None:
+                self._backup(path, child.terminal)
+                completed += 1
+            else:
+                status = game_status(board)
+
+                if status != AbstractBoardStatus.ONGOING:
+                    value = outcome(status, board.active_color)
+                    node.children[i] = MCTSNode(board.to_bytes(), np.zeros(0, dtype=np.intp), np.zeros(0), value)
+                    self._nodes += 1
+
+                    self._backup(path, value)
+                    completed += 1
+                else:
+                    slot = len(pending)
+                    board.canonical_state_vector(out=self._states[slot])
+                    board.legal_action_mask(out=self._masks[slot])
+
+                    node.children[i] = _PENDING
+                    pending.append((path, board.to_bytes()))
+
+            self._unwind(board, path)
+
+        if len(pending) > 0:
+            priors, values = self._evaluate(len(pending))
+
+            for slot, (path, key) in enumerate(pending):
+                parent, i = path[-1]
+                parent.children[i] = self._node(key, self._masks[slot], priors[slot])
+
+                self._backup(path, float(values[slot]))
+                completed += 1
+
+        return completed
+
+    def _unwind(self, board, path: List[tuple]) -> None:
+        for _ in path:
+            board.pop()
+
+    def _backup(self, path: List[tuple], value: float) -> None:
+        '''
+            Adds `value`, the result of a simulation for the side to move at its leaf, along `path`.
+        '''
+        for node, i in reversed(path):
+            # the side to move alternates every ply
+            value = -value
+
+            node.virtual[i] -= 1
+            node.visits[i] += 1
+            node.values[i] += value
@@ -0,0 +1,337 @@
+'''
+    Compact binary game records.
+
+    A shard is a file holding any number of games:
+
+        file header : b'MCGR', uint16 format version, uint16 reserved
+        game        : uint32 length of the rest of the game in bytes
+                      uint8 variant id (see `VARIANT_IDS`), uint8 flags, int8 result for white
+                      26 bytes start position (`to_bytes()`), uint16 number of moves n
+                      the n action indices, 11 bits each, little-endian bit order
+                      if flagged: n float16 search values, for the side to move
+                      if flagged: per move a uint16 count k, then k (uint16 action, uint16 visits) pairs
+        ...
+        index       : uint64 offset of every game, uint64 number of games, b'MCGI'
+
+    `RecordWriter` streams games to a shard and writes the index on `close`. `RecordReader` memory-maps
+    a shard and decodes games, and the positions in them, only when they are accessed. A shard without
+    an index, e.g. from a writer that was killed, is indexed by scanning the game lengths.
+'''
+from minichess.games.atomic.board import AtomicChessBoard
+from minichess.games.dark.board import DarkChessBoard
+from minichess.games.gardner.action import LEN_ACTION_SPACE
+from minichess.games.gardner.bitboard import NUM_SQUARES
+from minichess.games.gardner.move import INDEX_BITS, MOVES
+from minichess.games.rifle.board import RifleChessBoard
+from minichess.vector_env import VARIANTS
+
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import struct
+
+VERSION = 1
+
+VARIANT_IDS = {
+    'gardner': 0,
+    'rifle': 1,
+    'atomic': 2,
+    'dark': 3
+}
+
+VARIANT_NAMES = {variant_id: name for name, variant_id in VARIANT_IDS.items()}
+
+HAS_VALUES = 1
+HAS_VISITS = 2
+
+_FILE_HEADER = struct.Struct('<4sHH')
+_GAME_HEADER = struct.Struct('<IBBb{}sH'.format(NUM_SQUARES + 1))
+_INDEX_FOOTER = struct.Struct('<Q4s')
+
+_FILE_MAGIC = b'MCGR'
+_INDEX_MAGIC = b'MCGI'
+
+_BIT_WEIGHTS = 1 << np.arange(INDEX_BITS, dtype=np.int64)
+
+class GameRecord(NamedTuple):
+    '''
+        One recorded game.
+
+        variant :: str : one of the keys of `VARIANT_IDS`
+
+        start :: bytes : `to_bytes()` of the starting position
+
+        actions :: np.array : shape (n,) int16 action indices of the moves played
+
+        result :: int : 1 if white won, -1 if black won, 0 otherwise
+
+        values :: np.array : optional shape (n,) float32 search values before each move, for the side to move
+
+        visits :: list : optional list of n shape (k, 2) arrays of (action index, visit count) of the search before each move
+    '''
+    variant: str
+    start: bytes
+    actions: np.array
+    result: int = 0
+    values: Optional[np.array] = None
+    visits: Optional[List[np.array]] = None
+
+    @property
+    def board_type(self) -> type:
+        return VARIANTS[self.variant]
+
+    def positions(self) -> Iterator:
+        '''
+            Replays the game, yielding the board before each move and finally the final position.
+
+            The same board is yielded every time, changed by each move; copy it to keep a position.
+        '''
+        board = self.board_type.from_bytes(self.start)
+
+        yield board
+
+        for action in self.actions:
+            board.push_move(MOVES[board.active_color.value][action], check_for_check=False)
+            yield board
+
+    def board_at(self, ply: int):
+        '''
+            Returns
+            -------
+            A new board with the position before move `ply`.
+        '''
+        assert 0 <= ply <= len(self.actions), 'Expected a ply between 0 and {}, got {}'.format(len(self.actions), ply)
+
+        for i, board in enumerate(self.positions()):
+            if i == ply: return board
+
+    def policy(self, ply: int) -> np.array:
+        '''
+            Returns
+            -------
+            shape (1225,) float32 search policy before move `ply`: the normalized visit counts if they were
+            recorded, else a one-hot of the move played.
+        '''
+        policy = np.zeros(LEN_ACTION_SPACE, dtype=np.float32)
+
+        if self.visits is not None and self.visits[ply][:, 1].sum() > 0:
+            visits = self.visits[ply]
+            policy[visits[:, 0]] = visits[:, 1]
+            return policy / policy.sum()
+
+        policy[self.actions[ply]] = 1
+        return policy
+
+def variant_of(board) -> str:
+    '''
+        Returns
+        -------
+        The key of `VARIANT_IDS` whose rules `board` plays by.
+    '''
+    # variants subclass GardnerChessBoard, so check them first
+    for name, board_type in (('atomic', AtomicChessBoard), ('dark', DarkChessBoard), ('rifle', RifleChessBoard)):
+        if isinstance(board, board_type): return name
+
+    return 'gardner'
+
+def record_from_board(board, result: int = 0, values: np.array = None, visits: List[np.array] = None) -> GameRecord:
+    '''
+        Builds the record of the game played on `board`, from its move history. `board` is not changed.
+    '''
+    start = board.copy()
+    while len(start.move_history) > 0:
+        start.pop()
+
+    actions = np.array([action.index() for action in board.move_history], dtype=np.int16)
+
+    return GameRecord(variant_of(board), start.to_bytes(), actions, result, values, visits)
+
+def pack_indices(indices: np.array) -> bytes:
+    '''
+        Returns
+        -------
+        `indices`, each below 2 ** 11, packed into 11 bits each.
+    '''
+    indices = np.asarray(indices, dtype=np.int64)
+    bits = ((indices[:, None] & _BIT_WEIGHTS) != 0).astype(np.uint8)
+    return np.packbits(bits.ravel(), bitorder='little').tobytes()
+
+def unpack_indices(data, count: int) -> np.array:
+    '''
+        Returns
+        -------
+        shape (count,) int16 array of the indices packed by `pack_indices`.
+    '''
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=count * INDEX_BITS, bitorder='little')
+    return (bits.reshape(count, INDEX_BITS).astype(np.int64) @ _BIT_WEIGHTS).astype(np.int16)
+
+def _packed_size(count: int) -> int:
+    return (count * INDEX_BITS + 7) // 8
+
+def encode_record(record: GameRecord) -> bytes:
+    '''
+        Returns
+        -------
+        The bytes of `record` in a shard, length prefix included.
+    '''
+    count = len(record.actions)
+
+    assert len(record.start) == NUM_SQUARES + 1, 'Expected a {}-byte start position.'.format(NUM_SQUARES + 1)
+    assert record.values is None or len(record.values) == count, 'Expected one value per move.'
+    assert record.visits is None or len(record.visits) == count, 'Expected one set of visit counts per move.'
+
+    flags = (HAS_VALUES if record.values is not None else 0) | (HAS_VISITS if record.visits is not None else 0)
+
+    body = [pack_indices(record.actions)]
+
+    if record.values is not None:
+        body.append(np.asarray(record.values, dtype='<f2').tobytes())
+
+    if record.visits is not None:
+        for visits in record.visits:
+            visits = np.asarray(visits, dtype='<u2').reshape(-1, 2)
+            body.append(struct.pack('<H', len(visits)))
+            body.append(visits.tobytes())
+
+    body = b''.join(body)
+
+    header = _GAME_HEADER.pack(_GAME_HEADER.size - 4 + len(body), VARIANT_IDS[record.variant], flags, record.result, record.start, count)
+
+    return header + body
+
+def decode_record(data, offset: int = 0) -> GameRecord:
+    '''
+        Decodes the game at `offset` of `data`, any bytes-like object such as a memory map.
+    '''
+    _, variant_id, flags, result, start, count = _GAME_HEADER.unpack_from(data, offset)
+    offset += _GAME_HEADER.size
+
+    size = _packed_size(count)
+    actions = unpack_indices(data[offset:offset + size], count)
+    offset += size
+
+    values = visits = None
+
+    if flags & HAS_VALUES:
+        values = np.frombuffer(data, dtype='<f2', count=count, offset=offset).astype(np.float32)
+        offset += 2 * count
+
+    if flags & HAS_VISITS:
+        visits = []
+
+        for _ in range(count):
+            k, = struct.unpack_from('<H', data, offset)
+            visits.append(np.frombuffer(data, dtype='<u2', count=2 * k, offset=offset + 2).reshape(k, 2).astype(np.intp))
+            offset += 2 + 4 * k
+
+    return GameRecord(VARIANT_NAMES[variant_id], bytes(start), actions, result, values, visits)
+
+class RecordWriter:
+    '''
+        Streams `GameRecord`s to a shard at `path`, see the module documentation for the format.
+
+        Games are written as they are added; the index is written by `close`.
+    '''
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(_FILE_HEADER.pack(_FILE_MAGIC, VERSION, 0))
+
+        self.offsets = []
+        self._position = _FILE_HEADER.size
+
+    def write(self, record: GameRecord) -> None:
+        data = encode_record(record)
+
+        self.offsets.append(self._position)
+        self.file.write(data)
+        self._position += len(data)
+
+    def close(self) -> None:
+        if self.file.closed: return
+
+        self.file.write(np.asarray(self.offsets, dtype='<u8').tobytes())
+        self.file.write(_INDEX_FOOTER.pack(len(self.offsets), _INDEX_MAGIC))
+        self.file.close()
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+class RecordReader:
+    '''
+        Memory-maps a shard at `path` and decodes its games on access.
+
+        Supports `len`, indexing and iteration over `GameRecord`s.
+    '''
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+
+        magic, version, _ = _FILE_HEADER.unpack_from(self.data, 0)
+
+        if magic != _FILE_MAGIC: raise ValueError('{} is not a game record shard'.format(path))
+        if version > VERSION: raise ValueError('{} has format version {}, expected at most {}'.format(path, version, VERSION))
+
+        self.offsets = self._read_index()
+
+    def _read_index(self) -> np.array:
+        size = len(self.data)
+
+        if size >= _FILE_HEADER.size + _INDEX_FOOTER.size:
+            count, magic = _INDEX_FOOTER.unpack_from(self.data, size - _INDEX_FOOTER.size)
+            start = size - _INDEX_FOOTER.size - 8 * count
+
+            if magic == _INDEX_MAGIC and start >= _FILE_HEADER.size:
+                offsets = np.frombuffer(self.data, dtype='<u8', count=count, offset=start).astype(np.int64)
+
+                if count == 0 or offsets[0] == _FILE_HEADER.size: return offsets
+
+        # no index, walk the length prefixes up to the last complete game
+        offsets = []
+        offset = _FILE_HEADER.size
+
+        while offset + 4 <= size:
+            length, = struct.unpack_from('<I', self.data, offset)
+            if offset + 4 + length > size: break
+
+            offsets.append(offset)
+            offset += 4 + length
+
+        return np.array(offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, i: int) -> GameRecord:
+        return decode_record(self.data, int(self.offsets[i]))
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def lengths(self) -> np.array:
+        '''
+            Returns
+            -------
+            shape (len(self),) array of the number of moves of every game, read from the game headers only.
+        '''
+        count_offset = _GAME_HEADER.size - 2
+        return np.array([struct.unpack_from('<H', self.data, offset + count_offset)[0] for offset in self.offsets.tolist()], dtype=np.int64)
+
+    def close(self) -> None:
+        # the map is unmapped once no decoded array refers to it any more
+        self.data = None
+
+    def __enter__(self) -> 'RecordReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+def write_records(path: str, records: List[GameRecord]) -> None:
+    with RecordWriter(path) as writer:
+        for record in records:
+            writer.write(record)
@@ -0,0 +1,247 @@
+from enum import Enum
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+class Bound(Enum):
+    '''
+        How a stored value relates to the true value of a position.
+    '''
+    EXACT = 1
+    LOWER = 2 # the search failed high, the true value is at least the stored value
+    UPPER = 3 # the search failed low, the true value is at most the stored value
+
+class ReplacementPolicy(Enum):
+    ALWAYS_REPLACE = 0   # one slot per index, new entries always overwrite old ones
+    DEPTH_PREFERRED = 1  # one slot per index, deeper (or fresher) entries are kept
+    TWO_TIER = 2         # two slots per index, a depth-preferred slot and an always-replace slot
+
+class TTEntry(NamedTuple):
+    '''
+        A single transposition table entry.
+
+        key :: int : the position hash this entry was stored under
+
+        depth :: int : the remaining search depth the value was computed with
+
+        bound :: Bound : whether `value` is exact, a lower bound or an upper bound
+
+        move :: int : the index of the best move in the 1225-wide action space, or -1 if unknown
+
+        value :: float : the value of the position from the perspective of the side to move
+    '''
+    key: int
+    depth: int
+    bound: Bound
+    move: int
+    value: float
+
+NO_MOVE = -1
+
+KEY_MASK = (1 << 64) - 1
+
+# bytes per entry: key, depth, bound, move, value, generation
+ENTRY_SIZE = np.dtype(np.uint64).itemsize + np.dtype(np.int16).itemsize + np.dtype(np.uint8).itemsize + \
+             np.dtype(np.int16).itemsize + np.dtype(np.float32).itemsize + np.dtype(np.uint8).itemsize
+
+_BOUNDS = {bound.value: bound for bound in Bound}
+
+class TranspositionTable:
+    '''
+        A bounded transposition table for search algorithms over `GardnerChessBoard` and its variants.
+
+        Entries are stored in preallocated NumPy arrays whose total size is fixed by `size_mb`, and are
+        looked up by a 64-bit position hash, normally `board.zobrist`.
+
+        Parameters
+        ----------
+        size_mb :: float : the memory budget of the table, in megabytes
+
+        policy :: ReplacementPolicy : how to choose which entry to overwrite when storing
+    '''
+
+    def __init__(self, size_mb: float = 16, policy: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED) -> None:
+        self.policy = policy
+        self.ways = 2 if policy == ReplacementPolicy.TWO_TIER else 1
+
+        num_entries = int(size_mb * 1024 * 1024) // ENTRY_SIZE
+        self.num_buckets = num_entries // self.ways
+
+        assert self.num_buckets > 0, 'A {} MB transposition table cannot hold a single bucket.'.format(size_mb)
+
+        size = self.num_buckets * self.ways
+
+        self._keys = np.zeros(size, dtype=np.uint64)
+        self._depths = np.zeros(size, dtype=np.int16)
+        self._bounds = np.zeros(size, dtype=np.uint8) # 0 marks an empty slot
+        self._moves = np.full(size, NO_MOVE, dtype=np.int16)
+        self._values = np.zeros(size, dtype=np.float32)
+        self._generations = np.zeros(size, dtype=np.uint8)
+
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0 # stores that evicted an entry for a different position
+        self.rejections = 0 # stores that were dropped to keep a more valuable entry
+
+    @property
+    def capacity(self) -> int:
+        '''
+            Returns
+            -------
+            The number of entries this table can hold.
+        '''
+        return self.num_buckets * self.ways
+
+    @property
+    def size_bytes(self) -> int:
+        return self.capacity * ENTRY_SIZE
+
+    @property
+    def probes(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes > 0 else 0.0
+
+    def fill_ratio(self) -> float:
+        '''
+            Returns
+            -------
+            The fraction of slots that hold an entry.
+        '''
+        return np.count_nonzero(self._bounds) / self.capacity
+
+    def _bucket(self, key: int) -> int:
+        return (key % self.num_buckets) * self.ways
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        '''
+            Looks up the entry for the position hash `key`, counting a hit or a miss.
+
+            Returns
+            -------
+            The TTEntry stored for `key`, or None if there is none.
+        '''
+        key &= KEY_MASK
+        index = self._bucket(key)
+
+        for slot in range(index, index + self.ways):
+            if self._bounds[slot] != 0 and self._keys[slot] == key:
+                self.hits += 1
+                return TTEntry(key, int(self._depths[slot]), _BOUNDS[int(self._bounds[slot])], int(self._moves[slot]), float(self._values[slot]))
+
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, bound: Bound, move: int, value: float) -> bool:
+        '''
+            Stores a search result for the position hash `key`, subject to the replacement policy.
+
+            Parameters
+            ----------
+            key :: int : the position hash, e.g. `board.zobrist`
+
+            depth :: int : the remaining search depth `value` was computed with
+
+            bound :: Bound : whether `value` is exact, a lower bound or an upper bound
+
+            move :: int : the index of the best move in the 1225-wide action space, or -1 if unknown
+
+            value :: float : the value of the position from the perspective of the side to move
+
+            Returns
+            -------
+            True if the entry was written, False if the policy kept the existing entry instead.
+        '''
+        key &= KEY_MASK
+        index = self._bucket(key)
+
+        if self.policy == ReplacementPolicy.ALWAYS_REPLACE:
+            slot = index
+        elif self.policy == ReplacementPolicy.DEPTH_PREFERRED:
+            slot = index if self._replaceable(index, key, depth) else None
+        else:
+            # an entry for the same position is always updated in place
+            if self._bounds[index + 1] != 0 and self._keys[index + 1] == key:
+                slot = index + 1
+            else:
+                slot = index if self._replaceable(index, key, depth) else index + 1
+
+        if slot is None:
+            self.rejections += 1
+            return False
+
+        if self._bounds[slot] != 0 and self._keys[slot] != key:
+            self.overwrites += 1
+
+        # keep the best move we already know if the new search did not produce one
+        if move == NO_MOVE and self._bounds[slot] != 0 and self._keys[slot] == key:
+            move = int(self._moves[slot])
+
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._bounds[slot] = bound.value
+        self._moves[slot] = move
+        self._values[slot] = value
+        self._generations[slot] = self.generation
+
+        self.stores += 1
+        return True
+
+    def _replaceable(self, slot: int, key: int, depth: int) -> bool:
+        '''
+            Depth-preferred replacement: a slot may be overwritten if it is empty, holds the same position,
+            holds a shallower search, or was written during an earlier search.
+        '''
+        return (
+            self._bounds[slot] == 0 or
+            self._keys[slot] == key or
+            depth >= self._depths[slot] or
+            self._generations[slot] != self.generation
+        )
+
+    def new_search(self) -> None:
+        '''
+            Marks the start of a new search, so that depth-preferred slots filled by earlier searches
+            become replaceable.
+        '''
+        self.generation = (self.generation + 1) % 256
+
+    def clear(self) -> None:
+        '''
+            Removes all entries and resets the counters.
+        '''
+        self._bounds[:] = 0
+        self._moves[:] = NO_MOVE
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+        self.rejections = 0
+
+    def stats(self) -> dict:
+        '''
+            Returns
+            -------
+            dict of the table's counters, for sizing the table to a workload.
+        '''
+        return {
+            'capacity': self.capacity,
+            'size_bytes': self.size_bytes,
+            'fill_ratio': self.fill_ratio(),
+            'probes': self.probes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'rejections': self.rejections
+        }
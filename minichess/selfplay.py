@@ -0,0 +1,347 @@
+from minichess.games.abstract.board import AbstractBoardStatus
+from minichess.games.gardner.action import LEN_ACTION_SPACE
+from minichess.vector_env import VARIANTS, game_status, outcome
+
+from multiprocessing import shared_memory
+from typing import Callable, List, NamedTuple, Union
+
+import multiprocessing as mp
+import numpy as np
+import random
+import time
+
+class Trajectories(NamedTuple):
+    '''
+        A batch of self-play records, one per move.
+
+        states :: np.array : shape (N, 5, 5, 12) uint8 `canonical_state_vector`s before each move
+
+        masks :: np.array : shape (N, 1225) uint8 legal action masks of those states
+
+        actions :: np.array : shape (N,) int16 indices of the actions played
+
+        outcomes :: np.array : shape (N,) int8 game results for the player to move: 1 win, -1 loss, 0 draw
+    '''
+    states: np.array
+    masks: np.array
+    actions: np.array
+    outcomes: np.array
+
+# (name, dtype, shape of one record) of every field of a TrajectoryBuffer
+_FIELDS = (
+    ('states', np.uint8, (5, 5, 12)),
+    ('masks', np.uint8, (LEN_ACTION_SPACE,)),
+    ('actions', np.int16, ()),
+    ('outcomes', np.int8, ())
+)
+
+# header: records written, games finished
+_HEADER = np.dtype(np.int64).itemsize * 2
+
+def _record_size() -> int:
+    return sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in _FIELDS)
+
+class TrajectoryBuffer:
+    '''
+        A single-producer ring buffer of self-play records in `multiprocessing.shared_memory`.
+
+        A worker appends whole games with `write`, and the parent reads them back with `read` without
+        any records being pickled. Once the buffer is full the oldest records are overwritten.
+
+        Parameters
+        ----------
+        capacity :: int : the number of records the buffer holds
+
+        name :: str : the name of an existing buffer to attach to, or None to create a new one
+    '''
+
+    def __init__(self, capacity: int, name: str = None) -> None:
+        self.capacity = capacity
+
+        size = _HEADER + capacity * _record_size()
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf)
+
+        if name is None: self._header[:] = 0
+
+        offset = _HEADER
+        self._fields = {}
+
+        for field, dtype, shape in _FIELDS:
+            array = np.ndarray((capacity,) + shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            self._fields[field] = array
+            offset += array.nbytes
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def written(self) -> int:
+        '''
+            The number of records written since the buffer was created.
+        '''
+        return int(self._header[0])
+
+    @property
+    def games(self) -> int:
+        '''
+            The number of games written since the buffer was created.
+        '''
+        return int(self._header[1])
+
+    def write(self, trajectories: Trajectories) -> None:
+        '''
+            Appends the records of one game. They become visible to readers all at once.
+        '''
+        count = len(trajectories.actions)
+        start = self.written
+
+        indices = np.arange(start, start + count) % self.capacity
+
+        for field, values in zip(Trajectories._fields, trajectories):
+            self._fields[field][indices] = values
+
+        # publish only after the records are in place
+        self._header[0] = start + count
+        self._header[1] += 1
+
+    def read(self, position: int):
+        '''
+            Reads the records written since `position`.
+
+            Returns
+            -------
+            tuple of (Trajectories, int, int): the records, the position to read from next time, and the
+            number of records since `position` that were overwritten before they could be read.
+        '''
+        end = self.written
+        start = max(position, end - self.capacity)
+
+        indices = np.arange(start, end) % self.capacity
+        records = [self._fields[field][indices] for field in Trajectories._fields]
+
+        # anything the writer lapped while we were copying is not trustworthy
+        valid = max(start, self.written - self.capacity) - start
+        records = Trajectories(*[values[valid:] for values in records])
+
+        return records, end, (start - position) + valid
+
+    def close(self) -> None:
+        self._header = None
+        self._fields = None
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+def worker_seed(seed: int, worker_id: int, generation: int) -> int:
+    '''
+        Returns
+        -------
+        The seed of worker `worker_id` after `generation` restarts, derived only from these arguments.
+    '''
+    return int(np.random.SeedSequence(seed, spawn_key=(worker_id, generation)).generate_state(1)[0])
+
+def play_game(board, player, max_moves: int) -> Trajectories:
+    '''
+        Plays one game on `board` with `player` making every move.
+
+        Returns
+        -------
+        Trajectories with one record per move played.
+    '''
+    states, masks, actions, movers = [], [], [], []
+
+    status = game_status(board)
+
+    while status == AbstractBoardStatus.ONGOING and len(actions) < max_moves:
+        mask = board.legal_action_mask(out=np.zeros(LEN_ACTION_SPACE, dtype=np.uint8))
+
+        found, action = player.propose_action(board, board.active_color, mask)
+
+        if not found: break
+
+        states.append(board.canonical_state_vector(dtype=np.uint8))
+        masks.append(mask)
+        actions.append(action.index())
+        movers.append(board.active_color)
+
+        board.push(action, check_for_check=False)
+
+        status = game_status(board)
+
+    return Trajectories(
+        np.array(states, dtype=np.uint8).reshape(-1, 5, 5, 12),
+        np.array(masks, dtype=np.uint8).reshape(-1, LEN_ACTION_SPACE),
+        np.array(actions, dtype=np.int16),
+        np.array([outcome(status, mover) for mover in movers], dtype=np.int8)
+    )
+
+def _worker_main(worker_id: int, generation: int, buffer_name: str, capacity: int, player_factory: Callable,
+                 variant: Union[str, type], seed: int, max_moves: int, games: int, stop) -> None:
+    buffer = TrajectoryBuffer(capacity, buffer_name)
+
+    try:
+        worker = worker_seed(seed, worker_id, generation)
+        random.seed(worker)
+        np.random.seed(worker % 2 ** 32)
+
+        board_type = VARIANTS[variant] if type(variant) == str else variant
+        player = player_factory()
+
+        played = 0
+
+        while not stop.is_set() and (games is None or played < games):
+            buffer.write(play_game(board_type(), player, max_moves))
+            played += 1
+    finally:
+        buffer.close()
+
+class SelfPlayPool:
+    '''
+        Runs self-play games in `num_workers` processes, each writing its games to its own
+        `TrajectoryBuffer`.
+
+        Workers are seeded from `seed`, their index and the number of times they were restarted, so a
+        run is reproducible per worker. A worker that crashes loses the game it was playing and is
+        restarted with a fresh seed, up to `max_restarts` times.
+
+        Parameters
+        ----------
+        num_workers :: int : the number of worker processes, all cores if None
+
+        player_factory :: Callable : picklable function returning the `Player` a worker plays both sides with
+
+        variant :: str or type : one of the keys of `minichess.vector_env.VARIANTS`, or a board class
+
+        capacity :: int : the number of records each worker's buffer holds
+
+        seed :: int : the root seed of all workers
+
+        max_moves :: int : games are ended as a draw after this many moves
+
+        games_per_worker :: int : if given, each worker stops after this many games
+
+        max_restarts :: int : how often each worker may be restarted after crashing
+    '''
+
+    def __init__(self, num_workers: int = None, player_factory: Callable = None, variant: Union[str, type] = 'gardner', capacity: int = 4096,
+                 seed: int = 0, max_moves: int = 200, games_per_worker: int = None, max_restarts: int = 3) -> None:
+        self.num_workers = num_workers if num_workers is not None else mp.cpu_count()
+        self.player_factory = player_factory
+        self.variant = variant
+        self.capacity = capacity
+        self.seed = seed
+        self.max_moves = max_moves
+        self.games_per_worker = games_per_worker
+        self.max_restarts = max_restarts
+
+        self.buffers: List[TrajectoryBuffer] = []
+        self.processes = []
+        self.restarts = [0] * self.num_workers
+        self.dropped = 0
+
+        self._positions = [0] * self.num_workers
+        self._stop = mp.Event()
+
+    def start(self) -> 'SelfPlayPool':
+        self.buffers = [TrajectoryBuffer(self.capacity) for _ in range(self.num_workers)]
+        self.processes = [self._spawn(worker_id) for worker_id in range(self.num_workers)]
+
+        return self
+
+    def _spawn(self, worker_id: int):
+        buffer = self.buffers[worker_id]
+
+        # a restarted worker only plays what is left of its quota
+        games = None
+        if self.games_per_worker is not None:
+            games = self.games_per_worker - buffer.games
+
+        process = mp.Process(
+            target=_worker_main,
+            args=(worker_id, self.restarts[worker_id], buffer.name, self.capacity, self.player_factory,
+                  self.variant, self.seed, self.max_moves, games, self._stop),
+            daemon=True
+        )
+        process.start()
+
+        return process
+
+    def poll(self) -> None:
+        '''
+            Restarts crashed workers.
+
+            Raises
+            ------
+            RuntimeError if a worker crashed more than `max_restarts` times.
+        '''
+        for worker_id, process in enumerate(self.processes):
+            if process.is_alive() or process.exitcode == 0: continue
+
+            if self.restarts[worker_id] >= self.max_restarts:
+                raise RuntimeError('Self-play worker {} crashed {} times, last exit code {}'.format(worker_id, self.restarts[worker_id] + 1, process.exitcode))
+
+            self.restarts[worker_id] += 1
+            self.processes[worker_id] = self._spawn(worker_id)
+
+    @property
+    def running(self) -> bool:
+        return any(process.is_alive() for process in self.processes)
+
+    def collect(self) -> Trajectories:
+        '''
+            Checks on the workers and gathers every record written since the last `collect`.
+
+            Returns
+            -------
+            Trajectories of all workers, ordered by worker.
+        '''
+        self.poll()
+
+        batches = []
+
+        for worker_id, buffer in enumerate(self.buffers):
+            records, self._positions[worker_id], dropped = buffer.read(self._positions[worker_id])
+            self.dropped += dropped
+            batches.append(records)
+
+        return Trajectories(*[np.concatenate(values) for values in zip(*batches)])
+
+    def join(self, poll_interval: float = 0.05) -> None:
+        '''
+            Waits for workers with a game quota to finish, restarting any that crash.
+        '''
+        while True:
+            self.poll()
+            if not self.running: return
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        '''
+            Stops the workers and frees the shared memory.
+        '''
+        self._stop.set()
+
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive(): process.terminate()
+
+        for buffer in self.buffers:
+            buffer.close()
+            buffer.unlink()
+
+        self.processes = []
+        self.buffers = []
+
+    def __enter__(self) -> 'SelfPlayPool':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,173 @@
+from minichess.games.abstract.board import AbstractBoardStatus
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action import LEN_ACTION_SPACE
+from minichess.games.gardner.bitboard import NUM_SQUARES, KING
+from minichess.games.gardner.board import legal_action_masks, state_vectors
+from minichess.games.gardner.move import MOVES
+from minichess.games.gardner.packed import PackedGardnerChessBoard
+from minichess.games.rifle.board import PackedRifleChessBoard
+from minichess.games.atomic.board import PackedAtomicChessBoard
+from minichess.games.dark.board import PackedDarkChessBoard
+
+from typing import Tuple, Union
+
+import numpy as np
+
+VARIANTS = {
+    'gardner': PackedGardnerChessBoard,
+    'rifle': PackedRifleChessBoard,
+    'atomic': PackedAtomicChessBoard,
+    'dark': PackedDarkChessBoard
+}
+
+class VectorEnv:
+    '''
+        Runs `num_envs` games of one Gardner-family variant in lockstep.
+
+        Every game is a packed board (see `minichess.games.gardner.packed`). Observations, legal action
+        masks, rewards, done flags and the positions of all games live in preallocated NumPy arrays,
+        which `step` fills in batched passes: one `state_vectors` encode and one `legal_action_masks`
+        scatter for all games. Only applying the moves runs per game.
+
+        The arrays returned by `reset` and `step` are the environment's own buffers and are overwritten
+        by the next call; copy them to keep them.
+
+        Parameters
+        ----------
+        num_envs :: int : the number of games
+
+        variant :: str or type : one of the keys of `VARIANTS`, or a board class
+
+        max_moves :: int : games are ended as a draw after this many moves
+
+        dtype :: np.dtype : dtype of the observation and mask arrays
+    '''
+
+    def __init__(self, num_envs: int, variant: Union[str, type] = 'gardner', max_moves: int = 200, dtype=np.float32) -> None:
+        self.num_envs = num_envs
+        self.board_type = VARIANTS[variant] if type(variant) == str else variant
+        self.max_moves = max_moves
+
+        self._start = self.board_type()
+        self.boards = [self._start.copy() for _ in range(num_envs)]
+
+        # canonical_state_vector and legal_action_mask of every game
+        self.observations = np.zeros((num_envs, 5, 5, 12), dtype=dtype)
+        self.masks = np.zeros((num_envs, LEN_ACTION_SPACE), dtype=dtype)
+
+        # rewards for the player who made the last move: 1 for a win, -1 for a loss, 0 otherwise
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+        # `to_bytes()` of every game, and the AbstractBoardStatus value of games that ended on the last step
+        self.positions = np.zeros((num_envs, NUM_SQUARES + 1), dtype=np.uint8)
+        self.statuses = np.zeros(num_envs, dtype=np.int8)
+        self.move_counts = np.zeros(num_envs, dtype=np.int32)
+
+        self._rows = np.arange(num_envs)
+
+    def reset(self) -> Tuple[np.array, np.array]:
+        '''
+            Starts a new game in every environment.
+
+            Returns
+            -------
+            tuple of the (num_envs, 5, 5, 12) observations and (num_envs, 1225) legal action masks.
+        '''
+        for i in range(self.num_envs):
+            self._reset_game(i)
+
+        self.rewards[:] = 0
+        self.dones[:] = False
+        self.statuses[:] = AbstractBoardStatus.ONGOING.value
+
+        self._observe()
+
+        return self.observations, self.masks
+
+    def step(self, actions: np.array) -> Tuple[np.array, np.array, np.array, np.array]:
+        '''
+            Plays one action in every game. Games that end are reset, and their observation and mask are
+            those of the new game.
+
+            Parameters
+            ----------
+            actions :: np.array : shape (num_envs,) action indices, each legal in the current `masks`
+
+            Returns
+            -------
+            tuple of the observations, legal action masks, rewards and done flags.
+        '''
+        actions = np.asarray(actions)
+
+        assert actions.shape == (self.num_envs,), 'Expected one action per game, got shape {}'.format(actions.shape)
+
+        illegal = np.flatnonzero(self.masks[self._rows, actions] == 0)
+        if len(illegal) > 0:
+            raise ValueError('Illegal actions {} in games {}'.format(actions[illegal].tolist(), illegal.tolist()))
+
+        for i, board in enumerate(self.boards):
+            mover = board.active_color
+
+            board.push_move(MOVES[mover.value][actions[i]], check_for_check=False)
+            self.move_counts[i] += 1
+
+            status = game_status(board)
+
+            if status == AbstractBoardStatus.ONGOING and self.move_counts[i] >= self.max_moves:
+                status = AbstractBoardStatus.DRAW
+
+            self.statuses[i] = status.value
+            self.dones[i] = status != AbstractBoardStatus.ONGOING
+            self.rewards[i] = outcome(status, mover)
+
+            if self.dones[i]:
+                self._reset_game(i)
+
+        self._observe()
+
+        return self.observations, self.masks, self.rewards, self.dones
+
+    def _reset_game(self, i: int):
+        self.boards[i] = self._start.copy()
+        self.move_counts[i] = 0
+
+    def _observe(self):
+        state_vectors(self.boards, out=self.observations, canonical=True)
+        legal_action_masks(self.boards, out=self.masks)
+
+        for i, board in enumerate(self.boards):
+            self.positions[i] = np.frombuffer(board.to_bytes(), dtype=np.uint8)
+
+def game_status(board) -> AbstractBoardStatus:
+    '''
+        Returns
+        -------
+        `board.status`, except that a side without a king has lost and a side without legal actions
+        cannot continue the game, which variants such as Atomic reach without a checkmate.
+    '''
+    pieces = board.bitboards.pieces
+
+    if not pieces[PieceColor.WHITE.value][KING]:
+        return AbstractBoardStatus.BLACK_WIN if pieces[PieceColor.BLACK.value][KING] else AbstractBoardStatus.DRAW
+    if not pieces[PieceColor.BLACK.value][KING]:
+        return AbstractBoardStatus.WHITE_WIN
+
+    status = board.status
+
+    if status == AbstractBoardStatus.ONGOING and not board.has_legal_action():
+        return AbstractBoardStatus.DRAW
+
+    return status
+
+def outcome(status: AbstractBoardStatus, color: PieceColor) -> int:
+    '''
+        Returns
+        -------
+        1 if `status` is a win for `color`, -1 if it is a loss, 0 otherwise.
+    '''
+    if status == AbstractBoardStatus.WHITE_WIN:
+        return 1 if color == PieceColor.WHITE else -1
+    if status == AbstractBoardStatus.BLACK_WIN:
+        return 1 if color == PieceColor.BLACK else -1
+    return 0
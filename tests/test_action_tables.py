@@ -0,0 +1,66 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action import GardnerChessAction
+from minichess.games.gardner.action_reference import ACTION_TO_ID, ID_TO_ACTION
+from minichess.games.gardner.action_tables import DECODE, ENCODE, NO_PROMOTION, UNDERPROMOTIONS, decode_index, decode_indices, encode_move, encode_moves
+from minichess.games.gardner.bitboard import square
+from tests.test_bitboard import random_board
+import unittest
+
+import numpy as np
+import random
+
+class TestActionTables(unittest.TestCase):
+    def test_reference(self):
+        for color in [PieceColor.WHITE, PieceColor.BLACK]:
+            modifier = (-1, 1) if color == PieceColor.WHITE else (1, -1)
+
+            for index, (from_pos, delta) in ID_TO_ACTION.items():
+                promotion = NO_PROMOTION
+
+                if type(delta[1]) == str:
+                    delta, promotion = delta[0], UNDERPROMOTIONS[delta[1]]
+
+                to_pos = (from_pos[0] + modifier[0] * delta[0], from_pos[1] + modifier[1] * delta[1])
+
+                if not (0 <= to_pos[0] < 5 and 0 <= to_pos[1] < 5):
+                    assert decode_index(color.value, index) == (-1, -1, -1), 'Expected index {} to name no move for {}'.format(index, color)
+                    continue
+
+                assert decode_index(color.value, index) == (square(from_pos), square(to_pos), promotion), 'Expected index {} to decode like the reference.'.format(index)
+                assert encode_move(color.value, square(from_pos), square(to_pos), promotion) == index, 'Expected index {} to encode like the reference.'.format(index)
+
+        assert np.count_nonzero(ENCODE >= 0) == np.count_nonzero(DECODE[..., 0] >= 0), 'Expected the tables to be inverses.'
+
+    def test_batch(self):
+        rng = np.random.default_rng(0)
+
+        colors = rng.integers(0, 2, 500)
+        indices = rng.integers(0, len(ACTION_TO_ID), 500)
+
+        from_sqs, to_sqs, promotions = decode_indices(colors, indices)
+        valid = from_sqs >= 0
+
+        assert np.array_equal(encode_moves(colors[valid], from_sqs[valid], to_sqs[valid], promotions[valid]), indices[valid]), 'Expected batched lookups to round trip.'
+        assert all(decode_index(c, i) == (f, t, p) for c, i, f, t, p in zip(colors, indices, from_sqs, to_sqs, promotions)), 'Expected batched and scalar lookups to agree.'
+
+    def test_actions(self):
+        rng = random.Random(0)
+
+        for _ in range(100):
+            board = random_board(rng)
+
+            for action in board.legal_actions():
+                decoded = GardnerChessAction.decode(action.index(), board)
+                one_hot = GardnerChessAction.decode(action.encode(), board)
+
+                for other in [decoded, one_hot]:
+                    assert (other.agent, other.from_pos, other.to_pos, other.captured_piece, other.index()) == \
+                        (action.agent, action.from_pos, action.to_pos, action.captured_piece, action.index()), 'Expected {} to decode to itself.'.format(action)
+
+        with self.assertRaises(KeyError):
+            board = random_board(rng)
+            piece = [tile.peek() for tile in board if tile.peek() is not None][0]
+            GardnerChessAction(piece, (0, 0), (0, 0)).index()
+
+if __name__ == "__main__":
+    unittest.main()
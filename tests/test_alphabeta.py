@@ -0,0 +1,70 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.pieces import Pawn, Rook, King
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.rifle.board import RifleChessBoard
+from minichess.games.atomic.board import AtomicChessBoard
+from minichess.games.dark.board import DarkChessBoard
+from minichess.players.alphabeta import AlphaBetaPlayer, MATE_SCORE
+import unittest
+
+class TestAlphaBeta(unittest.TestCase):
+    def test_mate_in_one(self):
+        g = GardnerChessBoard()
+        g.wipe_board()
+
+        g.get((0, 0)).push(King(PieceColor.BLACK, (-1, -1), 10000))
+        g.get((1, 0)).push(Pawn(PieceColor.BLACK, (-1, -1), 100))
+        g.get((1, 1)).push(Pawn(PieceColor.BLACK, (-1, -1), 100))
+        g.get((4, 2)).push(King(PieceColor.WHITE, (-1, -1), 10000))
+        g.get((4, 4)).push(Rook(PieceColor.WHITE, (-1, -1), 563))
+
+        result = AlphaBetaPlayer(max_depth=3).search(g)
+
+        assert (result.action.from_pos, result.action.to_pos) == ((4, 4), (0, 4)), 'Expected rook to deliver mate, got {}'.format(result.action)
+        assert result.score >= MATE_SCORE - 3, 'Expected a mate score, got {}'.format(result.score)
+
+    def test_mate_score_transposition(self):
+        g = GardnerChessBoard()
+        g.wipe_board()
+
+        g.get((4, 0)).push(King(PieceColor.BLACK, (-1, -1), 10000))
+        g.get((3, 3)).push(King(PieceColor.WHITE, (-1, -1), 10000))
+        g.get((3, 2)).push(Rook(PieceColor.WHITE, (-1, -1), 563))
+        g.get((3, 4)).push(Rook(PieceColor.WHITE, (-1, -1), 563))
+        g.active_color = PieceColor.BLACK
+
+        player = AlphaBetaPlayer(max_depth=3)
+
+        # black's only move leads to a mate in one, which is searched first from the root
+        g.push(g.legal_actions()[0])
+        mate = player.search(g)
+        g.pop()
+
+        assert mate.score == MATE_SCORE - 1, 'Expected a mate in one, got {}'.format(mate.score)
+
+        # the same mating position is now found in the table one ply from the root
+        result = player.search(g)
+
+        assert result.score == -MATE_SCORE + 2, 'Expected the mate to be two plies away, got {}'.format(result.score)
+
+    def test_budget(self):
+        g = GardnerChessBoard()
+        key = g.zobrist
+
+        result = AlphaBetaPlayer(max_depth=20, node_limit=500).search(g)
+
+        assert result.action is not None, 'Expected a move even when the budget runs out.'
+        assert result.nodes <= 500, 'Expected search to stop at its node budget, but visited {} nodes.'.format(result.nodes)
+        assert g.zobrist == key and len(g.move_history) == 0, 'Expected an aborted search to restore the board.'
+
+    def test_variants(self):
+        for board_type in [GardnerChessBoard, RifleChessBoard, AtomicChessBoard, DarkChessBoard]:
+            g = board_type()
+
+            found, action = AlphaBetaPlayer(max_depth=2, node_limit=200).propose_action(g, g.active_color, g.legal_action_mask())
+
+            assert found and action in g.legal_actions(), 'Expected a legal action for {}, got {}'.format(board_type.__name__, action)
+            assert len(g.move_history) == 0, 'Expected search to leave the {} board unchanged.'.format(board_type.__name__)
+
+if __name__ == "__main__":
+    unittest.main()
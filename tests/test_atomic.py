@@ -47,6 +47,54 @@ class TestAtomic(TestGardner):
         assert not self.g.is_empty(), 'Expected nonempty graph but got g.isempty == True'
         assert self.g.get((2,2)).peek() == self.g.get((3,3)).peek() == None, 'Expected capturing and captured piece to be removed from board.'
 
+    def test_explosion_zobrist(self) -> None:
+        self.g.wipe_board()
+
+        for i in range(1, 4):
+            for j in range(1,4):
+                self.g.get((i,j)).push(Rook(PieceColor.BLACK, (i,j), 100))
+
+        self.g.get((3,3)).push(Pawn(PieceColor.WHITE, (3,3), 100))
+
+        initial_key = self.g.zobrist
+
+        self.g.push(AtomicChessAction(self.g.get((3,3)).peek(), (3,3), (2,2), self.g.get((2,2)).peek(), modifier_flags=[AbstractActionFlags.CAPTURE]))
+
+        assert self.g.bitboards.zobrist == 0, 'Expected Zobrist placement key of an empty board to be 0.'
+
+        self.g.pop()
+
+        assert self.g.zobrist == initial_key, 'Expected Zobrist key to be restored after undoing an explosion.'
+
+    def test_explosion_undo(self) -> None:
+        self.g.wipe_board()
+
+        for i in range(1, 4):
+            for j in range(1,4):
+                self.g.get((i,j)).push(Rook(PieceColor.BLACK, (i,j), 100))
+
+        self.g.get((3,3)).push(Pawn(PieceColor.WHITE, (3,3), 100))
+        self.g.get((2,1)).push(Pawn(PieceColor.BLACK, (2,1), 100))
+
+        before = str(self.g)
+
+        self.g.push(AtomicChessAction(self.g.get((3,3)).peek(), (3,3), (2,2), self.g.get((2,2)).peek(), modifier_flags=[AbstractActionFlags.CAPTURE]))
+
+        hit, pieces = self.g.extra_capture_stack[-1]
+
+        assert bin(hit).count('1') == len(pieces) == 6, 'Expected the 6 surrounding rooks in the undo record, got {} pieces.'.format(len(pieces))
+        assert sorted(pos for _, pos in self.g.peek_extra_capture()) == [(1, 1), (1, 2), (1, 3), (2, 3), (3, 1), (3, 2)], 'Expected every surrounding non-pawn square to be recorded.'
+        assert type(self.g.get((2,1)).peek()) == Pawn, 'Expected the pawn next to the explosion to survive.'
+
+        copied = self.g.copy()
+        copied.pop()
+
+        assert str(copied) == before, 'Expected a copy to undo the explosion. Got:\n{}'.format(copied)
+
+        self.g.pop()
+
+        assert str(self.g) == before, 'Expected pop to restore the exploded pieces. Got:\n{}'.format(self.g)
+
     def test_check(self) -> None:
         '''
         ⭘ ⭘ ♜ ♛ ♚
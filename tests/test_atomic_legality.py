@@ -0,0 +1,81 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.atomic.pieces import Pawn, Rook, King
+from minichess.games.atomic.board import AtomicChessBoard
+from minichess.games.atomic.bitboard import BLAST_MASKS, threatens_king
+from minichess.games.gardner.bitboard import WHITE, BLACK, BB_SQUARES, square
+from tests.test_bitboard import action_set, random_board
+import unittest
+
+import random
+
+def reference_threatens_king(board, color):
+    '''
+        Whether `color` can take or explode a king, by simulating each of its moves.
+    '''
+    for action in board._visitor_actions_for_color(color, filter_for_check=False):
+        board.push(action, check_for_check=False)
+        hits_king = type(action.captured_piece) == King or King in [type(piece) for piece, _ in board.peek_extra_capture()]
+        board.pop()
+
+        if hits_king: return True
+
+    return False
+
+class TestAtomicLegality(unittest.TestCase):
+    '''
+        Conformance suite comparing the blast-mask legality of `minichess.games.atomic.bitboard` with
+        the original implementation, which simulates every candidate and reply with push/pop.
+    '''
+    def setUp(self):
+        self.g = AtomicChessBoard()
+
+    def test_blast_masks(self):
+        assert BLAST_MASKS[square((0, 0))] == sum(BB_SQUARES[square(pos)] for pos in [(0, 0), (0, 1), (1, 0), (1, 1)]), 'Expected a corner blast to cover 4 squares.'
+        assert all(bin(BLAST_MASKS[square((row, col))]).count('1') == 9 for row in range(1, 4) for col in range(1, 4)), 'Expected an inner blast to cover 9 squares.'
+
+    def test_adjacent_kings(self):
+        self.g.wipe_board()
+
+        self.g.get((2, 2)).push(King(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((1, 2)).push(King(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((4, 2)).push(Rook(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((4, 0)).push(Pawn(PieceColor.WHITE, (-1, -1), 1))
+
+        assert not threatens_king(self.g.bitboards, BLACK), 'Expected the rook to be unable to take a king standing next to its own king.'
+
+        king_moves = set(action.to_pos for action in self.g.legal_actions_for_color(PieceColor.WHITE) if action.from_pos == (2, 2))
+
+        assert (3, 2) not in king_moves and (2, 1) in king_moves, 'Expected the king to stay clear of the rook only where it leaves the black king, got {}'.format(king_moves)
+
+    def test_conformance_random_positions(self):
+        rng = random.Random(0)
+
+        for _ in range(500):
+            board = random_board(rng, AtomicChessBoard)
+
+            for color in [PieceColor.WHITE, PieceColor.BLACK]:
+                for filter_for_check in [False, True]:
+                    fast = action_set(board.legal_actions_for_color(color, filter_for_check))
+                    reference = action_set(board._visitor_actions_for_color(color, filter_for_check))
+
+                    assert fast == reference, 'Blast-mask and push/pop legality disagree for {} (filter_for_check={}) on board:\n{}'.format(color, filter_for_check, board)
+
+                assert threatens_king(board.bitboards, color.value) == reference_threatens_king(board, color), 'Blast-mask and push/pop king threats disagree for {} on board:\n{}'.format(color, board)
+
+    def test_conformance_random_games(self):
+        rng = random.Random(1)
+
+        for _ in range(10):
+            board = AtomicChessBoard()
+
+            for _ in range(40):
+                actions = board.legal_actions()
+
+                assert action_set(actions) == action_set(board._visitor_actions_for_color(board.active_color)), 'Blast-mask and push/pop legality disagree on board:\n{}'.format(board)
+
+                if len(actions) == 0: break
+
+                board.push(rng.choice(actions), check_for_check=False)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from minichess.games.gardner.bitboard import KNIGHT_ATTACKS, ROOK_TABLES, ROOK_MASKS, PIECE_INDEX, WHITE, BLACK, square, squares
+from minichess.games.gardner.board import GardnerChessBoard
+import unittest
+
+import random
+
+PIECE_TYPES = [Pawn, Knight, Bishop, Rook, Queen]
+
+def action_set(actions):
+    return sorted((action.from_pos, action.to_pos, tuple(flag.value for flag in action.modifier_flags)) for action in actions)
+
+def random_board(rng, board_type=GardnerChessBoard):
+    '''
+        Returns a board with one king per color and a random set of other pieces.
+    '''
+    board = board_type()
+    board.wipe_board()
+
+    occupied = rng.sample(range(25), rng.randint(4, 16))
+
+    board.get(divmod(occupied[0], 5)).push(King(PieceColor.WHITE, (-1, -1), 1))
+    board.get(divmod(occupied[1], 5)).push(King(PieceColor.BLACK, (-1, -1), 1))
+
+    for sq in occupied[2:]:
+        piece_type = rng.choice(PIECE_TYPES)
+        if piece_type == Pawn and sq // 5 in [0, 4]: continue
+
+        board.get(divmod(sq, 5)).push(piece_type(rng.choice([PieceColor.WHITE, PieceColor.BLACK]), (-1, -1), 1))
+
+    board.active_color = rng.choice([PieceColor.WHITE, PieceColor.BLACK])
+
+    return board
+
+class TestBitboard(unittest.TestCase):
+    def setUp(self):
+        self.g = GardnerChessBoard()
+
+    def test_tables(self):
+        assert len(squares(KNIGHT_ATTACKS[square((2, 2))])) == 8, 'Expected a centered knight to attack 8 squares.'
+        assert len(squares(KNIGHT_ATTACKS[square((0, 0))])) == 2, 'Expected a cornered knight to attack 2 squares.'
+        assert len(squares(ROOK_TABLES[12][0])) == 8, 'Expected a centered rook on an empty board to attack 8 squares.'
+        assert len(ROOK_TABLES[12]) == 2 ** len(squares(ROOK_MASKS[12])), 'Expected a rook table entry for every blocker configuration.'
+
+    def test_tiles_mirror_bitboards(self):
+        bitboards = self.g.bitboards
+
+        assert len(squares(bitboards.colors[WHITE])) == len(squares(bitboards.colors[BLACK])) == 10, 'Expected 10 pieces per side in the starting position.'
+
+        piece = self.g.get((4, 1)).pop()
+
+        assert not bitboards.pieces[WHITE][PIECE_INDEX[Knight]], 'Expected white knight bitboard to be empty after removing the knight.'
+
+        self.g.get((2, 2)).push(piece)
+
+        assert bitboards.pieces[WHITE][PIECE_INDEX[Knight]] == 1 << square((2, 2)), 'Expected white knight bitboard to follow the knight.'
+
+        self.g.wipe_board()
+
+        assert bitboards.occupied == 0, 'Expected empty bitboards after wiping the board.'
+
+    def test_knight_short_hop(self):
+        self.g.wipe_board()
+
+        self.g.get((1, 0)).push(Knight(PieceColor.WHITE, (-1, -1), 1))
+
+        destinations = set(action.to_pos for action in self.g.legal_actions_for_color(PieceColor.WHITE))
+
+        assert destinations == {(0, 2), (2, 2), (3, 1)}, 'Expected knight on (1, 0) to reach (0, 2), (2, 2) and (3, 1), got {}'.format(destinations)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.pieces import Rook, King
+from minichess.games.gardner.bitboard import BB_SQUARES, square
+from minichess.games.dark.board import DarkChessBoard, PackedDarkChessBoard, OBSERVATION_PLANES, observations, visibility_masks
+from tests.test_bitboard import random_board
+import unittest
+
+import numpy as np
+import random
+
+def reference_visibility(board, color):
+    '''
+        The squares `color` sees, from its pieces and its legal actions.
+    '''
+    visible = board.bitboards.colors[color.value]
+
+    for action in board.legal_actions_for_color(color):
+        visible |= BB_SQUARES[square(action.to_pos)]
+
+    return visible
+
+class TestDark(unittest.TestCase):
+    def setUp(self):
+        self.g = DarkChessBoard()
+
+    def test_visibility_random_positions(self):
+        rng = random.Random(0)
+
+        for _ in range(500):
+            board = random_board(rng, DarkChessBoard)
+
+            for color in [PieceColor.WHITE, PieceColor.BLACK]:
+                assert board.visibility_bitboard(color) == reference_visibility(board, color), 'Expected the visibility of {} to be its pieces and legal targets on board:\n{}'.format(color, board.no_fog_board())
+
+    def test_visibility_push_pop(self):
+        rng = random.Random(1)
+
+        for board_type in [DarkChessBoard, PackedDarkChessBoard]:
+            board = board_type()
+            seen = []
+
+            for _ in range(30):
+                actions = board.legal_actions()
+                if len(actions) == 0: break
+
+                seen.append((board.visibility_bitboard(PieceColor.WHITE), board.visibility_bitboard(PieceColor.BLACK)))
+
+                board.push(rng.choice(actions))
+
+                for color in [PieceColor.WHITE, PieceColor.BLACK]:
+                    assert board.visibility_bitboard(color) == reference_visibility(board, color), 'Expected visibility to follow push on board:\n{}'.format(board.no_fog_board())
+
+            assert len(board.visibility_stack) == len(board.move_history) + 1, 'Expected one visibility entry per ply.'
+
+            copied = board.copy()
+
+            while len(board.move_history) > 0:
+                board.pop()
+
+                assert (board.visibility_bitboard(PieceColor.WHITE), board.visibility_bitboard(PieceColor.BLACK)) == seen.pop(), 'Expected pop to restore the visibility of the position.'
+
+            assert len(copied.visibility_stack) == len(copied.move_history) + 1, 'Expected a copy to keep its own visibility entries.'
+
+    def test_visibility_tile_edit(self):
+        self.g.visibility_bitboard(PieceColor.WHITE)
+
+        self.g.wipe_board()
+        self.g.get((4, 0)).push(King(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((0, 0)).push(Rook(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((0, 4)).push(King(PieceColor.BLACK, (-1, -1), 1))
+
+        visible = self.g.visibility_mask(PieceColor.WHITE)
+
+        assert visible[0, 4] == 1 and visible[2, 2] == 0, 'Expected visibility to be recomputed after the tiles were edited.'
+        assert np.array_equal(visible[:, 0], np.ones(5)), 'Expected the rook to see its file.'
+
+    def test_observations(self):
+        rng = random.Random(2)
+
+        boards = []
+
+        for board_type in [DarkChessBoard, PackedDarkChessBoard]:
+            board = board_type()
+
+            for _ in range(5):
+                boards.append(board.copy())
+                board.push(rng.choice(board.legal_actions()))
+
+        out = np.empty((len(boards), 5, 5, OBSERVATION_PLANES), dtype=np.float32)
+
+        assert observations(boards, out=out) is out, 'Expected observations to be written into the supplied buffer.'
+
+        for i, board in enumerate(boards):
+            assert np.array_equal(out[i, :, :, :-1], board.canonical_state_vector()), 'Expected the piece planes to be the fogged canonical state vector.'
+
+            mask = board.visibility_mask(board.active_color)
+            if board.active_color == PieceColor.BLACK: mask = mask[::-1, ::-1]
+
+            assert np.array_equal(out[i, :, :, -1], mask), 'Expected the last plane to be the canonical fog mask.'
+
+        masks = visibility_masks(boards)
+
+        assert all(np.array_equal(masks[i], board.visibility_mask(board.active_color)) for i, board in enumerate(boards)), 'Expected batched masks to match per-board masks.'
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.atomic.board import AtomicChessBoard
+from minichess.dataset import GameDataset, MIRROR, game_samples, mirror_samples
+from minichess.records import record_from_board, write_records
+from tests.test_records import random_game
+import unittest
+
+import numpy as np
+import os
+import random
+import tempfile
+
+class TestDataset(unittest.TestCase):
+    def test_mirror(self):
+        rng = random.Random(0)
+
+        for _ in range(5):
+            board = random_game(GardnerChessBoard, rng, rng.randint(0, 20))
+            mirrored = board.fliplr()
+
+            actions = {action.fliplr().index() for action in board.legal_actions()}
+            assert actions == {action.index() for action in mirrored.legal_actions()}, 'Expected the mirrored board to have the mirrored actions.'
+
+            color = board.active_color.value
+            assert {MIRROR[color][action.index()] for action in board.legal_actions()} == actions, 'Expected the mirror table to follow GardnerChessAction.fliplr.'
+
+            samples, colors = game_samples(record_from_board(board))
+
+            if len(colors) > 0:
+                flipped = mirror_samples(samples, colors)
+                assert np.array_equal(mirror_samples(flipped, colors).masks, samples.masks), 'Expected mirroring twice to be the identity.'
+
+            state = board.canonical_state_vector(dtype=np.float32)[None]
+            mask = board.legal_action_mask()[None].astype(np.float32)
+            flipped = mirror_samples(type(samples)(state, mask, mask, np.zeros(1, dtype=np.float32)), np.array([color]))
+
+            assert np.array_equal(flipped.states[0], mirrored.canonical_state_vector()), 'Expected mirrored states to be the states of the mirrored board.'
+            assert np.array_equal(flipped.masks[0], mirrored.legal_action_mask()), 'Expected mirrored masks to be the masks of the mirrored board.'
+
+    def test_game_samples(self):
+        board = random_game(GardnerChessBoard, random.Random(1))
+        samples, colors = game_samples(record_from_board(board, result=1))
+
+        count = len(board.move_history)
+
+        assert samples.states.shape == (count, 5, 5, 12) and samples.masks.shape == (count, 1225), 'Expected one sample per move.'
+        assert all(samples.masks[i, np.argmax(samples.policies[i])] == 1 for i in range(count)), 'Expected the policy target to be a legal move.'
+        assert np.array_equal(samples.values, np.where(colors == 0, 1, -1)), 'Expected values for the side to move.'
+
+    def test_pipeline(self):
+        rng = random.Random(2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            total = 0
+
+            for shard in range(3):
+                boards = [random_game(GardnerChessBoard, rng) for _ in range(4)] + [random_game(AtomicChessBoard, rng, 6)]
+                total += sum(len(board.move_history) for board in boards)
+
+                paths.append(os.path.join(directory, '{}.mcgr'.format(shard)))
+                write_records(paths[-1], [record_from_board(board, result=rng.choice([-1, 0, 1])) for board in boards])
+
+            batches = list(GameDataset(paths, batch_size=32, shuffle_buffer=64, mirror=True, num_threads=2, seed=0))
+
+            assert sum(len(batch.values) for batch in batches) == total, 'Expected every sample exactly once.'
+            assert all(len(batch.values) == 32 for batch in batches[:-1]), 'Expected full batches but the last.'
+            assert all(batch.states.flags['C_CONTIGUOUS'] and batch.states.dtype == np.float32 for batch in batches), 'Expected contiguous float32 arrays.'
+            assert all(np.all(batch.masks[np.arange(len(batch.values)), np.argmax(batch.policies, axis=1)] == 1) for batch in batches), 'Expected policy targets to stay legal under mirroring.'
+
+            dropped = list(GameDataset(paths, batch_size=32, drop_last=True))
+            assert all(len(batch.values) == 32 for batch in dropped), 'Expected drop_last to drop the partial batch.'
+
+            # stopping early must not leave the threads hanging
+            for batch in GameDataset(paths, batch_size=4, prefetch=1):
+                break
+
+if __name__ == "__main__":
+    unittest.main()
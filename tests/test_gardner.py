@@ -1,9 +1,10 @@
 from minichess.games.abstract.piece import PieceColor
 from minichess.games.gardner.pieces import Pawn, King, Rook, Queen
 import unittest
-from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.gardner.board import GardnerChessBoard, legal_action_masks, state_vectors
 
 import numpy as np
+import random
 
 GENERIC_PAWN_WHITE = Pawn(PieceColor.WHITE, (-1, -1), 100)
 GENERIC_PAWN_BLACK = Pawn(PieceColor.BLACK, (-1, -1), 100)
@@ -108,5 +109,177 @@ class TestGardner(unittest.TestCase):
 
         assert len(white_legal_actions) != 0, 'Expected white to be able to make a legal move, got legal move list of length {}'.format(len(white_legal_actions))
 
+    def test_status_cache(self):
+        generate_moves = self.g._generate_moves
+        calls = []
+
+        def counting_generate_moves(color, filter_for_check=True):
+            calls.append((color, filter_for_check))
+            return generate_moves(color, filter_for_check)
+
+        self.g._generate_moves = counting_generate_moves
+
+        self.g.status
+        self.g.legal_actions()
+        self.g.legal_action_mask()
+
+        num_calls = len(calls)
+
+        assert self.g.status == self.g.status, 'Expected status to be stable on an unchanged board.'
+        self.g.legal_actions()
+        self.g.legal_action_mask()
+
+        assert len(calls) == num_calls, 'Expected repeated queries on an unchanged board to be served from the cache, but generated actions {} more times.'.format(len(calls) - num_calls)
+
+        initial_actions = set(self.g.legal_actions())
+
+        self.g.push(self.g.legal_actions()[0])
+
+        assert set(self.g.legal_actions()) != initial_actions, 'Expected cached actions to be invalidated by push.'
+
+        self.g.pop()
+
+        assert set(self.g.legal_actions()) == initial_actions, 'Expected actions after pop to match the initial actions.'
+
+    def test_cache_transposed_pieces(self):
+        self.g.wipe_board()
+
+        self.g.get((4, 4)).push(King(PieceColor.WHITE, (-1, -1), 10000))
+        self.g.get((0, 0)).push(King(PieceColor.BLACK, (-1, -1), 10000))
+        self.g.get((4, 0)).push(Rook(PieceColor.WHITE, (-1, -1), 563))
+
+        self.g.legal_actions()
+
+        # the same position, with a different rook object on the board
+        self.g.get((4, 0)).pop()
+        rook = Rook(PieceColor.WHITE, (-1, -1), 563)
+        self.g.get((4, 0)).push(rook)
+
+        agents = set(id(action.agent) for action in self.g.legal_actions() if action.from_pos == (4, 0))
+
+        assert agents == {id(rook)}, 'Expected cached actions to refer to the pieces currently on the board.'
+
+    def test_zobrist(self):
+        rng = random.Random(0)
+
+        initial_key = self.g.zobrist
+
+        assert hash(self.g) == initial_key, 'Expected board hash to be its Zobrist key.'
+
+        keys = [initial_key]
+
+        for _ in range(20):
+            actions = self.g.legal_actions()
+            if len(actions) == 0: break
+
+            self.g.push(rng.choice(actions))
+
+            assert self.g.bitboards.zobrist == self.g.bitboards.compute_zobrist(), 'Expected incremental Zobrist key to match a key computed from scratch on board:\n{}'.format(self.g)
+
+            keys.append(self.g.zobrist)
+
+        while len(self.g.move_history) > 0:
+            assert self.g.zobrist == keys.pop(), 'Expected Zobrist key to be restored by pop on board:\n{}'.format(self.g)
+            self.g.pop()
+
+        assert self.g.zobrist == initial_key, 'Expected Zobrist key to be restored after popping every move.'
+
+        self.g.active_color = PieceColor.BLACK
+
+        assert self.g.zobrist != initial_key, 'Expected Zobrist key to depend on the side to move.'
+
+    def test_legal_action_mask(self):
+        rng = random.Random(0)
+
+        boards = []
+
+        for _ in range(5):
+            actions = self.g.legal_actions()
+
+            expected = np.zeros(1225)
+            for action in actions:
+                expected[np.argmax(action.encode())] = 1
+
+            assert np.array_equal(self.g.legal_action_mask(), expected), 'Expected scattered mask to match the one-hot encodings of the legal actions.'
+
+            out = np.ones(1225, dtype=np.float32)
+            assert self.g.legal_action_mask(out=out) is out and np.array_equal(out, expected), 'Expected mask to be written into the supplied buffer.'
+
+            action = rng.choice(actions)
+            self.g.push(action)
+
+            # replay the game so far on a fresh board for the batched masks
+            board = type(self.g)()
+            for past_action in self.g.move_history[:-1]:
+                board.push(next(a for a in board.legal_actions() if a.index() == past_action.index()))
+            boards.append(board)
+
+        masks = legal_action_masks(boards)
+
+        assert masks.shape == (5, 1225) and all(np.array_equal(masks[i], board.legal_action_mask()) for i, board in enumerate(boards)), 'Expected batched masks to match per-board masks.'
+
+    def test_state_vectors(self):
+        rng = random.Random(0)
+
+        for _ in range(3):
+            self.g.push(rng.choice(self.g.legal_actions()))
+
+        boards = [type(self.g)(), self.g]
+
+        out = np.empty((2, 5, 5, 12), dtype=np.uint8)
+        assert state_vectors(boards, out=out) is out, 'Expected planes to be written into the supplied buffer.'
+        assert all(np.array_equal(out[i], board.state_vector()) for i, board in enumerate(boards)), 'Expected batched planes to match per-board state vectors.'
+
+        state_vectors(boards, out=out, canonical=True)
+        assert all(np.array_equal(out[i], board.canonical_state_vector()) for i, board in enumerate(boards)), 'Expected batched canonical planes to match per-board canonical state vectors.'
+
+        single = np.empty((5, 5, 12), dtype=np.float32)
+        assert self.g.canonical_state_vector(out=single) is single and np.array_equal(single, out[1]), 'Expected canonical planes to be written into the supplied buffer.'
+
+    def test_copy(self):
+        rng = random.Random(0)
+
+        for _ in range(6):
+            self.g.push(rng.choice(self.g.legal_actions()))
+
+        copied = self.g.copy()
+        before = (str(self.g), self.g.zobrist, len(self.g.move_history))
+
+        assert (str(copied), copied.zobrist, len(copied.move_history)) == before, 'Expected copy to be the same position with the same history.'
+
+        copied.push(copied.legal_actions()[0])
+        while len(copied.move_history) > 0:
+            copied.pop()
+
+        assert (str(self.g), self.g.zobrist, len(self.g.move_history)) == before, 'Expected changes to a copy to leave the original unchanged.'
+        assert str(copied) == str(type(self.g)()), 'Expected a copy to undo its history back to the start position.'
+
+        copied.wipe_board()
+
+        assert str(self.g) == before[0], 'Expected a copy to share no tiles with the original.'
+
+    def test_iter_legal_moves(self):
+        rng = random.Random(0)
+
+        for _ in range(6):
+            for color in [PieceColor.WHITE, PieceColor.BLACK]:
+                listed = self.g.legal_actions_for_color(color)
+
+                # a fresh board generates the moves lazily rather than from the position cache
+                board = self.g.copy()
+                streamed = list(board.iter_legal_actions(color))
+
+                assert sorted(a.index() for a in streamed) == sorted(a.index() for a in listed), 'Expected the streamed actions to be the legal actions.'
+
+                is_capture = [action.captured_piece is not None for action in streamed]
+                assert is_capture == sorted(is_capture, reverse=True), 'Expected captures before quiet moves.'
+
+                captures = [action.index() for action in self.g.copy().iter_captures(color)]
+                assert captures == [action.index() for action in streamed if action.captured_piece is not None], 'Expected iter_captures to yield only the captures.'
+
+                assert self.g.copy().has_legal_action(color) == (len(listed) > 0), 'Expected has_legal_action to agree with the legal actions.'
+
+            self.g.push(rng.choice(self.g.legal_actions()))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.dark.board import DarkChessBoard
+from minichess.players.ismcts import ISMCTSPlayer, hidden_pieces, observe, sample_determinization
+import unittest
+
+import numpy as np
+import random
+
+def random_dark_game(rng, num_moves):
+    board = DarkChessBoard()
+
+    for _ in range(num_moves):
+        actions = board.legal_actions()
+        if len(actions) == 0: break
+
+        board.push(rng.choice(actions))
+
+    return board
+
+class TestISMCTS(unittest.TestCase):
+    def test_determinization(self):
+        rng = random.Random(0)
+
+        for num_moves in range(0, 24, 3):
+            board = random_dark_game(rng, num_moves)
+            if len(board.legal_actions()) == 0: continue
+
+            color = board.active_color
+            world = sample_determinization(board, color, np.random.default_rng(num_moves), max_attempts=500)
+
+            if world is None: continue
+
+            assert observe(world, color) == observe(board, color), 'Expected the determinization to look like the real board to {} on:\n{}'.format(color, board.no_fog_board())
+
+            visible = board.visibility_bitboard(color)
+            hidden = world.bitboards.colors[color.invert().value] & ~visible
+
+            assert bin(hidden).count('1') <= len(hidden_pieces(board, color)), 'Expected at most the hidden pieces to be placed out of sight.'
+
+    def test_no_peeking(self):
+        board = DarkChessBoard()
+        color = board.active_color
+
+        world = sample_determinization(board, color, np.random.default_rng(0))
+
+        # the real board and a determinization of it cannot be told apart, so neither can their samples
+        first = sample_determinization(board, color, np.random.default_rng(1))
+        second = sample_determinization(world, color, np.random.default_rng(1))
+
+        assert first.to_bytes() == second.to_bytes(), 'Expected sampling to depend only on what the observer sees.'
+
+    def test_search(self):
+        board = DarkChessBoard()
+        key = board.to_bytes()
+
+        player = ISMCTSPlayer(num_determinizations=3, num_simulations=20, num_workers=0, seed=0)
+        result = player.search(board)
+
+        assert result.determinizations == 3 and result.visits.sum() == result.simulations == 60, 'Expected the visits of every determinization to be summed, got {}'.format(result.visits.sum())
+        assert result.action in board.legal_actions(), 'Expected a legal action, got {}'.format(result.action)
+        assert np.all(result.visits[board.legal_action_mask() == 0] == 0), 'Expected visits only on legal actions.'
+        assert board.to_bytes() == key and len(board.move_history) == 0, 'Expected search to leave the board unchanged.'
+
+    def test_reuse(self):
+        rng = random.Random(1)
+
+        board = DarkChessBoard()
+        player = ISMCTSPlayer(num_determinizations=4, num_simulations=8, num_workers=0, seed=1)
+
+        reused = 0
+
+        for _ in range(10):
+            if len(board.legal_actions()) == 0: break
+
+            result = player.search(board)
+            reused += result.reused
+
+            board.push(result.action)
+
+            actions = board.legal_actions()
+            if len(actions) == 0: break
+
+            board.push(rng.choice(actions))
+
+        assert reused > 0, 'Expected determinizations to be carried over between moves.'
+
+        player.reset()
+        assert player.search(board).reused == 0, 'Expected reset to drop the determinizations.'
+
+    def test_process_pool(self):
+        board = DarkChessBoard()
+
+        with ISMCTSPlayer(num_determinizations=2, num_simulations=10, num_workers=2, seed=2) as player:
+            found, action = player.propose_action(board, board.active_color, board.legal_action_mask())
+
+            assert found and action in board.legal_actions(), 'Expected a legal action from the worker processes, got {}'.format(action)
+            assert player.last_search.simulations == 20, 'Expected both determinizations to be searched.'
+
+if __name__ == "__main__":
+    unittest.main()
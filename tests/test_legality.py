@@ -0,0 +1,97 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.pieces import Pawn, Knight, Rook, Queen, King
+from minichess.games.gardner.bitboard import WHITE, BLACK, BB_SQUARES, square
+from minichess.games.gardner.board import GardnerChessBoard
+from tests.test_bitboard import action_set, random_board
+import unittest
+
+import random
+
+class TestLegality(unittest.TestCase):
+    '''
+        Conformance suite comparing the attack-map legality filter with the original
+        implementation, which simulates every candidate with push/pop.
+    '''
+    def setUp(self):
+        self.g = GardnerChessBoard()
+
+    def test_pin(self):
+        self.g.wipe_board()
+
+        self.g.get((4, 2)).push(King(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((3, 2)).push(Rook(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((0, 2)).push(Queen(PieceColor.BLACK, (-1, -1), 1))
+
+        info = self.g.bitboards.check_info(WHITE)
+
+        assert info.pinned == {square((3, 2)): sum(BB_SQUARES[square((row, 2))] for row in range(4))}, 'Expected rook on (3, 2) to be pinned along the file.'
+
+        rook_destinations = set(action.to_pos for action in self.g.legal_actions_for_color(PieceColor.WHITE) if action.from_pos == (3, 2))
+
+        assert rook_destinations == {(2, 2), (1, 2), (0, 2)}, 'Expected pinned rook to only move along the pin, got {}'.format(rook_destinations)
+
+    def test_double_check(self):
+        self.g.wipe_board()
+
+        self.g.get((4, 4)).push(King(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((4, 0)).push(Rook(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((0, 4)).push(Rook(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((2, 3)).push(Knight(PieceColor.BLACK, (-1, -1), 1))
+
+        info = self.g.bitboards.check_info(WHITE)
+
+        assert info.checkers == BB_SQUARES[square((0, 4))] | BB_SQUARES[square((2, 3))], 'Expected rook and knight to both give check.'
+
+        movers = set(action.from_pos for action in self.g.legal_actions_for_color(PieceColor.WHITE))
+
+        assert movers == {(4, 4)}, 'Expected only the king to move out of double check, got moves from {}'.format(movers)
+
+    def test_pawn_check(self):
+        self.g.wipe_board()
+
+        self.g.get((2, 2)).push(King(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((3, 3)).push(Pawn(PieceColor.WHITE, (-1, -1), 1))
+
+        assert self.g.bitboards.check_info(BLACK).checkers == BB_SQUARES[square((3, 3))], 'Expected white pawn on (3, 3) to check the black king.'
+
+    def test_conformance_random_positions(self):
+        rng = random.Random(0)
+
+        for _ in range(1000):
+            board = random_board(rng)
+
+            for color in [PieceColor.WHITE, PieceColor.BLACK]:
+                for filter_for_check in [False, True]:
+                    fast = action_set(board.legal_actions_for_color(color, filter_for_check))
+                    reference = action_set(board._visitor_actions_for_color(color, filter_for_check))
+
+                    assert fast == reference, 'Attack-map and push/pop legality disagree for {} (filter_for_check={}) on board:\n{}'.format(color, filter_for_check, board)
+
+    def test_conformance_random_games(self):
+        rng = random.Random(1)
+
+        for _ in range(20):
+            board = GardnerChessBoard()
+
+            for _ in range(60):
+                actions = board.legal_actions()
+
+                assert action_set(actions) == action_set(board._visitor_actions_for_color(board.active_color)), 'Attack-map and push/pop legality disagree on board:\n{}'.format(board)
+
+                if len(actions) == 0: break
+
+                board.push(rng.choice(actions), check_for_check=False)
+
+    def test_conformance_simulated_bitboards(self):
+        rng = random.Random(2)
+
+        for _ in range(10000):
+            bitboards = random_board(rng).bitboards
+
+            for color in [WHITE, BLACK]:
+                simulated = [move for move in bitboards.pseudo_legal_moves(color) if not bitboards.leaves_king_attacked(color, move)]
+
+                assert sorted(bitboards.legal_moves(color)) == sorted(simulated), 'Attack-map and simulated bitboard legality disagree.'
+
+if __name__ == "__main__":
+    unittest.main()
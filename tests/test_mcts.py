@@ -0,0 +1,78 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.pieces import Pawn, Rook, King
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.rifle.board import RifleChessBoard
+from minichess.games.atomic.board import AtomicChessBoard
+from minichess.games.dark.board import DarkChessBoard
+from minichess.players.mcts import MCTSPlayer, uniform_evaluator
+import unittest
+
+import numpy as np
+
+class TestMCTS(unittest.TestCase):
+    def test_mate_in_one(self):
+        g = GardnerChessBoard()
+        g.wipe_board()
+
+        g.get((0, 0)).push(King(PieceColor.BLACK, (-1, -1), 10000))
+        g.get((1, 0)).push(Pawn(PieceColor.BLACK, (-1, -1), 100))
+        g.get((1, 1)).push(Pawn(PieceColor.BLACK, (-1, -1), 100))
+        g.get((4, 2)).push(King(PieceColor.WHITE, (-1, -1), 10000))
+        g.get((4, 4)).push(Rook(PieceColor.WHITE, (-1, -1), 563))
+
+        key = g.to_bytes()
+
+        result = MCTSPlayer(num_simulations=400).search(g)
+
+        assert (result.action.from_pos, result.action.to_pos) == ((4, 4), (0, 4)), 'Expected rook to deliver mate, got {}'.format(result.action)
+        assert result.value > 0.5, 'Expected a winning root value, got {}'.format(result.value)
+        assert g.to_bytes() == key and len(g.move_history) == 0, 'Expected search to leave the board unchanged.'
+
+    def test_batching(self):
+        calls = []
+
+        def evaluator(states, masks):
+            calls.append(len(states))
+
+            assert states.shape[1:] == (5, 5, 12) and masks.shape == (len(states), 1225), 'Expected batched states and masks.'
+
+            return uniform_evaluator(states, masks)
+
+        g = GardnerChessBoard()
+        result = MCTSPlayer(evaluator, num_simulations=256, batch_size=32).search(g)
+
+        assert result.simulations == 256 and result.visits.sum() == 256, 'Expected every simulation to reach the root, got {}'.format(result.visits.sum())
+        assert max(calls) <= 32, 'Expected at most batch_size leaves per call, got {}'.format(max(calls))
+        assert max(calls) > 1, 'Expected virtual loss to spread simulations over several leaves.'
+        assert result.batches == len(calls) and result.evaluations == sum(calls), 'Expected stats to count evaluator calls.'
+        assert np.all(result.visits[np.flatnonzero(g.legal_action_mask() == 0)] == 0), 'Expected visits only on legal actions.'
+
+    def test_tree_reuse(self):
+        g = GardnerChessBoard()
+        player = MCTSPlayer(num_simulations=200)
+
+        first = player.search(g)
+        assert first.reused == 0, 'Expected a fresh tree for the first search.'
+        assert np.all(player.root.virtual == 0), 'Expected no virtual loss left after a search.'
+
+        g.push(first.action)
+        g.push(g.legal_actions()[0])
+
+        second = player.search(g)
+        assert second.reused > 0, 'Expected the subtree two plies down to be reused.'
+        assert second.visits.sum() == second.reused + second.simulations, 'Expected visits of both searches at the new root.'
+
+        player.reset()
+        assert player.search(g).reused == 0, 'Expected reset to drop the tree.'
+
+    def test_variants(self):
+        for board_type in [GardnerChessBoard, RifleChessBoard, AtomicChessBoard, DarkChessBoard]:
+            g = board_type()
+
+            found, action = MCTSPlayer(num_simulations=32, batch_size=8, dirichlet_alpha=0.3, temperature=1.0).propose_action(g, g.active_color, g.legal_action_mask())
+
+            assert found and action in g.legal_actions(), 'Expected a legal action for {}, got {}'.format(board_type.__name__, action)
+            assert len(g.move_history) == 0, 'Expected search to leave the {} board unchanged.'.format(board_type.__name__)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.gardner.move import GardnerMove, MOVES, unpack
+from tests.test_bitboard import random_board
+import unittest
+
+import pickle
+import random
+
+class TestMove(unittest.TestCase):
+    def test_interned(self):
+        for color in [PieceColor.WHITE, PieceColor.BLACK]:
+            moves = [move for move in MOVES[color.value] if move is not None]
+
+            assert len(MOVES[color.value]) == 1225, 'Expected one table entry per action index.'
+            assert all(unpack(int(move)) is move for move in moves), 'Expected packed moves to unpack to the interned instance.'
+            assert all(pickle.loads(pickle.dumps(move)) is move for move in moves), 'Expected unpickled moves to be the interned instance.'
+
+        with self.assertRaises(AttributeError):
+            moves[0].to_sq = 0
+
+    def test_round_trip(self):
+        rng = random.Random(0)
+
+        for _ in range(200):
+            board = random_board(rng)
+
+            for color in [PieceColor.WHITE, PieceColor.BLACK]:
+                for action in board.legal_actions_for_color(color):
+                    rebuilt = GardnerMove.from_action(action).to_action(board)
+
+                    assert (rebuilt.agent, rebuilt.from_pos, rebuilt.to_pos, rebuilt.captured_piece, set(rebuilt.modifier_flags)) == \
+                        (action.agent, action.from_pos, action.to_pos, action.captured_piece, set(action.modifier_flags)), 'Expected lossless conversion of {}'.format(action)
+
+    def test_push_move(self):
+        board = GardnerChessBoard()
+
+        for _ in range(10):
+            moves = board.legal_moves()
+
+            assert moves == [GardnerMove.from_action(action) for action in board.legal_actions()], 'Expected legal moves to match legal actions.'
+
+            board.push_move(moves[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+from tests.test_gardner import TestGardner
+from tests.test_bitboard import action_set
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.gardner.packed import PackedGardnerChessBoard
+from minichess.games.rifle.board import RifleChessBoard, PackedRifleChessBoard
+from minichess.games.atomic.board import AtomicChessBoard, PackedAtomicChessBoard
+from minichess.games.dark.board import DarkChessBoard, PackedDarkChessBoard
+import unittest
+
+import random
+
+class TestPackedGardner(TestGardner):
+    def setUp(self) -> None:
+        self.g = PackedGardnerChessBoard()
+
+    @unittest.skip('packed boards build their pieces on demand, so there are no piece objects to keep')
+    def test_cache_transposed_pieces(self):
+        pass
+
+    def test_views(self):
+        tile = self.g.get((4, 4))
+
+        assert self.g.get('a5').position == tile.position, 'Expected chess convention indices to resolve to the same square.'
+        assert len(list(self.g)) == 25 and str(tile) == str(GardnerChessBoard().get((4, 4))), 'Expected tiles to be views of the packed squares.'
+
+        tile.pop()
+
+        assert not self.g.get((4, 4)).occupied() and len(self.g.to_bytes()) == 26, 'Expected edits through a view to change the packed squares.'
+
+    def test_packed_variants(self):
+        rng = random.Random(0)
+
+        for board_type, packed_type in [(GardnerChessBoard, PackedGardnerChessBoard), (RifleChessBoard, PackedRifleChessBoard),
+                                        (AtomicChessBoard, PackedAtomicChessBoard), (DarkChessBoard, PackedDarkChessBoard)]:
+            for _ in range(3):
+                board, packed = board_type(), packed_type()
+
+                for _ in range(40):
+                    assert (str(board), board.zobrist, board.to_bytes(), board.status) == (str(packed), packed.zobrist, packed.to_bytes(), packed.status), \
+                        'Expected {} to track {}'.format(packed_type.__name__, board_type.__name__)
+
+                    actions = board.legal_actions()
+
+                    assert action_set(actions) == action_set(packed.legal_actions()), 'Expected {} to generate the same actions.'.format(packed_type.__name__)
+
+                    if len(actions) == 0 or board.status != 0: break
+
+                    action = rng.choice(actions)
+                    board.push(action)
+                    packed.push(next(a for a in packed.legal_actions() if a.index() == action.index()))
+
+    def test_packed_copy(self):
+        for packed_type in [PackedGardnerChessBoard, PackedAtomicChessBoard]:
+            board = packed_type()
+            board.push(board.legal_actions()[0])
+
+            copied = board.copy()
+            before = board.to_bytes()
+
+            copied.push(copied.legal_actions()[0])
+            copied.wipe_board()
+
+            assert board.to_bytes() == before and len(board.move_history) == 1, 'Expected changes to a copy to leave the original unchanged.'
+            assert packed_type.from_bytes(before).to_bytes() == before, 'Expected boards to round trip through bytes.'
+
+    def test_snapshot(self):
+        board = PackedAtomicChessBoard()
+        board.push(board.legal_actions()[0])
+
+        snapshot = board.snapshot()
+        before = board.to_bytes()
+
+        assert snapshot._squares is board._squares, 'Expected a snapshot to share storage until it changes.'
+
+        snapshot.push(snapshot.legal_actions()[0])
+
+        assert board.to_bytes() == before and len(board.move_history) == 1, 'Expected changes to a snapshot to leave the original unchanged.'
+
+        board.pop()
+
+        assert len(snapshot.move_history) == 2 and snapshot.to_bytes() != board.to_bytes(), 'Expected changes to the original to leave the snapshot unchanged.'
+
+        snapshot.pop()
+        snapshot.pop()
+
+        assert snapshot.to_bytes() == board.to_bytes(), 'Expected snapshot history to undo back to the start position.'
+
+if __name__ == "__main__":
+    unittest.main()
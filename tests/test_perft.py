@@ -0,0 +1,75 @@
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.perft import POSITIONS, VARIANTS, board_from_fen, divide, fen, perft
+import unittest
+
+# node counts of the curated positions, recorded from the current move generators
+EXPECTED = {
+    'gardner': {
+        'start': [7, 53, 506, 4775],
+        'open': [14, 138, 2045, 23329],
+        'promotion': [3, 9, 56, 294],
+        'pin': [7, 75, 599, 6842],
+        'check': [2, 36, 169, 2379],
+        'crowded': [5, 69, 644, 7874]
+    },
+    'rifle': {
+        'start': [7, 53, 490],
+        'open': [14, 154, 2196],
+        'promotion': [3, 9, 42],
+        'pin': [7, 76, 614],
+        'check': [2, 36, 166],
+        'crowded': [5, 66, 651]
+    },
+    'atomic': {
+        'start': [7, 32, 153],
+        'open': [13, 18, 111],
+        'promotion': [6, 4, 18],
+        'pin': [3, 20, 130],
+        'check': [1, 18, 88],
+        'crowded': [3, 4, 23]
+    }
+}
+
+class TestPerft(unittest.TestCase):
+    def test_fen(self):
+        for name, position in POSITIONS.items():
+            assert fen(board_from_fen(position)) == position, 'Expected {} to round trip.'.format(name)
+
+        assert board_from_fen(POSITIONS['start']).to_bytes() == GardnerChessBoard().to_bytes(), 'Expected the start position.'
+
+    def test_perft(self):
+        for variant, positions in EXPECTED.items():
+            for name, counts in positions.items():
+                for depth, expected in enumerate(counts, start=1):
+                    board = board_from_fen(POSITIONS[name], VARIANTS[variant])
+                    before = board.to_bytes()
+
+                    assert perft(board, depth) == expected, 'Expected {} {} perft({}) to be {}'.format(variant, name, depth, expected)
+                    assert board.to_bytes() == before, 'Expected perft to restore the position.'
+
+    def test_divide(self):
+        for variant in ['gardner', 'rifle']:
+            for name in POSITIONS:
+                board = board_from_fen(POSITIONS[name], VARIANTS[variant])
+                counts = divide(board, 3)
+
+                assert len(counts) == perft(board, 1), 'Expected one entry per root move.'
+                assert sum(counts.values()) == perft(board, 3), 'Expected the entries to add up to perft.'
+
+    def test_visitor_reference(self):
+        # the bitboard generator against the visitor generator it replaced
+        def reference(board, depth):
+            if depth == 0: return 1
+
+            nodes = 0
+            for action in board._visitor_actions_for_color(board.active_color):
+                board.push(action, check_for_check=False)
+                nodes += reference(board, depth - 1)
+                board.pop()
+
+            return nodes
+
+        for name in POSITIONS:
+            board = board_from_fen(POSITIONS[name])
+
+            assert perft(board, 3) == reference(board, 3), 'Expected the generators to agree on {}'.format(name)
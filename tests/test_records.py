@@ -0,0 +1,88 @@
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.atomic.board import AtomicChessBoard
+from minichess.games.dark.board import DarkChessBoard
+from minichess.games.rifle.board import RifleChessBoard
+from minichess.records import GameRecord, RecordReader, RecordWriter, pack_indices, record_from_board, unpack_indices
+import unittest
+
+import numpy as np
+import os
+import random
+import tempfile
+
+def random_game(board_type, rng, max_moves=30):
+    board = board_type()
+
+    for _ in range(max_moves):
+        actions = board.legal_actions()
+        if len(actions) == 0: break
+        board.push(rng.choice(actions), check_for_check=False)
+
+    return board
+
+class TestRecords(unittest.TestCase):
+    def test_pack_indices(self):
+        indices = np.random.default_rng(0).integers(0, 1225, 1001)
+
+        packed = pack_indices(indices)
+
+        assert len(packed) == (1001 * 11 + 7) // 8, 'Expected 11 bits per index.'
+        assert np.array_equal(unpack_indices(packed, 1001), indices), 'Expected packed indices to round trip.'
+
+    def test_round_trip(self):
+        rng = random.Random(0)
+        boards = [random_game(board_type, rng, 12 if board_type == AtomicChessBoard else 30) for board_type in
+                  [GardnerChessBoard, RifleChessBoard, AtomicChessBoard, DarkChessBoard, GardnerChessBoard]]
+
+        records = []
+        for i, board in enumerate(boards):
+            count = len(board.move_history)
+            values = np.linspace(-1, 1, count).astype(np.float32) if i % 2 == 0 else None
+            visits = [np.array([[board.move_history[ply].index(), ply + 1], [0, 2]]) for ply in range(count)] if i == 0 else None
+
+            records.append(record_from_board(board, result=i % 3 - 1, values=values, visits=visits))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.mcgr')
+
+            with RecordWriter(path) as writer:
+                for record in records:
+                    writer.write(record)
+
+            with RecordReader(path) as reader:
+                assert len(reader) == len(records), 'Expected every game to be indexed.'
+                assert reader.lengths().tolist() == [len(record.actions) for record in records], 'Expected game lengths from the headers.'
+
+                for board, record, read in zip(boards, records, reader):
+                    assert (read.variant, read.start, read.result) == (record.variant, record.start, record.result), 'Expected the game header to round trip.'
+                    assert np.array_equal(read.actions, record.actions), 'Expected the moves to round trip.'
+                    assert (read.values is None) == (record.values is None) and (read.values is None or np.allclose(read.values, record.values, atol=1e-3)), 'Expected values to round trip.'
+                    assert (read.visits is None) == (record.visits is None) and (read.visits is None or all(np.array_equal(a, b) for a, b in zip(read.visits, record.visits))), 'Expected visits to round trip.'
+
+                    positions = [position.to_bytes() for position in read.positions()]
+                    assert positions[-1] == board.to_bytes() and read.board_at(len(read.actions)).to_bytes() == board.to_bytes(), 'Expected the replay to reach the final position.'
+
+                first = reader[0]
+                policy = first.policy(2)
+                assert np.isclose(policy.sum(), 1) and policy[first.actions[2]] == 3 / 5, 'Expected the policy from the visit counts.'
+                assert reader[1].policy(0)[reader[1].actions[0]] == 1, 'Expected a one-hot policy without visit counts.'
+
+    def test_unindexed(self):
+        rng = random.Random(1)
+        records = [record_from_board(random_game(GardnerChessBoard, rng)) for _ in range(3)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.mcgr')
+
+            writer = RecordWriter(path)
+            for record in records:
+                writer.write(record)
+            writer.file.write(b'\x05\x00') # a game cut short
+            writer.file.close()
+
+            with RecordReader(path) as reader:
+                assert len(reader) == 3, 'Expected the complete games of a shard without an index.'
+                assert all(np.array_equal(read.actions, record.actions) for read, record in zip(reader, records)), 'Expected the games to be read back.'
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.rifle.pieces import Rook, King
+from minichess.games.rifle.board import RifleChessBoard
+from minichess.games.rifle.bitboard import capture_exposes_king
+from minichess.games.gardner.bitboard import WHITE, square
+from minichess.perft import POSITIONS, VARIANTS, board_from_fen, perft
+from tests.test_bitboard import action_set, random_board
+import unittest
+
+import random
+
+# perft(4) of the curated positions, recorded from the push/pop legality filter this replaced
+EXPECTED = {
+    'start': 4428,
+    'open': 25472,
+    'promotion': 193,
+    'pin': 7016,
+    'check': 2358,
+    'crowded': 8117
+}
+
+class TestRifleLegality(unittest.TestCase):
+    '''
+        Conformance suite comparing the attack-map legality of `minichess.games.rifle.bitboard` with
+        the original implementation, which simulates every candidate with push/pop.
+    '''
+    def setUp(self):
+        self.g = RifleChessBoard()
+
+    def test_capture_keeps_pin(self):
+        self.g.wipe_board()
+
+        self.g.get((4, 0)).push(King(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((2, 0)).push(Rook(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((0, 0)).push(Rook(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((2, 3)).push(Rook(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((0, 4)).push(King(PieceColor.BLACK, (-1, -1), 1))
+
+        targets = set(action.to_pos for action in self.g.legal_actions_for_color(PieceColor.WHITE) if action.from_pos == (2, 0))
+
+        # a pinned piece does not move when it captures, so it may capture off its pin line
+        assert targets == {(0, 0), (1, 0), (3, 0), (2, 3)}, 'Expected the pinned rook to capture from range, got {}'.format(targets)
+
+    def test_capture_opens_line(self):
+        self.g.wipe_board()
+
+        self.g.get((4, 0)).push(King(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((2, 3)).push(Rook(PieceColor.WHITE, (-1, -1), 1))
+        self.g.get((2, 0)).push(Rook(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((0, 0)).push(Rook(PieceColor.BLACK, (-1, -1), 1))
+        self.g.get((0, 4)).push(King(PieceColor.BLACK, (-1, -1), 1))
+
+        assert capture_exposes_king(self.g.bitboards, WHITE, square((2, 0))), 'Expected taking the blocking rook to open the file to the king.'
+
+        targets = set(action.to_pos for action in self.g.legal_actions_for_color(PieceColor.WHITE) if action.from_pos == (2, 3))
+
+        assert (2, 0) not in targets, 'Expected the capture that opens the file to be illegal, got {}'.format(targets)
+
+    def test_conformance_random_positions(self):
+        rng = random.Random(0)
+
+        for _ in range(500):
+            board = random_board(rng, RifleChessBoard)
+
+            for color in [PieceColor.WHITE, PieceColor.BLACK]:
+                for filter_for_check in [False, True]:
+                    fast = action_set(board.legal_actions_for_color(color, filter_for_check))
+                    reference = action_set(board._visitor_actions_for_color(color, filter_for_check))
+
+                    assert fast == reference, 'Attack-map and push/pop legality disagree for {} (filter_for_check={}) on board:\n{}'.format(color, filter_for_check, board)
+
+                streamed = action_set(move.to_action(board) for move in board._iter_generated_moves(color))
+
+                assert streamed == action_set(board._visitor_actions_for_color(color)), 'Expected the streamed moves to match on board:\n{}'.format(board)
+
+    def test_conformance_random_games(self):
+        rng = random.Random(1)
+
+        for _ in range(10):
+            board = RifleChessBoard()
+
+            for _ in range(40):
+                actions = board.legal_actions()
+
+                assert action_set(actions) == action_set(board._visitor_actions_for_color(board.active_color)), 'Attack-map and push/pop legality disagree on board:\n{}'.format(board)
+
+                if len(actions) == 0: break
+
+                board.push(rng.choice(actions), check_for_check=False)
+
+    def test_perft(self):
+        for name, expected in EXPECTED.items():
+            board = board_from_fen(POSITIONS[name], VARIANTS['rifle'])
+
+            assert perft(board, 4) == expected, 'Expected rifle {} perft(4) to be {}'.format(name, expected)
+
+if __name__ == "__main__":
+    unittest.main()
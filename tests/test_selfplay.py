@@ -0,0 +1,77 @@
+from minichess.players.gardner import RandomPlayer
+from minichess.selfplay import SelfPlayPool, TrajectoryBuffer, Trajectories
+import unittest
+
+from functools import partial
+
+import numpy as np
+import os
+import tempfile
+
+class _CrashingPlayer(RandomPlayer):
+    '''
+        Kills its process the first time any instance moves, as marked by a file in `marker_dir`.
+    '''
+    def __init__(self, marker_dir):
+        super().__init__()
+        self.marker = os.path.join(marker_dir, 'crashed')
+
+    def propose_action(self, board, color, action_mask):
+        if not os.path.exists(self.marker):
+            open(self.marker, 'w').close()
+            os._exit(1)
+
+        return super().propose_action(board, color, action_mask)
+
+def _records(count, start=0):
+    return Trajectories(
+        np.zeros((count, 5, 5, 12), dtype=np.uint8),
+        np.zeros((count, 1225), dtype=np.uint8),
+        np.arange(start, start + count, dtype=np.int16),
+        np.zeros(count, dtype=np.int8)
+    )
+
+class TestSelfPlay(unittest.TestCase):
+    def test_ring_buffer(self):
+        buffer = TrajectoryBuffer(8)
+        reader = TrajectoryBuffer(8, buffer.name)
+
+        try:
+            buffer.write(_records(5))
+            records, position, dropped = reader.read(0)
+
+            assert records.actions.tolist() == list(range(5)) and (position, dropped) == (5, 0), 'Expected to read back the written records.'
+
+            buffer.write(_records(6, start=5))
+            buffer.write(_records(3, start=11))
+            records, position, dropped = reader.read(position)
+
+            assert records.actions.tolist() == list(range(6, 14)) and (position, dropped) == (14, 1), 'Expected the overwritten record to be reported as dropped.'
+            assert reader.games == 3, 'Expected three games to be counted.'
+        finally:
+            reader.close()
+            buffer.close()
+            buffer.unlink()
+
+    def test_deterministic(self):
+        runs = []
+
+        for _ in range(2):
+            with SelfPlayPool(2, RandomPlayer, games_per_worker=2, max_moves=20, seed=7) as pool:
+                pool.join()
+                runs.append(pool.collect())
+
+        assert len(runs[0].actions) > 0, 'Expected workers to record their moves.'
+        assert all(np.array_equal(a, b) for a, b in zip(*runs)), 'Expected the same seed to reproduce the same games.'
+        assert all(runs[0].masks[i, action] == 1 for i, action in enumerate(runs[0].actions)), 'Expected every recorded action to be legal.'
+
+    def test_crash_restart(self):
+        with tempfile.TemporaryDirectory() as marker_dir:
+            with SelfPlayPool(2, partial(_CrashingPlayer, marker_dir), games_per_worker=2, max_moves=10) as pool:
+                pool.join()
+
+                assert sum(pool.restarts) == 1, 'Expected the crashed worker to be restarted once, got {}'.format(pool.restarts)
+                assert sum(buffer.games for buffer in pool.buffers) == 4, 'Expected restarted workers to finish their quota.'
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.search.tt import Bound, ReplacementPolicy, TranspositionTable, ENTRY_SIZE, NO_MOVE
+import unittest
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_memory_budget(self):
+        tt = TranspositionTable(size_mb=1)
+
+        assert tt.size_bytes <= 1024 * 1024, 'Expected table to fit its memory budget, but it uses {} bytes.'.format(tt.size_bytes)
+        assert tt.capacity == (1024 * 1024) // ENTRY_SIZE, 'Expected table to use its whole memory budget.'
+
+    def test_store_probe(self):
+        tt = TranspositionTable(size_mb=1)
+        board = GardnerChessBoard()
+
+        assert tt.probe(board.zobrist) is None, 'Expected a miss on an empty table.'
+
+        tt.store(board.zobrist, 3, Bound.EXACT, 42, 1.5)
+        entry = tt.probe(board.zobrist)
+
+        assert entry is not None and (entry.depth, entry.bound, entry.move, entry.value) == (3, Bound.EXACT, 42, 1.5), 'Expected stored entry back, got {}'.format(entry)
+        assert (tt.hits, tt.misses) == (1, 1), 'Expected one hit and one miss, got {} and {}'.format(tt.hits, tt.misses)
+
+        # a store without a move keeps the move we already know
+        tt.store(board.zobrist, 4, Bound.LOWER, NO_MOVE, 2.0)
+
+        assert tt.probe(board.zobrist).move == 42, 'Expected best move to survive a store without a move.'
+
+    def _colliding_keys(self, tt, count):
+        return [tt.num_buckets * i + 7 for i in range(1, count + 1)]
+
+    def test_always_replace(self):
+        tt = TranspositionTable(size_mb=0.01, policy=ReplacementPolicy.ALWAYS_REPLACE)
+        a, b = self._colliding_keys(tt, 2)
+
+        tt.store(a, 8, Bound.EXACT, 1, 0.0)
+        tt.store(b, 1, Bound.EXACT, 2, 0.0)
+
+        assert tt.probe(a) is None and tt.probe(b) is not None, 'Expected the newest entry to replace the old one.'
+        assert tt.overwrites == 1, 'Expected one overwrite, got {}'.format(tt.overwrites)
+
+    def test_depth_preferred(self):
+        tt = TranspositionTable(size_mb=0.01, policy=ReplacementPolicy.DEPTH_PREFERRED)
+        a, b = self._colliding_keys(tt, 2)
+
+        tt.store(a, 8, Bound.EXACT, 1, 0.0)
+
+        assert not tt.store(b, 1, Bound.EXACT, 2, 0.0), 'Expected a shallower entry to be rejected.'
+        assert tt.probe(a) is not None and tt.probe(b) is None, 'Expected the deeper entry to be kept.'
+
+        tt.new_search()
+
+        assert tt.store(b, 1, Bound.EXACT, 2, 0.0), 'Expected entries from an earlier search to be replaceable.'
+
+    def test_two_tier(self):
+        tt = TranspositionTable(size_mb=0.01, policy=ReplacementPolicy.TWO_TIER)
+        a, b, c = self._colliding_keys(tt, 3)
+
+        tt.store(a, 8, Bound.EXACT, 1, 0.0)
+        tt.store(b, 1, Bound.EXACT, 2, 0.0)
+
+        assert tt.probe(a) is not None and tt.probe(b) is not None, 'Expected both entries to fit in a bucket.'
+
+        tt.store(c, 2, Bound.EXACT, 3, 0.0)
+
+        assert tt.probe(a) is not None and tt.probe(b) is None and tt.probe(c) is not None, 'Expected the always-replace slot to be overwritten.'
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+from minichess.games.abstract.board import AbstractBoardStatus
+from minichess.vector_env import VectorEnv, VARIANTS
+import unittest
+
+import numpy as np
+
+class TestVectorEnv(unittest.TestCase):
+    def test_step(self):
+        rng = np.random.default_rng(0)
+
+        for variant in VARIANTS:
+            env = VectorEnv(4, variant)
+            observations, masks = env.reset()
+
+            assert observations.shape == (4, 5, 5, 12) and masks.shape == (4, 1225), 'Expected stacked observations and masks for {}'.format(variant)
+
+            for _ in range(3):
+                actions = np.array([rng.choice(np.flatnonzero(mask)) for mask in masks])
+                observations, masks, rewards, dones = env.step(actions)
+
+                for i, board in enumerate(env.boards):
+                    assert np.array_equal(observations[i], board.canonical_state_vector()), 'Expected observation {} to match its board for {}'.format(i, variant)
+                    assert np.array_equal(masks[i], board.legal_action_mask()), 'Expected mask {} to match its board for {}'.format(i, variant)
+                    assert bytes(env.positions[i]) == board.to_bytes(), 'Expected position {} to match its board for {}'.format(i, variant)
+
+    def test_auto_reset(self):
+        env = VectorEnv(3, max_moves=2)
+        start_observations, masks = env.reset()
+        start_observations = start_observations.copy()
+
+        for _ in range(2):
+            _, masks, rewards, dones = env.step(np.argmax(masks, axis=1))
+
+        assert dones.all() and (env.statuses == AbstractBoardStatus.DRAW.value).all(), 'Expected games to end as draws at the move limit.'
+        assert (rewards == 0).all() and (env.move_counts == 0).all(), 'Expected drawn games to be reset.'
+        assert np.array_equal(env.observations, start_observations), 'Expected reset games to be observed from the start position.'
+
+    def test_illegal_action(self):
+        env = VectorEnv(2)
+        _, masks = env.reset()
+
+        with self.assertRaises(ValueError):
+            env.step(np.array([np.argmax(masks[0]), np.argmin(masks[1])]))
+
+if __name__ == "__main__":
+    unittest.main()
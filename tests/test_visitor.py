@@ -0,0 +1,53 @@
+from minichess.games.abstract.action import AbstractChessActionVisitor, visitor
+from minichess.games.abstract.piece import PieceColor
+from minichess.games.gardner.action import GardnerChessActionVisitor
+from minichess.games.gardner.board import GardnerChessBoard
+from minichess.games.gardner.pieces import Pawn, Knight, Rook, King
+from minichess.games.rifle.action import RifleChessActionVisitor
+import unittest
+
+class _BaseVisitor(AbstractChessActionVisitor):
+    @visitor(Pawn)
+    def visit(self, piece, board): return 'base pawn'
+
+    @visitor(Knight)
+    def visit(self, piece, board): return 'base knight'
+
+class _DerivedVisitor(_BaseVisitor):
+    @visitor(Pawn)
+    def visit(self, piece, board): return 'derived pawn'
+
+class _SubPawn(Pawn):
+    pass
+
+class TestVisitor(unittest.TestCase):
+    def test_inheritance(self):
+        board = GardnerChessBoard()
+        derived = _DerivedVisitor()
+
+        assert derived.visit(Pawn(PieceColor.WHITE, (0, 0), 100), board) == 'derived pawn', 'Expected subclass visit method to override its parent.'
+        assert derived.visit(Knight(PieceColor.WHITE, (0, 0), 100), board) == 'base knight', 'Expected visit method to be inherited from the parent visitor.'
+        assert _BaseVisitor().visit(Pawn(PieceColor.WHITE, (0, 0), 100), board) == 'base pawn', 'Expected parent visitor to keep its own visit method.'
+        assert derived.visit(_SubPawn(PieceColor.WHITE, (0, 0), 100), board) == 'derived pawn', 'Expected piece subclasses to dispatch to their base class visit method.'
+
+        with self.assertRaises(NotImplementedError):
+            derived.visit(Rook(PieceColor.WHITE, (0, 0), 100), board)
+
+    def test_rifle_visitor(self):
+        board = GardnerChessBoard()
+        board.wipe_board()
+
+        board.get((4, 4)).push(King(PieceColor.WHITE, (-1, -1), 10000))
+        board.get((1, 1)).push(Pawn(PieceColor.WHITE, (-1, -1), 100))
+        board.get((0, 0)).push(Rook(PieceColor.BLACK, (-1, -1), 563))
+
+        pawn = board.get((1, 1)).peek()
+
+        gardner_captures = [action for action in GardnerChessActionVisitor().visit(pawn, board) if action.to_pos == (0, 0)]
+        rifle_captures = [action for action in RifleChessActionVisitor().visit(pawn, board) if action.to_pos == (0, 0)]
+
+        assert len(gardner_captures) == 4, 'Expected a capturing promotion to every piece type, got {}'.format(len(gardner_captures))
+        assert len(rifle_captures) == 1, 'Expected the inherited Rifle pawn visit to use its own helper, got {} captures'.format(len(rifle_captures))
+
+if __name__ == "__main__":
+    unittest.main()